@@ -25,6 +25,7 @@ class Common(Configuration):
     )
 
     MIDDLEWARE = (
+        'api_v3.misc.instrumentation.InstrumentationMiddleware',
         'django.middleware.security.SecurityMiddleware',
         'corsheaders.middleware.CorsMiddleware',
         'django.middleware.common.CommonMiddleware',
@@ -76,8 +77,19 @@ class Common(Configuration):
     MEDIA_ROOT = values.Value(
         environ_name='MEDIA_ROOT', environ_prefix='', environ_required=True)
     MAX_UPLOAD_SIZE = 1024 * 1024 * 500
+    # Chunk size of the upload sessions, below the nginx body size limit.
+    UPLOAD_CHUNK_SIZE = 1024 * 1024 * 8
+    # How the attachments are sent: `stream` them from the API, or let the
+    # web server do it with `x-accel-redirect` (nginx) or `x-sendfile`.
+    DOWNLOAD_BACKEND = values.Value('stream', environ_prefix='ID')
+    # The nginx internal location serving the `MEDIA_ROOT` files.
+    DOWNLOAD_ACCEL_LOCATION = values.Value(
+        '/protected-media/', environ_prefix='ID')
     STATIC_URL = '/api/static/'
 
+    # Queries slower than this are logged with their plan.
+    SLOW_QUERY_MS = values.IntegerValue(500, environ_prefix='ID')
+
     DEBUG = values.BooleanValue(False)
 
     TEMPLATES = [
@@ -0,0 +1,42 @@
+"""Gunicorn hooks, keep the metrics of the workers.
+
+Used with `gunicorn -c api_v3/config/gunicorn.py`, see the
+`api_v3.misc.metrics` module.
+"""
+import os
+import shutil
+
+# Imported here, the hooks of the master run in its signal handlers.
+from prometheus_client import multiprocess
+
+
+def on_starting(server):
+    """Removes the metrics left by the workers of a previous run."""
+    path = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+
+    if path and os.path.isdir(path):
+        shutil.rmtree(path)
+
+
+def post_worker_init(worker):
+    from api_v3.misc import metrics
+
+    metrics.WORKERS.set(1)
+
+
+def pre_request(worker, req):
+    from api_v3.misc import metrics
+
+    metrics.BUSY_WORKERS.set(1)
+
+
+def post_request(worker, req, environ, resp):
+    from api_v3.misc import metrics
+
+    metrics.BUSY_WORKERS.set(0)
+
+
+def child_exit(server, worker):
+    """Drops the live gauges of the exited worker."""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        multiprocess.mark_process_dead(worker.pid)
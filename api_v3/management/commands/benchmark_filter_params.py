@@ -0,0 +1,84 @@
+import timeit
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from querystring_parser import parser as qs_parser
+
+from api_v3.misc.filter_params import parse_filter_params
+from api_v3.views.support import JSONApiEndpoint
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks the filter params parsing of a tickets list request'
+
+    QUERY_STRING = (
+        'filter%5Bstatus__in%5D=new,in-progress,pending'
+        '&filter[kind]=other&filter[country]=RO'
+        '&filter[created_at__range]=2019-01-01T00:00:00,2019-12-31T00:00:00'
+        '&filter[responders__user]=42&filter[search]=some+company+name'
+        '&include=requester,responders,responders.user'
+        '&page[size]=30&page[number]=2&sort=-created_at'
+    )
+
+    # Parsed by the filter backend, the view, and twice by the serializer.
+    CALLS_PER_REQUEST = 4
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--query-string', default=self.QUERY_STRING,
+            help='Query string to parse.')
+        parser.add_argument(
+            '--number', type=int, default=2000,
+            help='Requests per run.')
+        parser.add_argument(
+            '--repeat', type=int, default=5, help='Runs per parser.')
+
+    @staticmethod
+    def legacy_extract_filter_params(request):
+        """The previous, uncached parsing, kept as the benchmark reference."""
+        params = qs_parser.parse(request.META['QUERY_STRING'])
+        params = params.get('filter') or {}
+
+        for k, v in params.items():
+            if not v:
+                params.pop(k)
+
+        return params
+
+    def handle(self, *args, **options):
+        """Times the parsing of a request filters, both ways."""
+        query_string = options['query_string']
+        factory = RequestFactory()
+        endpoint = JSONApiEndpoint()
+        paths = (
+            ('legacy', self.legacy_extract_filter_params),
+            ('current', endpoint.extract_filter_params),
+        )
+
+        legacy = self.legacy_extract_filter_params(
+            factory.get('/', QUERY_STRING=query_string))
+
+        if legacy != parse_filter_params(query_string):
+            raise CommandError('Different filters parsed.')
+
+        for name, extract_filter_params in paths:
+            timings = []
+
+            for _ in range(options['repeat']):
+                # New requests, nothing cached yet.
+                requests = [
+                    factory.get('/', QUERY_STRING=query_string)
+                    for _ in range(options['number'])
+                ]
+                start = timeit.default_timer()
+
+                for request in requests:
+                    for _ in range(self.CALLS_PER_REQUEST):
+                        extract_filter_params(request)
+
+                timings.append(timeit.default_timer() - start)
+
+            self.stdout.write('{:8} {:.1f}us per request'.format(
+                name, min(timings) / options['number'] * 1000000))
+
+        return self.style.SUCCESS('Same filters parsed.')
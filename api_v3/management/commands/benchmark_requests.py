@@ -0,0 +1,192 @@
+import json
+import math
+import timeit
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, reset_queries
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+from django.utils.six.moves.urllib.parse import urlsplit
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from api_v3.models import Profile, Ticket, TicketAccess
+
+
+def percentile(values, percent):
+    """Returns the nearest-rank percentile of the values."""
+    values = sorted(values)
+    rank = int(math.ceil(percent / 100.0 * len(values)))
+
+    return values[max(rank, 1) - 1]
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks the typical API requests, see `seed_dataset` command'
+
+    # The `{ticket}` is replaced with a ticket of the user.
+    SCENARIOS = (
+        ('tickets', '/api/v3/tickets'),
+        (
+            'tickets-filtered',
+            '/api/v3/tickets?filter[status__in]=new,in-progress,pending'
+            '&filter[kind]=other'
+        ),
+        ('tickets-facets', '/api/v3/tickets?facets=kind,country'),
+        ('tickets-search', '/api/v3/tickets?filter[search]=offshore+company'),
+        (
+            'ticket',
+            '/api/v3/tickets/{ticket}?include=requester,responders,attachments'
+        ),
+        ('activities', '/api/v3/activities'),
+        ('ticket-activities', '/api/v3/activities?filter[target_object_id]='
+         '{ticket}'),
+        ('ticket-stats', '/api/v3/ticket-stats'),
+    )
+    PERCENTILES = (50, 95, 99)
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--superusers', type=int, default=3,
+            help='Superusers making the requests.')
+        parser.add_argument(
+            '--users', type=int, default=10,
+            help='Regular users, with tickets, making the requests.')
+        parser.add_argument(
+            '--repeat', type=int, default=5,
+            help='Requests per user and scenario, after a warm-up one.')
+        parser.add_argument(
+            '--baseline', help='Baseline file, to check for regressions.')
+        parser.add_argument(
+            '--save-baseline', help='File to save the results to.')
+        parser.add_argument(
+            '--tolerance', type=float, default=0.25,
+            help='Allowed p95 latency increase, over the baseline.')
+
+    def handle(self, *args, **options):
+        """Replays the scenarios, reports and checks the results."""
+        self.factory = APIRequestFactory()
+        roles = (
+            ('superuser', Profile.objects.filter(
+                is_superuser=True).order_by('id')[:options['superusers']]),
+            ('user', Profile.objects.filter(
+                is_superuser=False,
+                id__in=TicketAccess.objects.values('user_id')
+            ).order_by('id')[:options['users']]),
+        )
+        results = {}
+
+        for role, users in roles:
+            users = list(users)
+
+            if not users:
+                continue
+
+            for name, path in self.SCENARIOS:
+                results['{} {}'.format(role, name)] = self.run_scenario(
+                    path, users, max(options['repeat'], 1))
+
+        if not results:
+            raise CommandError('No users to benchmark, seed a dataset first.')
+
+        self.report(results)
+
+        if options['save_baseline']:
+            with open(options['save_baseline'], 'w') as baseline:
+                json.dump(results, baseline, indent=2, sort_keys=True)
+
+        if options['baseline']:
+            with open(options['baseline']) as baseline:
+                regressions = self.regressions(
+                    results, json.load(baseline), options['tolerance'])
+
+            if regressions:
+                raise CommandError(
+                    'Regressions found:\n' + '\n'.join(regressions))
+
+        return self.style.SUCCESS(
+            'Benchmarked {} scenarios.'.format(len(results)))
+
+    def run_scenario(self, path, users, repeat):
+        """Returns the latency percentiles, in ms, and the most queries."""
+        timings, queries = [], []
+
+        for user in users:
+            user_path = path.format(ticket=self.ticket_of(user))
+
+            # The first request warms up the caches, not measured.
+            for run in range(repeat + 1):
+                duration, count = self.request(user_path, user)
+
+                if run:
+                    timings.append(duration)
+                    queries.append(count)
+
+        result = {
+            'p{}'.format(percent): round(
+                percentile(timings, percent) * 1000, 2)
+            for percent in self.PERCENTILES
+        }
+        result['queries'] = max(queries)
+
+        return result
+
+    @staticmethod
+    def ticket_of(user):
+        """Returns the oldest ticket the user can access."""
+        tickets = Ticket.objects.all()
+
+        if not user.is_superuser:
+            tickets = Ticket.filter_by_user(user)
+
+        return tickets.order_by('id').values_list('id', flat=True).first()
+
+    def request(self, path, user):
+        """Returns the request duration and query count."""
+        match = resolve(urlsplit(path).path)
+        request = self.factory.get(path)
+        force_authenticate(request, user)
+        # The captured queries are counted from a log of limited length.
+        reset_queries()
+
+        with CaptureQueriesContext(connection) as captured:
+            start = timeit.default_timer()
+            response = match.func(request, *match.args, **match.kwargs)
+
+            if hasattr(response, 'render'):
+                response.render()
+
+            duration = timeit.default_timer() - start
+
+        if response.status_code != 200:
+            raise CommandError('Request failed with {}: {}'.format(
+                response.status_code, path))
+
+        return duration, len(captured)
+
+    def report(self, results):
+        """Prints a line per role and scenario."""
+        for name, result in sorted(results.items()):
+            self.stdout.write(
+                '{:30} p50: {p50:8.2f}ms p95: {p95:8.2f}ms '
+                'p99: {p99:8.2f}ms queries: {queries}'.format(name, **result))
+
+    @staticmethod
+    def regressions(results, baseline, tolerance):
+        """Lists the slower p95 latencies and the extra queries."""
+        regressions = []
+
+        for name, result in sorted(results.items()):
+            expected = baseline.get(name)
+
+            if not expected:
+                continue
+
+            if result['p95'] > expected['p95'] * (1 + tolerance):
+                regressions.append('{}: p95 {:.2f}ms, was {:.2f}ms'.format(
+                    name, result['p95'], expected['p95']))
+
+            if result['queries'] > expected['queries']:
+                regressions.append('{}: {} queries, was {}'.format(
+                    name, result['queries'], expected['queries']))
+
+        return regressions
@@ -0,0 +1,153 @@
+import random
+import timeit
+import uuid
+
+from django.db import connection, models, transaction
+from django.core.management.base import BaseCommand, CommandError
+
+from api_v3.models import (
+    Profile, Responder, Subscriber, Ticket, TicketAccess)
+
+
+class Rollback(Exception):
+    """Raised to discard the seeded benchmark data."""
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks the ticket access queries against a seeded dataset'
+
+    BATCH_SIZE = 5000
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--users', type=int, default=5000, help='Profiles to seed.')
+        parser.add_argument(
+            '--tickets', type=int, default=50000, help='Tickets to seed.')
+        parser.add_argument(
+            '--fan-out', type=int, default=3,
+            help='Responders and subscribers per ticket.')
+        parser.add_argument(
+            '--samples', type=int, default=20, help='Users to benchmark.')
+        parser.add_argument(
+            '--repeat', type=int, default=5, help='Runs per query.')
+        parser.add_argument(
+            '--seed', type=int, default=42, help='Random generator seed.')
+        parser.add_argument(
+            '--keep', action='store_true', help='Keep the seeded data.')
+
+    @staticmethod
+    def legacy_filter_by_user(user):
+        """The OR-of-joins access filter, kept as the benchmark reference."""
+        return Ticket.objects.filter(
+            models.Q(requester=user) |
+            models.Q(responder_users=user) |
+            models.Q(subscriber_users=user)
+        ).distinct()
+
+    def handle(self, *args, **options):
+        """Seeds the dataset, compares and times both access paths."""
+        self.random = random.Random(options['seed'])
+        results = None
+
+        try:
+            with transaction.atomic():
+                users = self.seed(
+                    options['users'], options['tickets'], options['fan_out'])
+                samples = min(options['samples'], len(users))
+                results = self.benchmark(
+                    self.random.sample(users, samples), options['repeat'])
+
+                if not options['keep']:
+                    raise Rollback()
+        except Rollback:
+            pass
+
+        return self.report(results)
+
+    def seed(self, users_count, tickets_count, fan_out):
+        """Bulk creates the profiles, tickets, responders and subscribers."""
+        prefix = 'benchmark-{}'.format(uuid.uuid4().hex[:8])
+
+        Profile.objects.bulk_create([
+            Profile(email='{}-{}@example.org'.format(prefix, i))
+            for i in range(users_count)
+        ], batch_size=self.BATCH_SIZE)
+
+        users = list(Profile.objects.filter(email__startswith=prefix))
+
+        for offset in range(0, tickets_count, self.BATCH_SIZE):
+            batch = range(offset, min(offset + self.BATCH_SIZE, tickets_count))
+            tickets = Ticket.objects.bulk_create([
+                Ticket(
+                    requester=self.random.choice(users),
+                    background='Benchmark ticket {}'.format(i)
+                ) for i in batch
+            ])
+            responders, subscribers = [], []
+
+            for ticket in tickets:
+                related = self.random.sample(users, fan_out * 2)
+                responders += [
+                    Responder(ticket=ticket, user=user)
+                    for user in related[:fan_out]
+                ]
+                subscribers += [
+                    Subscriber(ticket=ticket, user=user)
+                    for user in related[fan_out:]
+                ]
+
+            Responder.objects.bulk_create(responders)
+            Subscriber.objects.bulk_create(subscribers)
+
+        # Bulk creates skip the signals maintaining the access.
+        TicketAccess.rebuild()
+
+        with connection.cursor() as cursor:
+            models_list = (Profile, Ticket, Responder, Subscriber, TicketAccess)
+            for model in models_list:
+                cursor.execute('ANALYZE {}'.format(model._meta.db_table))
+
+        self.stdout.write('Seeded {} profiles and {} tickets.'.format(
+            users_count, tickets_count))
+
+        return users
+
+    def benchmark(self, users, repeat):
+        """Times the access queries, fails if these return different rows."""
+        results = {'legacy': [], 'current': []}
+        paths = (
+            ('legacy', self.legacy_filter_by_user),
+            ('current', Ticket.filter_by_user),
+        )
+
+        for user in users:
+            ids = {}
+
+            for name, filter_by_user in paths:
+                ids[name] = set(
+                    filter_by_user(user).values_list('id', flat=True))
+                results[name].append(min(timeit.repeat(
+                    lambda: list(
+                        filter_by_user(user).order_by('-created_at')[:30]),
+                    number=1, repeat=repeat
+                )))
+
+            if ids['legacy'] != ids['current']:
+                raise CommandError(
+                    'Access mismatch for user ID: {}'.format(user.id))
+
+        return results
+
+    def report(self, results):
+        """Prints the timings of a page of user tickets."""
+        for name, timings in sorted(results.items()):
+            timings = sorted(timings)
+            self.stdout.write(
+                '{:8} p50: {:.2f}ms max: {:.2f}ms'.format(
+                    name,
+                    timings[len(timings) // 2] * 1000,
+                    timings[-1] * 1000
+                )
+            )
+
+        return self.style.SUCCESS('Same rows for all users.')
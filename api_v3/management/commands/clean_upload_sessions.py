@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from api_v3.models import UploadSession
+
+
+class Command(BaseCommand):
+    help = 'Removes the abandoned upload sessions and their files'
+
+    def handle(self, *args, **options):
+        """Discards the expired sessions."""
+        count = 0
+
+        for session in UploadSession.expired().iterator():
+            session.discard()
+            count += 1
+
+        return self.style.SUCCESS(
+            'Removed {} upload sessions.'.format(count))
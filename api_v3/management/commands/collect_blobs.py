@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from api_v3.models import Blob
+
+
+class Command(BaseCommand):
+    help = 'Removes the stored files no attachment references'
+
+    def handle(self, *args, **options):
+        """Collects the unreferenced blobs."""
+        count = Blob.collect()
+
+        return self.style.SUCCESS('Removed {} blobs.'.format(count))
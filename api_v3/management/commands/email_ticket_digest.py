@@ -2,20 +2,22 @@ from datetime import datetime
 
 from django.db import models
 from django.conf import settings
-from django.core.mail import send_mass_mail
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from django.template.loader import render_to_string
 
-from api_v3.models import Ticket, Action
+from api_v3.misc.advisory_lock import advisory_lock
+from api_v3.misc.instrumentation import query_timings
+from api_v3.models import Action, OutboxEmail, Ticket, TicketAccess
 
 
 class Command(BaseCommand):
-    help = 'Sends relevant ticket notifications'
+    help = 'Queues relevant ticket notifications'
 
     # Days left until deadline
     UPCOMING_DAYS_LEFT = [-1, 0, 1]
 
     SUBJECT = 'Daily digest for your ID tickets'
+    LOCK_NAME = 'email_ticket_digest'
     # Email item template. Example:
     #   (01.12.1987 22:01): John updated the status to ticket ID: 99
     ITEM_TEMPLATE = (
@@ -25,28 +27,100 @@ class Command(BaseCommand):
 
     def add_arguments(self, parser):
         parser.add_argument('request_host', help='Hostname to use in emails.')
+        parser.add_argument(
+            '--chunk-size', type=int, default=500,
+            help='Tickets to process per batch of queries.')
 
     def handle(self, *args, **options):
-        """Runs the digest for tickets."""
+        """Runs the digest for tickets.
+
+        Tickets are streamed in chunks, every chunk loads its actions and
+        recipients in a fixed number of queries. Only one digest can run at
+        a time, the progress is reported to the `on_progress` callback.
+        """
+        with advisory_lock(self.LOCK_NAME) as acquired:
+            if not acquired:
+                raise CommandError('Another digest is already running.')
+
+            return self.run(**options)
+
+    def run(self, **options):
+        """Digests the tickets and queues the user notifications."""
         user_digests = {}
+        notified_ids = []
         self.request_host = options.get('request_host')
+        chunk_size = options.get('chunk_size') or 500
+        on_progress = options.get('on_progress') or (lambda **counts: None)
         tickets = Ticket.objects.filter(
             models.Q(
                 sent_notifications_at__gte=models.Func(function='now')
             ) | models.Q(
                 sent_notifications_at=None
             )
-        )
+        ).defer('search_vector').order_by('id')
+
+        # Counted by the cursor wrapper, the queries are not kept.
+        with query_timings(self.LOCK_NAME) as timings:
+            tickets_count = tickets.count()
+            processed = 0
+
+            self.stdout.write('Processing {} tickets.'.format(tickets_count))
+            on_progress(tickets=tickets_count, processed=0)
+
+            for chunk in self.chunks(tickets.iterator(), chunk_size):
+                notified_ids += self.process(chunk, user_digests)
+                processed += len(chunk)
+                on_progress(processed=processed, notified=len(notified_ids))
+
+            Ticket.objects.filter(id__in=notified_ids).update(
+                sent_notifications_at=datetime.utcnow())
+
+        self.stdout.write(
+            'Digested {} tickets in {:.2f}s, with {} queries.'.format(
+                len(notified_ids), timings.total_time, timings.queries))
+
+        count = self.email(user_digests) if user_digests else 0
+        on_progress(queued=count)
+
+        return self.style.SUCCESS('Queued {} notifications.'.format(count))
+
+    @staticmethod
+    def chunks(iterable, size):
+        """Yields lists of items from the iterable."""
+        chunk = []
+
+        for item in iterable:
+            chunk.append(item)
 
-        self.stdout.write('Processing {} tickets.'.format(tickets.count()))
+            if len(chunk) == size:
+                yield chunk
+                chunk = []
+
+        if chunk:
+            yield chunk
+
+    def process(self, tickets, user_digests):
+        """Adds the tickets digests to the users digests.
+
+        Returns the ids of the tickets with any digest.
+        """
+        notified_ids = []
+        digests = self.digests(tickets)
+        recipients = {}
+        access = TicketAccess.objects.filter(
+            ticket_id__in=digests.keys()).select_related('user')
+
+        for ticket_access in access:
+            ticket_users = recipients.setdefault(ticket_access.ticket_id, {})
+            ticket_users[ticket_access.user_id] = ticket_access.user
 
         for ticket in tickets:
-            digest = self.digest(ticket)
+            digest = digests.get(ticket.id)
 
             if not digest:
                 continue
 
-            for user in (list(ticket.users.all()) + [ticket.requester]):
+            for user in recipients.get(ticket.id, {}).values():
                 upcoming_in = 'never'
                 user_digests[user.id] = user_digests.get(user.id) or {
                     'request_host': self.request_host,
@@ -58,37 +132,50 @@ class Command(BaseCommand):
 
                 user_digests[user.id]['digests'] += digest
 
-                if ticket.deadline_at and user != ticket.requester:
+                if ticket.deadline_at and user.id != ticket.requester_id:
                     upcoming_in = (ticket.deadline_at - datetime.utcnow()).days
 
                 if upcoming_in in self.UPCOMING_DAYS_LEFT:
                     user_digests[user.id]['upcoming'].add(ticket)
 
-            ticket.sent_notifications_at = datetime.utcnow()
-            ticket.save()
-
-        if user_digests:
-            status, count = self.email(user_digests)
-        else:
-            status, count = True, 0
+            notified_ids.append(ticket.id)
 
-        if status:
-            color = self.style.SUCCESS
-        else:
-            color = self.style.ERROR
+        return notified_ids
 
-        return color('Sent {} notifications.'.format(count))
+    def digests(self, tickets):
+        """Generates the digests for a list of tickets.
 
-    def digest(self, ticket):
-        """Generates a digest for a ticket."""
+        Loads the actions of all the tickets in a single query, starting
+        with the oldest notification of the tickets, the rest is filtered
+        for every ticket. Returns a dict of digests per ticket id.
+        """
+        since = {
+            str(ticket.id): ticket.sent_notifications_at or datetime.min
+            for ticket in tickets
+        }
+        digests = {}
         actions = Action.objects.filter(
-            target_object_id=str(ticket.id),
-            timestamp__gte=(ticket.sent_notifications_at or datetime.min)
-        )
-        return filter(None, map(self.generate_text, actions))
+            target_object_id__in=since.keys(),
+            timestamp__gte=min(since.values())
+        ).order_by('-timestamp').prefetch_related('actor', 'action')
+
+        for action in actions:
+            if action.timestamp < since[action.target_object_id]:
+                continue
+
+            text = self.generate_text(action)
+
+            if text:
+                digests.setdefault(int(action.target_object_id), []).append(
+                    text)
+
+        return digests
 
     def email(self, user_digests):
-        """Generates and emails the user digests."""
+        """Queues the user digests, see the `send_queued_email` command.
+
+        Returns the number of queued emails.
+        """
         emails = []
 
         for _, user_digest in user_digests.items():
@@ -102,7 +189,7 @@ class Command(BaseCommand):
                 [user_digest['user'].email]
             ])
 
-        return send_mass_mail(emails, fail_silently=True), len(user_digests)
+        return OutboxEmail.queue(emails)
 
     def generate_text(self, action):
         """Generates a human readable version of the ticket activity."""
@@ -110,7 +197,7 @@ class Command(BaseCommand):
         data = {
             'name': action.actor.display_name,
             'request_host': self.request_host,
-            'ticket': action.target.id,
+            'ticket': action.target_object_id,
             'thing': verb[0],
             'prep': 'to',
             'date': action.timestamp.strftime('%x %X'),
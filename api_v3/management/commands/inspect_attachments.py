@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from api_v3.models import Attachment
+
+
+class Command(BaseCommand):
+    help = 'Stores the size, MIME type and digest of the older attachments'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Inspect all the attachments, not only the missing ones.')
+
+    def handle(self, *args, **options):
+        """Reads every upload once, missing files are reported."""
+        attachments = Attachment.objects.order_by('id')
+        inspected = missing = 0
+
+        if not options['all']:
+            attachments = attachments.filter(size=None)
+
+        for attachment in attachments.iterator():
+            try:
+                attachment.inspect_upload()
+            except (IOError, OSError, ValueError) as error:
+                missing += 1
+                self.stderr.write('Attachment ID: {}, {}'.format(
+                    attachment.id, error))
+                continue
+
+            attachment.save(update_fields=['sha256', 'size', 'mime_type'])
+            inspected += 1
+
+        return self.style.SUCCESS(
+            'Inspected {} attachments, {} files missing.'.format(
+                inspected, missing))
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api_v3.models import TicketAccess
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds or checks the denormalized ticket access table'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Only report the inconsistent rows, fail if there are any.')
+
+    def handle(self, *args, **options):
+        """Runs the rebuild or the consistency check."""
+        if not options['check']:
+            count = TicketAccess.rebuild()
+            return self.style.SUCCESS(
+                'Rebuilt {} ticket access rows.'.format(count))
+
+        missing, stale = TicketAccess.inconsistencies()
+
+        for label, rows in (('Missing', missing), ('Stale', stale)):
+            for user_id, ticket_id, role in rows:
+                self.stderr.write(
+                    '{}: user ID: {}, ticket ID: {}, role: {}'.format(
+                        label, user_id, ticket_id, role))
+
+        if missing or stale:
+            raise CommandError(
+                'Found {} missing and {} stale ticket access rows.'.format(
+                    len(missing), len(stale)))
+
+        return self.style.SUCCESS('Ticket access is consistent.')
@@ -0,0 +1,31 @@
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand
+
+from api_v3.models import TicketMonthlyStat
+
+
+class Command(BaseCommand):
+    help = 'Refreshes the monthly ticket stats rollup'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months', type=int,
+            help='Only refresh the last number of months, including this one.')
+
+    def handle(self, *args, **options):
+        """Refreshes the rollup rows."""
+        months = None
+
+        if options.get('months'):
+            month = TicketMonthlyStat.month_of(datetime.utcnow())
+            months = [month]
+
+            for _ in range(options['months'] - 1):
+                month = TicketMonthlyStat.month_of(month - timedelta(days=1))
+                months.append(month)
+
+        count = TicketMonthlyStat.refresh(months)
+
+        return self.style.SUCCESS(
+            'Refreshed {} ticket stats rows.'.format(count))
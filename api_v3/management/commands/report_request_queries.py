@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import resolve
+from django.utils.six.moves.urllib.parse import urlsplit
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from api_v3.misc.query_report import QueryReport
+from api_v3.models import Profile
+
+
+class Command(BaseCommand):
+    help = 'Reports the SQL queries and their compile time of a request'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'paths', nargs='+', help='Request paths, with the query string.')
+        parser.add_argument(
+            '--user', help='Email of the profile making the requests.')
+        parser.add_argument(
+            '--repeat', type=int, default=3,
+            help='Requests per path, the fastest is reported.')
+
+    def handle(self, *args, **options):
+        """Requests the paths, in-process, and reports each one."""
+        factory = APIRequestFactory()
+        user = None
+
+        if options['user']:
+            user = Profile.objects.filter(email=options['user']).first()
+
+            if not user:
+                raise CommandError(
+                    'Profile not found: {}'.format(options['user']))
+
+        for path in options['paths']:
+            match = resolve(urlsplit(path).path)
+            reports = []
+
+            for _ in range(max(options['repeat'], 1)):
+                request = factory.get(path)
+
+                if user:
+                    force_authenticate(request, user)
+
+                with QueryReport() as report:
+                    response = match.func(request, *match.args, **match.kwargs)
+
+                    if hasattr(response, 'render'):
+                        response.render()
+
+                reports.append(report)
+
+            report = min(reports, key=lambda report: report.total_time)
+            self.stdout.write('{} {} {}'.format(
+                response.status_code, path, report.summary()))
+
+        return self.style.SUCCESS(
+            'Reported {} requests.'.format(len(options['paths'])))
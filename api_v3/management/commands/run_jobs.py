@@ -0,0 +1,72 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api_v3.models import Attachment, Job, TicketMonthlyStat
+from .email_ticket_digest import Command as EmailTicketDigestCommand
+
+
+def email_ticket_digest(job):
+    """Runs the tickets digest, see `email_ticket_digest` command."""
+    return EmailTicketDigestCommand().handle(
+        request_host=job.params.get('request_host'),
+        on_progress=job.report_progress
+    )
+
+
+def build_attachment_previews(job):
+    """Renders the previews of the new attachments."""
+    return 'Built the previews of {} attachments.'.format(
+        Attachment.build_pending_previews(on_progress=job.report_progress))
+
+
+def refresh_ticket_stats(job):
+    """Refreshes the queued months of the ticket stats rollup."""
+    count = TicketMonthlyStat.refresh(
+        TicketMonthlyStat.parse_months(job.params.get('months', [])))
+
+    return 'Refreshed {} ticket stats rows.'.format(count)
+
+
+class Command(BaseCommand):
+    help = 'Runs the queued background jobs'
+
+    HANDLERS = {
+        'build_attachment_previews': build_attachment_previews,
+        'email_ticket_digest': email_ticket_digest,
+        'refresh_ticket_stats': refresh_ticket_stats,
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep polling for new jobs.')
+        parser.add_argument(
+            '--interval', type=float, default=5,
+            help='Seconds to wait between polls, when there are no jobs.')
+
+    def handle(self, *args, **options):
+        """Runs the queued jobs, one at a time."""
+        count = 0
+
+        while True:
+            job = Job.claim()
+
+            if job is None and not options['loop']:
+                break
+
+            if job is None:
+                time.sleep(options['interval'])
+                continue
+
+            job.run(self.HANDLERS.get(job.name, self.unknown))
+            count += 1
+
+            self.stdout.write('Job ID: {} ({}) {}.'.format(
+                job.id, job.name, job.status))
+
+        return self.style.SUCCESS('Ran {} jobs.'.format(count))
+
+    @staticmethod
+    def unknown(job):
+        raise ValueError('Unknown job: {}'.format(job.name))
@@ -0,0 +1,343 @@
+from datetime import datetime, timedelta
+import random
+import uuid
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.files.base import ContentFile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils.six import StringIO
+
+from api_v3.models import (
+    Action,
+    Attachment,
+    Blob,
+    Comment,
+    Profile,
+    Responder,
+    Subscriber,
+    Ticket,
+    TicketAccess,
+    TicketMonthlyStat
+)
+from api_v3.models.countries import COUNTRIES
+
+
+class Command(BaseCommand):
+    help = 'Seeds a large dataset, for the load tests and the benchmarks'
+
+    WORDS = (
+        'account', 'asset', 'bank', 'board', 'company', 'contract', 'court',
+        'director', 'estate', 'fund', 'holding', 'land', 'lease', 'loan',
+        'mining', 'offshore', 'owner', 'property', 'registry', 'shares',
+        'shipping', 'tender', 'transfer', 'trust', 'vessel', 'yacht'
+    )
+    NAMES = (
+        'Ana', 'Boris', 'Carmen', 'Dmitri', 'Elena', 'Florin', 'Goran',
+        'Ivana', 'Jovan', 'Katarina', 'Luka', 'Marko', 'Nina', 'Olga',
+        'Petar', 'Radu', 'Sanja', 'Tudor', 'Vesna', 'Zoran'
+    )
+    # Closed tickets are most of a long running install.
+    STATUS_WEIGHTS = (
+        ('new', 5), ('in-progress', 10), ('pending', 5), ('closed', 70),
+        ('cancelled', 10)
+    )
+    VERBS = (
+        'ticket:update', 'ticket:update:status_in-progress',
+        'ticket:update:status_closed', 'comment:create', 'attachment:create',
+        'responder:create', 'subscriber:create'
+    )
+    ACTION_COLUMNS = (
+        'actor_content_type_id', 'actor_object_id', 'verb',
+        'action_content_type_id', 'action_object_id',
+        'target_content_type_id', 'target_object_id', 'is_public',
+        'timestamp'
+    )
+    # Distinct attachment contents, shared like duplicate uploads are.
+    BLOBS = 10
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--profiles', type=int, default=50000, help='Profiles to seed.')
+        parser.add_argument(
+            '--superusers', type=int, default=10,
+            help='Profiles seeded as superusers.')
+        parser.add_argument(
+            '--tickets', type=int, default=500000, help='Tickets to seed.')
+        parser.add_argument(
+            '--fan-out', type=int, default=3,
+            help='Most responders and subscribers per ticket.')
+        parser.add_argument(
+            '--comments', type=int, default=500000, help='Comments to seed.')
+        parser.add_argument(
+            '--attachments', type=int, default=100000,
+            help='Attachments to seed.')
+        parser.add_argument(
+            '--actions', type=int, default=5000000,
+            help='Activities to seed, loaded with `COPY`.')
+        parser.add_argument(
+            '--days', type=int, default=3 * 365,
+            help='Days the tickets and activities are spread over.')
+        parser.add_argument(
+            '--batch-size', type=int, default=10000,
+            help='Rows per bulk insert.')
+        parser.add_argument(
+            '--seed', type=int, default=42, help='Random generator seed.')
+
+    def handle(self, *args, **options):
+        """Seeds the rows, then the derived tables and the statistics."""
+        # The tickets pick their requesters, the rest pick a ticket.
+        if options['profiles'] < 1 or options['tickets'] < 1:
+            raise CommandError('Seed at least a profile and a ticket.')
+
+        self.random = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.now = datetime.utcnow().replace(microsecond=0)
+        self.seconds = max(options['days'], 1) * 24 * 60 * 60
+
+        with transaction.atomic():
+            users = self.seed_profiles(
+                options['profiles'], options['superusers'])
+            tickets = self.seed_tickets(
+                users, options['tickets'], options['fan_out'])
+            comments = self.seed_comments(tickets, options['comments'])
+            attachments = self.seed_attachments(
+                tickets, options['attachments'])
+            self.seed_actions(
+                users, tickets, comments, attachments, options['actions'])
+
+            # Bulk inserts skip the signals maintaining these.
+            TicketAccess.rebuild()
+            TicketMonthlyStat.refresh()
+
+        with connection.cursor() as cursor:
+            for model in (
+                    Profile, Ticket, Responder, Subscriber, Comment,
+                    Attachment, Action, TicketAccess, TicketMonthlyStat):
+                cursor.execute('ANALYZE {}'.format(model._meta.db_table))
+
+        return self.style.SUCCESS(
+            'Seeded {} profiles, {} tickets, {} comments, {} attachments '
+            'and {} activities.'.format(
+                len(users), len(tickets), len(comments), len(attachments),
+                options['actions']
+            )
+        )
+
+    def batches(self, count):
+        """Yields the ranges of the batches."""
+        for offset in range(0, count, self.batch_size):
+            yield range(offset, min(offset + self.batch_size, count))
+
+    def sentence(self, words):
+        return ' '.join(self.random.choice(self.WORDS) for _ in range(words))
+
+    def seed_profiles(self, count, superusers):
+        """Returns the seeded profile IDs, the superusers first."""
+        prefix = 'seed-{}'.format(uuid.uuid4().hex[:8])
+
+        for batch in self.batches(count):
+            Profile.objects.bulk_create([
+                Profile(
+                    email='{}-{}@example.org'.format(prefix, i),
+                    first_name=self.random.choice(self.NAMES),
+                    last_name=self.random.choice(self.NAMES) + 'escu',
+                    is_superuser=i < superusers,
+                    is_staff=i < superusers
+                ) for i in batch
+            ])
+
+        self.stdout.write('Seeded {} profiles.'.format(count))
+
+        return list(Profile.objects.filter(
+            email__startswith=prefix).order_by('id').values_list(
+                'id', flat=True))
+
+    def seed_tickets(self, users, count, fan_out):
+        """Returns the seeded `(ticket ID, requester ID)` pairs."""
+        statuses = [
+            status
+            for status, weight in self.STATUS_WEIGHTS
+            for _ in range(weight)
+        ]
+        countries = [code for code, _ in COUNTRIES if code]
+        seeded = []
+
+        for batch in self.batches(count):
+            tickets = Ticket.objects.bulk_create([
+                Ticket(
+                    requester_id=self.random.choice(users),
+                    status=self.random.choice(statuses),
+                    kind=self.random.choice(Ticket.KINDS)[0],
+                    request_type=self.random.choice(Ticket.TYPES)[0],
+                    country=self.random.choice(countries),
+                    sensitive=self.random.random() < 0.05,
+                    first_name=self.random.choice(self.NAMES),
+                    last_name=self.random.choice(self.NAMES) + 'ic',
+                    company_name=self.sentence(2).title() + ' Ltd',
+                    background=self.sentence(30),
+                    sources=self.sentence(5)
+                ) for _ in batch
+            ])
+            responders, subscribers = [], []
+
+            for ticket in tickets:
+                related = self.random.sample(
+                    users, min(len(users), fan_out * 2))
+                responders += [
+                    Responder(ticket_id=ticket.id, user_id=user)
+                    for user in related[:self.random.randint(0, fan_out)]
+                ]
+                subscribers += [
+                    Subscriber(ticket_id=ticket.id, user_id=user)
+                    for user in related[fan_out:][
+                        :self.random.randint(0, fan_out)]
+                ]
+                seeded.append((ticket.id, ticket.requester_id))
+
+            Responder.objects.bulk_create(responders)
+            Subscriber.objects.bulk_create(subscribers)
+
+        if seeded:
+            self.spread_ticket_dates(seeded[0][0], seeded[-1][0])
+
+        self.stdout.write('Seeded {} tickets.'.format(count))
+
+        return seeded
+
+    def spread_ticket_dates(self, first_id, last_id):
+        """Spreads the creation dates, and sets the tracked durations.
+
+        Derived from the IDs, so the same seed gives the same dates.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                UPDATE {table} t SET
+                    created_at = d.created_at,
+                    updated_at = d.created_at,
+                    deadline_at = CASE WHEN t.id %% 3 = 0
+                        THEN d.created_at + interval '30 days' END,
+                    first_response_at = CASE WHEN t.status <> 'new'
+                        THEN d.created_at + d.response * interval '1 hour'
+                        END,
+                    response_hours = CASE WHEN t.status <> 'new'
+                        THEN d.response END,
+                    resolved_at = CASE WHEN t.status IN %s
+                        THEN d.created_at + d.resolution * interval '1 hour'
+                        END,
+                    resolution_hours = CASE WHEN t.status IN %s
+                        THEN d.resolution END
+                FROM (
+                    SELECT
+                        id,
+                        %s - ((id * 7919) %% %s) * interval '1 second'
+                            AS created_at,
+                        (id * 31) %% 200 + 1 AS response,
+                        (id * 17) %% 2000 + 24 AS resolution
+                    FROM {table}
+                    WHERE id BETWEEN %s AND %s
+                ) d
+                WHERE t.id = d.id
+                """.format(table=Ticket._meta.db_table),
+                [
+                    Ticket.RESOLVED_STATUSES, Ticket.RESOLVED_STATUSES,
+                    self.now, self.seconds, first_id, last_id
+                ]
+            )
+
+    def seed_comments(self, tickets, count):
+        """Returns the seeded comment IDs."""
+        ids = []
+
+        for batch in self.batches(count):
+            comments = Comment.objects.bulk_create([
+                Comment(ticket_id=ticket_id, user_id=user_id,
+                        body=self.sentence(15))
+                for ticket_id, user_id in (
+                    self.random.choice(tickets) for _ in batch)
+            ])
+            ids += [comment.id for comment in comments]
+
+        self.stdout.write('Seeded {} comments.'.format(count))
+
+        return ids
+
+    def seed_attachments(self, tickets, count):
+        """Returns the seeded attachment IDs, these share a few blobs."""
+        blobs = []
+
+        for i in range(min(self.BLOBS, count)):
+            content = 'Seeded attachment {}\n'.format(i).encode('ascii')
+            name = Blob.storage.save('seed.txt', ContentFile(content))
+            blobs.append((name, Blob.storage.digest(name), len(content)))
+
+        ids = []
+
+        for batch in self.batches(count):
+            attachments = []
+
+            for i in batch:
+                ticket_id, user_id = self.random.choice(tickets)
+                name, sha256, size = blobs[i % len(blobs)]
+                attachments.append(Attachment(
+                    ticket_id=ticket_id, user_id=user_id, upload=name,
+                    file_name='{}.txt'.format(self.sentence(2)),
+                    sha256=sha256, size=size, mime_type='text/plain',
+                    previewed=False
+                ))
+
+            ids += [
+                attachment.id
+                for attachment in Attachment.objects.bulk_create(attachments)
+            ]
+
+        for i, (name, sha256, size) in enumerate(blobs):
+            Blob.reference(sha256, len(range(i, count, len(blobs))))
+
+        self.stdout.write('Seeded {} attachments.'.format(count))
+
+        return ids
+
+    def seed_actions(self, users, tickets, comments, attachments, count):
+        """Loads the activities with `COPY`, the largest table by far."""
+        types = ContentType.objects.get_for_models(
+            Profile, Ticket, Comment, Attachment)
+        objects = {
+            'comment:create': (types[Comment].id, comments),
+            'attachment:create': (types[Attachment].id, attachments),
+            'responder:create': (types[Profile].id, users),
+            'subscriber:create': (types[Profile].id, users),
+        }
+        sql = 'COPY {} ({}) FROM STDIN'.format(
+            Action._meta.db_table, ', '.join(self.ACTION_COLUMNS))
+
+        for batch in self.batches(count):
+            rows = StringIO()
+
+            for _ in batch:
+                ticket_id, _ = self.random.choice(tickets)
+                verb = self.random.choice(self.VERBS)
+                action_type, action_ids = objects.get(verb, (None, None))
+                timestamp = self.now - timedelta(
+                    seconds=self.random.randint(0, self.seconds))
+
+                rows.write('\t'.join([
+                    str(types[Profile].id),
+                    str(self.random.choice(users)),
+                    verb,
+                    str(action_type) if action_ids else '\\N',
+                    str(self.random.choice(action_ids))
+                    if action_ids else '\\N',
+                    str(types[Ticket].id),
+                    str(ticket_id),
+                    't',
+                    timestamp.isoformat()
+                ]) + '\n')
+
+            rows.seek(0)
+
+            with connection.cursor() as cursor:
+                cursor.copy_expert(sql, rows)
+
+        self.stdout.write('Seeded {} activities.'.format(count))
@@ -0,0 +1,52 @@
+import time
+
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+
+from api_v3.models import OutboxEmail
+
+
+class Command(BaseCommand):
+    help = 'Sends the queued emails from the outbox'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=100,
+            help='Emails to send per batch.')
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep polling the outbox for new emails.')
+        parser.add_argument(
+            '--interval', type=float, default=5,
+            help='Seconds to wait between polls, when the outbox is empty.')
+
+    def handle(self, *args, **options):
+        """Sends the emails in batches, over a single connection."""
+        connection = get_connection()
+        totals = [0, 0]
+
+        try:
+            while True:
+                sent, failed = OutboxEmail.send_batch(
+                    connection, options['batch_size'])
+                totals = [totals[0] + sent, totals[1] + failed]
+
+                if sent or failed:
+                    self.stdout.write('Sent {}, failed {} emails.'.format(
+                        sent, failed))
+
+                # Keep draining a full batch, otherwise wait or stop.
+                if sent + failed == options['batch_size']:
+                    continue
+
+                if not options['loop']:
+                    break
+
+                # Do not keep the SMTP connection open while idle.
+                connection.close()
+                time.sleep(options['interval'])
+        finally:
+            connection.close()
+
+        return self.style.SUCCESS(
+            'Done, sent {} and failed {} emails.'.format(*totals))
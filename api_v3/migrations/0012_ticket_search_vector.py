@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.23 on 2019-09-02 10:14
+from __future__ import unicode_literals
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_v3', '0011_add_email_and_drop_user_not_null_on_subscriber'),
+    ]
+
+    # Keep in sync with `Ticket.SEARCH_WEIGHT_MAP`.
+    SEARCH_WEIGHT_MAP = (
+        ('first_name', 'A'),
+        ('last_name', 'A'),
+        ('company_name', 'A'),
+        ('background', 'B'),
+        ('connections', 'C'),
+        ('sources', 'C'),
+        ('business_activities', 'C'),
+        ('initial_information', 'C'),
+        ('whysensitive', 'C'),
+    )
+
+    VECTOR_SQL = ' || '.join([
+        "setweight(to_tsvector(COALESCE(NEW.{}, '')), '{}')".format(*fw)
+        for fw in SEARCH_WEIGHT_MAP
+    ])
+
+    CREATE_TRIGGER_SQL = """
+        CREATE FUNCTION api_v3_ticket_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := {vector};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql;
+
+        CREATE TRIGGER api_v3_ticket_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF {columns} ON api_v3_ticket
+        FOR EACH ROW EXECUTE PROCEDURE api_v3_ticket_search_vector_update();
+
+        UPDATE api_v3_ticket SET background = background;
+        """.format(
+            vector=VECTOR_SQL,
+            columns=', '.join([fw[0] for fw in SEARCH_WEIGHT_MAP])
+        )
+
+    DROP_TRIGGER_SQL = """
+        DROP TRIGGER api_v3_ticket_search_vector_trigger ON api_v3_ticket;
+        DROP FUNCTION api_v3_ticket_search_vector_update();
+        """
+
+    operations = [
+        migrations.AddField(
+            model_name='ticket',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='api_v3_ticket_search_gin'),
+        ),
+        migrations.RunSQL(CREATE_TRIGGER_SQL, DROP_TRIGGER_SQL),
+    ]
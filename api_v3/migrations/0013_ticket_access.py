@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.23 on 2019-09-04 11:20
+from __future__ import unicode_literals
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_v3', '0012_ticket_search_vector'),
+    ]
+
+    POPULATE_TICKET_ACCESS_SQL = """
+        INSERT INTO api_v3_ticketaccess (user_id, ticket_id, role)
+            SELECT requester_id, id, 'requester' FROM api_v3_ticket
+            UNION
+            SELECT user_id, ticket_id, 'responder' FROM api_v3_responder
+            UNION
+            SELECT user_id, ticket_id, 'subscriber' FROM api_v3_subscriber
+                WHERE user_id IS NOT NULL;
+        """
+
+    operations = [
+        migrations.CreateModel(
+            name='TicketAccess',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('requester', 'Requester'), ('responder', 'Responder'), ('subscriber', 'Subscriber')], max_length=70)),
+                ('ticket', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='access', to='api_v3.Ticket')),
+                ('user', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='ticket_access', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='ticketaccess',
+            unique_together=set([('user', 'ticket', 'role')]),
+        ),
+        migrations.RunSQL(
+            POPULATE_TICKET_ACCESS_SQL, migrations.RunSQL.noop),
+    ]
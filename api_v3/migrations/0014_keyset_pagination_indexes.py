@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.23 on 2019-09-11 09:42
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('activity', '0001_initial'),
+        ('api_v3', '0013_ticket_access'),
+    ]
+
+    ACTION_TIMESTAMP_ID_INDEX_SQL = """
+        CREATE INDEX api_v3_activity_action_timestamp_id
+            ON activity_action (timestamp, id);
+        """
+
+    DROP_ACTION_TIMESTAMP_ID_INDEX_SQL = """
+        DROP INDEX IF EXISTS api_v3_activity_action_timestamp_id;
+        """
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['created_at', 'id'], name='api_v3_ticket_created_at_id'),
+        ),
+        # The activities are stored by a third party app, see `activity`.
+        migrations.RunSQL(
+            ACTION_TIMESTAMP_ID_INDEX_SQL, DROP_ACTION_TIMESTAMP_ID_INDEX_SQL),
+    ]
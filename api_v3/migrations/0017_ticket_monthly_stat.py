@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.23 on 2019-10-02 09:12
+from __future__ import unicode_literals
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('api_v3', '0016_job'),
+    ]
+
+    POPULATE_TICKET_MONTHLY_STAT_SQL = """
+        INSERT INTO api_v3_ticketmonthlystat (
+            month, status, kind, country, has_responders, responder_id,
+            count, hours, past_deadline
+        )
+            SELECT
+                date_trunc('month', t.created_at), t.status, t.kind,
+                t.country,
+                EXISTS (
+                    SELECT 1 FROM api_v3_responder r WHERE r.ticket_id = t.id
+                ),
+                NULL, COUNT(*),
+                SUM(EXTRACT(epoch FROM (t.updated_at - t.created_at) / 3600)),
+                SUM(CASE WHEN t.updated_at > t.deadline_at THEN 1 ELSE 0 END)
+            FROM api_v3_ticket t
+            GROUP BY 1, 2, 3, 4, 5
+            UNION ALL
+            SELECT
+                date_trunc('month', t.created_at), t.status, t.kind,
+                t.country, TRUE, r.user_id, COUNT(*),
+                SUM(EXTRACT(epoch FROM (t.updated_at - t.created_at) / 3600)),
+                SUM(CASE WHEN t.updated_at > t.deadline_at THEN 1 ELSE 0 END)
+            FROM api_v3_ticket t
+            INNER JOIN api_v3_responder r ON r.ticket_id = t.id
+            GROUP BY 1, 2, 3, 4, 6;
+        """
+
+    operations = [
+        migrations.CreateModel(
+            name='TicketMonthlyStat',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateTimeField(db_index=True)),
+                ('status', models.CharField(max_length=70)),
+                ('kind', models.CharField(max_length=70)),
+                ('country', models.CharField(max_length=100, null=True)),
+                ('has_responders', models.BooleanField(default=False)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('hours', models.FloatField(default=0)),
+                ('past_deadline', models.PositiveIntegerField(default=0)),
+                ('responder', models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.RunSQL(
+            POPULATE_TICKET_MONTHLY_STAT_SQL, migrations.RunSQL.noop),
+    ]
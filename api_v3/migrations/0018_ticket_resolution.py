@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.23 on 2019-10-04 14:37
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('activity', '0001_initial'),
+        ('api_v3', '0017_ticket_monthly_stat'),
+    ]
+
+    # The resolution time is the last status change to a resolved status,
+    # the first response is the first responder added.
+    POPULATE_TICKET_RESOLUTION_SQL = """
+        UPDATE api_v3_ticket t SET resolved_at = COALESCE((
+            SELECT MAX(a.timestamp) FROM activity_action a
+            WHERE a.target_object_id = t.id::text
+                AND a.verb IN (
+                    'ticket:update:status_closed',
+                    'ticket:update:status_cancelled'
+                )
+        ), t.updated_at)
+        WHERE t.status IN ('closed', 'cancelled');
+
+        UPDATE api_v3_ticket t SET first_response_at = LEAST((
+            SELECT MIN(a.timestamp) FROM activity_action a
+            WHERE a.target_object_id = t.id::text
+                AND a.verb = 'responder:create'
+        ), (
+            SELECT MIN(r.created_at) FROM api_v3_responder r
+            WHERE r.ticket_id = t.id
+        ));
+
+        UPDATE api_v3_ticket SET
+            resolution_hours = EXTRACT(
+                epoch FROM (resolved_at - created_at) / 3600),
+            response_hours = EXTRACT(
+                epoch FROM (first_response_at - created_at) / 3600);
+        """
+
+    POPULATE_TICKET_MONTHLY_STAT_SQL = """
+        DELETE FROM api_v3_ticketmonthlystat;
+
+        INSERT INTO api_v3_ticketmonthlystat (
+            month, status, kind, country, has_responders, responder_id,
+            count, resolution_hours, response_hours, responded,
+            created_hours, past_deadline
+        )
+            SELECT
+                date_trunc('month', t.created_at), t.status, t.kind,
+                t.country,
+                EXISTS (
+                    SELECT 1 FROM api_v3_responder r WHERE r.ticket_id = t.id
+                ),
+                NULL, COUNT(*),
+                SUM(t.resolution_hours), SUM(t.response_hours),
+                COUNT(t.first_response_at),
+                SUM(EXTRACT(epoch FROM t.created_at) / 3600),
+                SUM(CASE WHEN t.updated_at > t.deadline_at THEN 1 ELSE 0 END)
+            FROM api_v3_ticket t
+            GROUP BY 1, 2, 3, 4, 5
+            UNION ALL
+            SELECT
+                date_trunc('month', t.created_at), t.status, t.kind,
+                t.country, TRUE, r.user_id, COUNT(*),
+                SUM(t.resolution_hours), SUM(t.response_hours),
+                COUNT(t.first_response_at),
+                SUM(EXTRACT(epoch FROM t.created_at) / 3600),
+                SUM(CASE WHEN t.updated_at > t.deadline_at THEN 1 ELSE 0 END)
+            FROM api_v3_ticket t
+            INNER JOIN api_v3_responder r ON r.ticket_id = t.id
+            GROUP BY 1, 2, 3, 4, 6;
+        """
+
+    operations = [
+        migrations.AddField(
+            model_name='ticket',
+            name='first_response_at',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='resolution_hours',
+            field=models.FloatField(null=True),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='resolved_at',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='response_hours',
+            field=models.FloatField(null=True),
+        ),
+        migrations.RemoveField(
+            model_name='ticketmonthlystat',
+            name='hours',
+        ),
+        migrations.AddField(
+            model_name='ticketmonthlystat',
+            name='created_hours',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='ticketmonthlystat',
+            name='resolution_hours',
+            field=models.FloatField(null=True),
+        ),
+        migrations.AddField(
+            model_name='ticketmonthlystat',
+            name='responded',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='ticketmonthlystat',
+            name='response_hours',
+            field=models.FloatField(null=True),
+        ),
+        migrations.RunSQL(
+            POPULATE_TICKET_RESOLUTION_SQL, migrations.RunSQL.noop),
+        migrations.RunSQL(
+            POPULATE_TICKET_MONTHLY_STAT_SQL, migrations.RunSQL.noop),
+    ]
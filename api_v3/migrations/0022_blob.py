@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.23 on 2019-10-16 09:42
+from __future__ import unicode_literals
+
+import api_v3.models.blob
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_v3', '0021_upload_session'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Blob',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True)),
+                ('size', models.BigIntegerField()),
+                ('references', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='attachment',
+            name='file_name',
+            field=models.CharField(default='', editable=False, max_length=255),
+        ),
+        migrations.RunSQL(
+            "UPDATE api_v3_attachment "
+            "SET file_name = regexp_replace(upload, '^.*/', '')",
+            migrations.RunSQL.noop
+        ),
+        migrations.AlterField(
+            model_name='attachment',
+            name='upload',
+            field=models.FileField(max_length=255, storage=api_v3.models.blob.BlobStorage(), upload_to='attachments/%Y/%m/%d'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.23 on 2019-10-17 14:05
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_v3', '0022_blob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attachment',
+            name='previewed',
+            field=models.NullBooleanField(editable=False),
+        ),
+    ]
@@ -0,0 +1,29 @@
+from contextlib import contextmanager
+import zlib
+
+from django.db import connection
+
+
+def lock_id(name):
+    """Returns a stable lock number for the name, Postgres uses bigint."""
+    return zlib.crc32(name.encode('utf-8')) & 0xffffffff
+
+
+@contextmanager
+def advisory_lock(name):
+    """Holds a Postgres session advisory lock, if it is available.
+
+    Yields `True` if the lock was acquired, `False` if another session
+    holds it. Does not wait for the lock.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_try_advisory_lock(%s)', [lock_id(name)])
+        acquired = cursor.fetchone()[0]
+
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT pg_advisory_unlock(%s)', [lock_id(name)])
@@ -0,0 +1,124 @@
+import uuid
+
+# Read size when streaming the files.
+CHUNK_SIZE = 64 * 1024
+# With more ranges the header is ignored, and the whole file is sent.
+MAX_RANGES = 16
+
+
+class UnsatisfiableRange(ValueError):
+    """None of the requested ranges overlap the file."""
+
+
+def parse_ranges(header, size):
+    """Parses a `Range` header into a list of `(start, end)` byte offsets.
+
+    The end offsets are inclusive. Returns `None` if the header should be
+    ignored, raises `UnsatisfiableRange` if no range fits the file size.
+    """
+    unit, _, specs = (header or '').partition('=')
+
+    if unit.strip().lower() != 'bytes' or not specs.strip():
+        return None
+
+    ranges = []
+
+    for spec in specs.split(','):
+        start, dash, end = spec.strip().partition('-')
+
+        try:
+            if not dash:
+                return None
+            elif not start:
+                # A suffix range, the last bytes of the file.
+                start, end = max(size - int(end), 0), size - 1
+            elif end:
+                start, end = int(start), int(end)
+
+                if end < start:
+                    return None
+            else:
+                start, end = int(start), size - 1
+        except ValueError:
+            return None
+
+        if start < size and start <= end:
+            ranges.append((start, min(end, size - 1)))
+
+    if not ranges:
+        raise UnsatisfiableRange(header)
+
+    if len(ranges) > MAX_RANGES:
+        return None
+
+    return ranges
+
+
+def read_range(fileobj, start, end):
+    """Yields the file bytes between the offsets."""
+    fileobj.seek(start)
+    remaining = end - start + 1
+
+    while remaining > 0:
+        chunk = fileobj.read(min(CHUNK_SIZE, remaining))
+
+        if not chunk:
+            break
+
+        remaining -= len(chunk)
+        yield chunk
+
+
+def stream_range(fileobj, start, end):
+    """Yields the file bytes between the offsets, then closes the file."""
+    try:
+        for chunk in read_range(fileobj, start, end):
+            yield chunk
+    finally:
+        fileobj.close()
+
+
+class MultipartRanges(object):
+    """A `multipart/byteranges` body, streamed from the file."""
+
+    def __init__(self, fileobj, ranges, size, content_type):
+        self.fileobj = fileobj
+        self.ranges = ranges
+        self.boundary = uuid.uuid4().hex
+        self.content_type = 'multipart/byteranges; boundary={}'.format(
+            self.boundary)
+        self.parts = [
+            (
+                (
+                    '--{}\r\nContent-Type: {}\r\n'
+                    'Content-Range: bytes {}-{}/{}\r\n\r\n'
+                ).format(
+                    self.boundary, content_type, start, end, size
+                ).encode('ascii'),
+                start,
+                end
+            )
+            for start, end in ranges
+        ]
+        self.closing = '--{}--\r\n'.format(self.boundary).encode('ascii')
+
+    def __len__(self):
+        """Returns the body length, used for the `Content-Length`."""
+        return sum(
+            len(header) + end - start + 1 + 2
+            for header, start, end in self.parts
+        ) + len(self.closing)
+
+    def __iter__(self):
+        try:
+            for header, start, end in self.parts:
+                yield header
+
+                for chunk in read_range(self.fileobj, start, end):
+                    yield chunk
+
+                yield b'\r\n'
+
+            yield self.closing
+        finally:
+            self.fileobj.close()
@@ -0,0 +1,94 @@
+import re
+
+from django.utils.encoding import force_str, force_text
+from django.utils.six.moves.urllib.parse import unquote_plus
+from querystring_parser.parser import MalformedQueryStringError
+
+FILTER_PARAM = 'filter'
+# The keys of `filter[a][b]`, a key can contain a `[`.
+KEYS = re.compile(r'\[([^\]]*)\]')
+
+
+def unquote(value):
+    """Decodes a query string part, as UTF-8."""
+    return force_text(unquote_plus(force_str(value)))
+
+
+def parse_key(key):
+    """Strips the key quotes, numeric keys become integers."""
+    if key[:1] == "'":
+        key = key[1:]
+    if key[-1:] == "'":
+        key = key[:-1]
+
+    digits = key[1:] if key[:1] in ('-', '+') else key
+
+    return int(key) if digits.isdigit() else key
+
+
+def parse_filter_params(query_string):
+    """Parses the `filter[...]` query parameters into a dict.
+
+    Same results as the `querystring_parser` package, without parsing the
+    other parameters: repeated keys become lists, nested keys dicts. Empty
+    filter values are dropped.
+    """
+    params = {}
+
+    for element in query_string.split('&'):
+        if not element.startswith(FILTER_PARAM):
+            continue
+
+        name, equals, value = element.partition('=')
+
+        if not equals or '=' in value:
+            raise MalformedQueryStringError(element)
+
+        name = unquote(name)
+
+        if name[len(FILTER_PARAM):len(FILTER_PARAM) + 1] != '[':
+            continue
+
+        keys = [
+            parse_key(key)
+            for key in KEYS.findall(name, len(FILTER_PARAM))
+        ]
+
+        if not keys:
+            raise MalformedQueryStringError(element)
+
+        node = params
+        depth = 0
+
+        # Down the existing dicts, the remaining keys nest the value.
+        while depth < len(keys) - 1 and isinstance(
+                node.get(keys[depth]), dict):
+            node = node[keys[depth]]
+            depth += 1
+
+        add_value(
+            node, keys[depth], nest(keys[depth + 1:], unquote(value)))
+
+    for key, value in list(params.items()):
+        if not value:
+            params.pop(key)
+
+    return params
+
+
+def nest(keys, value):
+    """Nests the value under the keys."""
+    for key in reversed(keys):
+        value = {key: value}
+
+    return value
+
+
+def add_value(node, key, value):
+    """Sets the key value, a list if it is repeated."""
+    if key not in node:
+        node[key] = value
+    elif isinstance(node[key], list):
+        node[key].append(value)
+    else:
+        node[key] = [node[key], value]
@@ -0,0 +1,222 @@
+from contextlib import contextmanager
+import logging
+import timeit
+import types
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.backends.utils import CursorWrapper
+
+from . import metrics
+
+logger = logging.getLogger('api_v3.requests')
+slow_query_logger = logging.getLogger('api_v3.slow_queries')
+
+
+class RequestTimings(object):
+    """The SQL, view and rendering timings of a request."""
+
+    def __init__(self):
+        self.start = timeit.default_timer()
+        self.endpoint = None
+        self.queries = 0
+        self.sql_time = 0.0
+        self.render_time = 0.0
+        self.total_time = 0.0
+
+    def record_query(self, duration):
+        self.queries += 1
+        self.sql_time += duration
+
+    def finish(self):
+        self.total_time = timeit.default_timer() - self.start
+
+    @property
+    def view_time(self):
+        """Time spent outside the database and the rendering."""
+        return max(self.total_time - self.sql_time - self.render_time, 0)
+
+    def server_timing(self):
+        """Returns the `Server-Timing` header value."""
+        return ', '.join([
+            'db;dur={:.1f};desc="{} queries"'.format(
+                self.sql_time * 1000, self.queries),
+            'view;dur={:.1f}'.format(self.view_time * 1000),
+            'render;dur={:.1f}'.format(self.render_time * 1000),
+            'total;dur={:.1f}'.format(self.total_time * 1000),
+        ])
+
+
+class TimedCursorWrapper(CursorWrapper):
+    """Reports the query durations to the timings of the connection.
+
+    Slow reads are logged with their plan, see the `SLOW_QUERY_MS` setting.
+    """
+
+    def execute(self, sql, params=None):
+        start = timeit.default_timer()
+        result = super(TimedCursorWrapper, self).execute(sql, params)
+        self.record(sql, params, timeit.default_timer() - start)
+
+        return result
+
+    def executemany(self, sql, param_list):
+        start = timeit.default_timer()
+        result = super(TimedCursorWrapper, self).executemany(sql, param_list)
+        self.record(sql, None, timeit.default_timer() - start)
+
+        return result
+
+    def record(self, sql, params, duration):
+        timings = getattr(self.db, 'request_timings', None)
+
+        if timings is None:
+            return
+
+        timings.record_query(duration)
+
+        if duration * 1000 >= settings.SLOW_QUERY_MS and params is not None:
+            self.log_slow_query(sql, params, duration)
+
+    def log_slow_query(self, sql, params, duration):
+        """Logs the query with its plan, only the reads are explained."""
+        query = self.db.ops.last_executed_query(self.cursor, sql, params)
+        plan = []
+
+        if sql.lstrip().upper().startswith(('SELECT', 'WITH ')):
+            try:
+                # In a savepoint, a failure would break the transaction, and
+                # another cursor, the query results are not fetched yet.
+                with transaction.atomic(using=self.db.alias), (
+                        self.db.connection.cursor()) as cursor:
+                    cursor.execute('EXPLAIN ' + sql, params)
+                    plan = [row[0] for row in cursor.fetchall()]
+            except Exception as error:
+                plan = ['EXPLAIN failed: {!r}'.format(error)]
+
+        slow_query_logger.warning(
+            'slow_query duration_ms=%.1f endpoint=%s\n%s\n%s',
+            duration * 1000,
+            self.db.request_timings.endpoint,
+            query,
+            '\n'.join(plan)
+        )
+
+
+def make_cursor(db, cursor):
+    return TimedCursorWrapper(cursor, db)
+
+
+def make_debug_cursor(db, cursor):
+    return TimedCursorWrapper(type(db).make_debug_cursor(db, cursor), db)
+
+
+def instrument(db):
+    """Wraps the connection cursors, once per connection."""
+    if getattr(db, 'request_timings_installed', False):
+        return
+
+    db.make_cursor = types.MethodType(make_cursor, db)
+    db.make_debug_cursor = types.MethodType(make_debug_cursor, db)
+    db.request_timings_installed = True
+
+
+@contextmanager
+def query_timings(endpoint, using=DEFAULT_DB_ALIAS):
+    """Times the SQL queries of the block, ex. of a management command.
+
+    Yields the timings, finished at the end of the block.
+    """
+    db = connections[using]
+    timings = RequestTimings()
+    timings.endpoint = endpoint
+    instrument(db)
+    previous = getattr(db, 'request_timings', None)
+    db.request_timings = timings
+
+    try:
+        yield timings
+    finally:
+        db.request_timings = previous
+        timings.finish()
+
+
+def endpoint_name(view_func, method):
+    """Returns the endpoint and action name, ex.: `ticket:list`."""
+    actions = getattr(view_func, 'actions', None) or {}
+    initkwargs = getattr(view_func, 'initkwargs', None) or {}
+
+    if 'basename' in initkwargs and method.lower() in actions:
+        return '{}:{}'.format(
+            initkwargs['basename'], actions[method.lower()])
+
+    return getattr(view_func, '__name__', None)
+
+
+class InstrumentationMiddleware(object):
+    """Times the requests, their SQL queries and the response rendering.
+
+    Adds a `Server-Timing` header, logs a line per request and updates the
+    request metrics.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timings = request.timings = RequestTimings()
+
+        for db in connections.all():
+            instrument(db)
+            db.request_timings = timings
+
+        try:
+            response = self.get_response(request)
+        finally:
+            for db in connections.all():
+                db.request_timings = None
+
+        timings.finish()
+        response['Server-Timing'] = timings.server_timing()
+        self.record_metrics(request, response, timings)
+
+        logger.info(
+            'request method=%s path=%s endpoint=%s status=%s queries=%d '
+            'sql_ms=%.1f view_ms=%.1f render_ms=%.1f total_ms=%.1f',
+            request.method, request.path, timings.endpoint,
+            response.status_code, timings.queries, timings.sql_time * 1000,
+            timings.view_time * 1000, timings.render_time * 1000,
+            timings.total_time * 1000
+        )
+
+        return response
+
+    def record_metrics(self, request, response, timings):
+        endpoint = timings.endpoint or 'unresolved'
+
+        metrics.REQUEST_SECONDS.labels(endpoint, request.method).observe(
+            timings.total_time)
+        metrics.RESPONSES.labels(endpoint, response.status_code).inc()
+        metrics.DB_QUERIES.labels(endpoint).inc(timings.queries)
+        metrics.DB_SECONDS.labels(endpoint).inc(timings.sql_time)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.timings.endpoint = endpoint_name(view_func, request.method)
+
+    def process_template_response(self, request, response):
+        """Times the rendering, ex. the JSON API serialization.
+
+        The queries run while rendering, ex. the includes, are not counted.
+        """
+        timings = request.timings
+        start, sql_time = timeit.default_timer(), timings.sql_time
+
+        def rendered(response):
+            timings.render_time = (
+                timeit.default_timer() - start -
+                (timings.sql_time - sql_time)
+            )
+
+        response.add_post_render_callback(rendered)
+
+        return response
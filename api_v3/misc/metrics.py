@@ -0,0 +1,113 @@
+"""Prometheus metrics of the API, the mailer and the jobs worker.
+
+With `PROMETHEUS_MULTIPROC_DIR` set, every process writes its metrics to
+memory mapped files in that directory. Every service gets its own directory,
+under a volume shared by the services, and the `metrics` endpoint merges all
+of these. See the `docker-compose.prod.yml` file.
+"""
+import errno
+import glob
+import os
+
+from django.db.models import Count
+from prometheus_client import (
+    REGISTRY, CollectorRegistry, Counter, Gauge, Histogram)
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.multiprocess import MultiProcessCollector
+
+MULTIPROC_DIR = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+
+# Created before the first metric value file is.
+if MULTIPROC_DIR:
+    try:
+        os.makedirs(MULTIPROC_DIR)
+    except OSError as error:
+        if error.errno != errno.EEXIST:
+            raise
+
+JOB_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600, float('inf'))
+
+REQUEST_SECONDS = Histogram(
+    'id_request_seconds', 'Request durations, by endpoint.',
+    ['endpoint', 'method'])
+RESPONSES = Counter(
+    'id_responses_total', 'Responses, by endpoint and status.',
+    ['endpoint', 'status'])
+DB_QUERIES = Counter(
+    'id_db_queries_total', 'SQL queries run by the requests.', ['endpoint'])
+DB_SECONDS = Counter(
+    'id_db_seconds_total', 'Time spent in the SQL queries of the requests.',
+    ['endpoint'])
+
+UPLOAD_BYTES = Counter(
+    'id_upload_bytes_total', 'Bytes of the received uploads.', ['kind'])
+DOWNLOAD_BYTES = Counter(
+    'id_download_bytes_total', 'Bytes of the sent attachments.', ['backend'])
+
+EMAIL_SEND_SECONDS = Histogram(
+    'id_email_send_seconds', 'Durations of the email SMTP sends.')
+EMAIL_QUEUE_SECONDS = Histogram(
+    'id_email_queue_seconds', 'Time from queued to sent, of the emails.',
+    buckets=JOB_BUCKETS)
+EMAILS = Counter(
+    'id_emails_total', 'Outbox send attempts, by outcome.', ['outcome'])
+
+JOB_SECONDS = Histogram(
+    'id_job_seconds', 'Background job run durations, by name.',
+    ['name', 'status'], buckets=JOB_BUCKETS)
+
+WORKERS = Gauge(
+    'id_gunicorn_workers', 'Running gunicorn workers.',
+    multiprocess_mode='livesum')
+BUSY_WORKERS = Gauge(
+    'id_gunicorn_busy_workers', 'Gunicorn workers handling a request.',
+    multiprocess_mode='livesum')
+
+
+class FilesCollector(MultiProcessCollector):
+    """Merges the metric files of all the services directories."""
+
+    def __init__(self, registry, path):
+        self._path = path
+
+        if registry:
+            registry.register(self)
+
+    def collect(self):
+        files = glob.glob(os.path.join(self._path, '*', '*.db'))
+
+        return self.merge(files, accumulate=True)
+
+
+class OutboxCollector(object):
+    """Reports the outbox depth, counted when collected."""
+
+    def collect(self):
+        # The models import the metrics.
+        from api_v3.models import OutboxEmail
+
+        emails = GaugeMetricFamily(
+            'id_outbox_emails', 'Emails in the outbox, by status.',
+            labels=['status'])
+        counts = dict(
+            OutboxEmail.objects.order_by().values_list('status').annotate(
+                count=Count('id')))
+
+        for status, _ in OutboxEmail.STATUSES:
+            emails.add_metric([status], counts.get(status, 0))
+
+        yield emails
+
+
+def collector_registry():
+    """Returns the registry of the exposed metrics."""
+    registry = CollectorRegistry()
+
+    if MULTIPROC_DIR:
+        FilesCollector(registry, os.path.dirname(MULTIPROC_DIR.rstrip('/')))
+    else:
+        registry.register(REGISTRY)
+
+    registry.register(OutboxCollector())
+
+    return registry
@@ -0,0 +1,98 @@
+from io import BytesIO
+import os
+import shutil
+import subprocess
+import tempfile
+
+from PIL import Image
+
+# Formats Pillow reads, besides the PDF documents.
+IMAGE_MIME_TYPES = (
+    'image/bmp',
+    'image/gif',
+    'image/jpeg',
+    'image/png',
+    'image/tiff',
+    'image/webp',
+)
+PDF_MIME_TYPE = 'application/pdf'
+
+JPEG_QUALITY = 80
+
+
+class PreviewError(Exception):
+    """The file could not be rendered."""
+
+
+def can_preview(mime_type):
+    """Checks if previews can be rendered for the MIME type."""
+    return mime_type in IMAGE_MIME_TYPES or mime_type == PDF_MIME_TYPE
+
+
+def render_previews(path, mime_type, sizes):
+    """Renders the JPEG previews of an image, or of a PDF first page.
+
+    The sizes are a list of `(name, pixels)`, fitting the longest side.
+    Returns the JPEG bytes by name.
+    """
+    largest = max(pixels for _, pixels in sizes)
+
+    if mime_type == PDF_MIME_TYPE:
+        image = render_pdf_page(path, largest)
+    else:
+        image = open_image(path, largest)
+
+    previews = {}
+
+    # From the largest down, every preview is resized from the previous.
+    for name, pixels in sorted(sizes, key=lambda size: -size[1]):
+        image.thumbnail((pixels, pixels), Image.LANCZOS)
+        output = BytesIO()
+        image.save(output, 'JPEG', quality=JPEG_QUALITY, optimize=True)
+        previews[name] = output.getvalue()
+
+    return previews
+
+
+def open_image(path, pixels):
+    """Opens the image, decoded at the smallest scale above the size."""
+    try:
+        image = Image.open(path)
+        # Lets the JPEG decoder skip the pixels it does not need.
+        image.draft('RGB', (pixels, pixels))
+        image.load()
+    except (
+            IOError, OSError, SyntaxError, ValueError,
+            Image.DecompressionBombError) as error:
+        raise PreviewError(error)
+
+    if image.mode in ('RGBA', 'LA', 'P'):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.split()[-1])
+        return background
+
+    return image.convert('RGB')
+
+
+def render_pdf_page(path, pixels):
+    """Renders the PDF first page with `pdftoppm`, from poppler-utils."""
+    temp_dir = tempfile.mkdtemp()
+    prefix = os.path.join(temp_dir, 'page')
+
+    try:
+        with open(os.devnull, 'wb') as devnull:
+            subprocess.check_call(
+                [
+                    'pdftoppm', '-q', '-f', '1', '-l', '1', '-singlefile',
+                    '-jpeg', '-scale-to', str(pixels), path, prefix
+                ],
+                stdout=devnull,
+                stderr=subprocess.STDOUT
+            )
+
+        return open_image(prefix + '.jpg', pixels)
+    except (OSError, subprocess.CalledProcessError) as error:
+        raise PreviewError(error)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
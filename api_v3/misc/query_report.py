@@ -0,0 +1,70 @@
+import threading
+import timeit
+
+from django.db import connection
+from django.db.models.sql.compiler import SQLCompiler
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryReport(object):
+    """Counts and times the SQL queries, and their compilation.
+
+    Compilation is timed by wrapping `SQLCompiler.as_sql()`, for the whole
+    process, use it only for the reports.
+    """
+
+    _local = threading.local()
+
+    def __init__(self):
+        self.queries = CaptureQueriesContext(connection)
+        self.compiled = 0
+        self.compile_time = 0.0
+        self.total_time = 0.0
+
+    @property
+    def query_count(self):
+        return len(self.queries)
+
+    @property
+    def query_time(self):
+        return sum(float(query['time']) for query in self.queries)
+
+    def __enter__(self):
+        report = self
+        as_sql = self.as_sql = SQLCompiler.as_sql
+
+        def timed_as_sql(compiler, *args, **kwargs):
+            # Subqueries are compiled within their query.
+            if getattr(report._local, 'compiling', False):
+                return as_sql(compiler, *args, **kwargs)
+
+            report._local.compiling = True
+            start = timeit.default_timer()
+
+            try:
+                return as_sql(compiler, *args, **kwargs)
+            finally:
+                report.compile_time += timeit.default_timer() - start
+                report.compiled += 1
+                report._local.compiling = False
+
+        SQLCompiler.as_sql = timed_as_sql
+        self.queries.__enter__()
+        self.start = timeit.default_timer()
+
+        return self
+
+    def __exit__(self, *exc_info):
+        self.total_time = timeit.default_timer() - self.start
+        self.queries.__exit__(*exc_info)
+        SQLCompiler.as_sql = self.as_sql
+
+    def summary(self):
+        """Returns the counts and the timings, in milliseconds."""
+        return (
+            '{} queries in {:.1f}ms, {} compiled in {:.1f}ms, '
+            '{:.1f}ms total'
+        ).format(
+            self.query_count, self.query_time * 1000, self.compiled,
+            self.compile_time * 1000, self.total_time * 1000
+        )
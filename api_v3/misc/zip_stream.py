@@ -0,0 +1,177 @@
+import struct
+import zlib
+
+from .byte_ranges import CHUNK_SIZE
+
+# Larger sizes and offsets need the ZIP64 extensions.
+ZIP64_LIMIT = 0xFFFFFFFF
+ZIP_ENTRIES_LIMIT = 0xFFFF
+
+STORED = 0
+DEFLATED = 8
+
+# The sizes and checksum follow the data, the names are UTF-8.
+FLAGS = 0x08 | 0x800
+VERSION = 20
+VERSION_ZIP64 = 45
+# Made on Unix, so the permissions below apply.
+VERSION_MADE_BY = (3 << 8) | VERSION_ZIP64
+FILE_ATTRIBUTES = 0o100644 << 16
+
+# Already compressed, deflating these wastes CPU for no gain.
+COMPRESSED_MIME_TYPES = (
+    'application/epub+zip',
+    'application/gzip',
+    'application/x-7z-compressed',
+    'application/x-bzip2',
+    'application/x-rar-compressed',
+    'application/x-xz',
+    'application/zip',
+    'audio/mpeg',
+    'audio/ogg',
+    'image/gif',
+    'image/jpeg',
+    'image/png',
+    'image/webp',
+    'video/',
+)
+
+
+def is_compressed(mime_type):
+    """Checks if the MIME type is an already compressed format."""
+    return bool(mime_type) and mime_type.startswith(COMPRESSED_MIME_TYPES)
+
+
+def dos_date_time(value):
+    """Returns the MS-DOS date and time of the datetime."""
+    if value.year < 1980:
+        return (1 << 5) | 1, 0
+
+    return (
+        ((value.year - 1980) << 9) | (value.month << 5) | value.day,
+        (value.hour << 11) | (value.minute << 5) | (value.second // 2)
+    )
+
+
+class ZipStream(object):
+    """A ZIP archive, written while iterated.
+
+    Nothing is seeked or buffered, so the entries are written with data
+    descriptors. The ZIP64 extensions are used only where the sizes, the
+    offsets or the number of entries require these.
+    """
+
+    def __init__(self):
+        self.offset = 0
+        self.entries = []
+
+    def _emit(self, data):
+        self.offset += len(data)
+
+        return data
+
+    def add(self, name, fileobj, date_time, size=None, compress=True):
+        """Yields the entry of the file content.
+
+        Entries of unknown or large sizes get the ZIP64 extensions.
+        """
+        name = name.encode('utf-8')
+        method = DEFLATED if compress else STORED
+        # Deflating could grow the content a bit.
+        zip64 = size is None or size + (size >> 10) >= ZIP64_LIMIT
+        date, time = dos_date_time(date_time)
+        offset = self.offset
+
+        if zip64:
+            extra = struct.pack('<HHQQ', 1, 16, 0, 0)
+            header_size = ZIP64_LIMIT
+        else:
+            extra = b''
+            header_size = 0
+
+        yield self._emit(struct.pack(
+            '<IHHHHHIIIHH', 0x04034b50,
+            VERSION_ZIP64 if zip64 else VERSION, FLAGS, method, time, date,
+            0, header_size, header_size, len(name), len(extra)
+        ) + name + extra)
+
+        crc = 0
+        size = compressed_size = 0
+        compressor = (
+            zlib.compressobj(6, zlib.DEFLATED, -15) if compress else None)
+
+        for chunk in iter(lambda: fileobj.read(CHUNK_SIZE), b''):
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+
+            if compressor:
+                chunk = compressor.compress(chunk)
+
+            if chunk:
+                compressed_size += len(chunk)
+                yield self._emit(chunk)
+
+        if compressor:
+            chunk = compressor.flush()
+            compressed_size += len(chunk)
+            yield self._emit(chunk)
+
+        crc &= 0xFFFFFFFF
+
+        if zip64:
+            descriptor = struct.pack(
+                '<IIQQ', 0x08074b50, crc, compressed_size, size)
+        elif max(size, compressed_size) >= ZIP64_LIMIT:
+            raise ValueError(
+                'File larger than its given size: {!r}'.format(name))
+        else:
+            descriptor = struct.pack(
+                '<IIII', 0x08074b50, crc, compressed_size, size)
+
+        yield self._emit(descriptor)
+
+        self.entries.append((
+            name, method, date, time, crc, compressed_size, size, offset))
+
+    def finish(self):
+        """Yields the central directory, ending the archive."""
+        start = self.offset
+
+        for entry in self.entries:
+            yield self._emit(self._central_header(*entry))
+
+        end = self.offset
+        count = len(self.entries)
+
+        if (count >= ZIP_ENTRIES_LIMIT or start >= ZIP64_LIMIT or
+                end - start >= ZIP64_LIMIT):
+            yield self._emit(struct.pack(
+                '<IQHHIIQQQQ', 0x06064b50, 44, VERSION_MADE_BY,
+                VERSION_ZIP64, 0, 0, count, count, end - start, start
+            ))
+            yield self._emit(struct.pack('<IIQI', 0x07064b50, 0, end, 1))
+
+        yield self._emit(struct.pack(
+            '<IHHHHIIH', 0x06054b50, 0, 0,
+            min(count, ZIP_ENTRIES_LIMIT), min(count, ZIP_ENTRIES_LIMIT),
+            min(end - start, ZIP64_LIMIT), min(start, ZIP64_LIMIT), 0
+        ))
+
+    def _central_header(
+            self, name, method, date, time, crc, compressed_size, size,
+            offset):
+        zip64 = max(compressed_size, size, offset) >= ZIP64_LIMIT
+
+        if zip64:
+            extra = struct.pack(
+                '<HHQQQ', 1, 24, size, compressed_size, offset)
+            compressed_size = size = offset = ZIP64_LIMIT
+        else:
+            extra = b''
+
+        return struct.pack(
+            '<IHHHHHHIIIHHHHHII', 0x02014b50, VERSION_MADE_BY,
+            VERSION_ZIP64 if zip64 else VERSION, FLAGS, method, time, date,
+            crc, compressed_size, size, len(name), len(extra), 0, 0, 0,
+            FILE_ATTRIBUTES, offset
+        ) + name + extra
@@ -1,17 +1,128 @@
 from activity.models import Action
-from django.db.models.signals import post_save
+from django.contrib.contenttypes.models import ContentType
+from django.db.models.signals import (
+    post_delete, post_init, post_save, pre_save)
 from django.dispatch import receiver
 
+from api_v3.misc.previews import can_preview
+
 from .attachment import Attachment  # noqa
+from .blob import Blob  # noqa
 from .comment import Comment  # noqa
+from .job import Job  # noqa
+from .outbox_email import OutboxEmail  # noqa
 from .profile import Profile  # noqa
 from .responder import Responder  # noqa
 from .subscriber import Subscriber  # noqa
 from .ticket import Ticket  # noqa
+from .ticket_access import TicketAccess  # noqa
+from .ticket_monthly_stat import TicketMonthlyStat  # noqa
+from .upload_session import UploadSession  # noqa
 
 
 @receiver(post_save, sender=Action)
 def touch_ticket_updated(instance, **kwargs):
-    if isinstance(instance.target, Ticket):
-        instance.target.updated_at = instance.timestamp
-        instance.target.save()
+    ticket_type = ContentType.objects.get_for_model(Ticket)
+
+    if instance.target_content_type_id == ticket_type.id:
+        Ticket.touch(int(instance.target_object_id), instance.timestamp)
+
+
+@receiver(pre_save, sender=Attachment)
+def inspect_attachment_upload(instance, **kwargs):
+    if instance.upload and instance.size is None:
+        instance.inspect_upload()
+
+
+@receiver(post_save, sender=Attachment)
+def reference_attachment_blob(instance, created, **kwargs):
+    digest = instance.upload.storage.digest(instance.upload.name)
+
+    if created and digest:
+        Blob.reference(digest)
+
+
+@receiver(post_save, sender=Attachment)
+def queue_attachment_previews(instance, created, **kwargs):
+    if created and can_preview(instance.mime_type):
+        Job.enqueue('build_attachment_previews')
+
+
+@receiver(post_delete, sender=Attachment)
+def release_attachment_blob(instance, **kwargs):
+    digest = instance.upload.storage.digest(instance.upload.name)
+
+    # The content is removed by `Blob.collect()`, if nobody else uses it.
+    if digest:
+        Blob.reference(digest, -1)
+
+
+@receiver(pre_save, sender=Ticket)
+def track_ticket_resolution(instance, **kwargs):
+    instance.track_resolution()
+
+
+@receiver(post_save, sender=Ticket)
+def grant_requester_access(instance, created, **kwargs):
+    if created:
+        TicketAccess.grant(instance.requester_id, instance.id, 'requester')
+
+
+@receiver(post_save, sender=Responder)
+def grant_responder_access(instance, created, **kwargs):
+    if created:
+        TicketAccess.grant(instance.user_id, instance.ticket_id, 'responder')
+
+
+@receiver(post_delete, sender=Responder)
+def revoke_responder_access(instance, **kwargs):
+    TicketAccess.revoke(instance.user_id, instance.ticket_id, 'responder')
+
+
+@receiver(post_save, sender=Subscriber)
+def grant_subscriber_access(instance, **kwargs):
+    # Email subscribers are mapped to users on their first login.
+    if instance.user_id:
+        TicketAccess.grant(instance.user_id, instance.ticket_id, 'subscriber')
+
+
+@receiver(post_delete, sender=Subscriber)
+def revoke_subscriber_access(instance, **kwargs):
+    subscribers = Subscriber.objects.filter(
+        user_id=instance.user_id, ticket_id=instance.ticket_id)
+
+    if instance.user_id and not subscribers.exists():
+        TicketAccess.revoke(instance.user_id, instance.ticket_id, 'subscriber')
+
+
+@receiver(post_init, sender=Ticket)
+def remember_ticket_created_at(instance, **kwargs):
+    # Keep the stats month of the ticket, to refresh it if that changes.
+    instance._loaded_created_at = instance.__dict__.get('created_at')
+
+
+@receiver(post_save, sender=Ticket)
+@receiver(post_delete, sender=Ticket)
+def refresh_ticket_stats(instance, **kwargs):
+    months = [instance.created_at, instance._loaded_created_at]
+    TicketMonthlyStat.queue_refresh(filter(None, months))
+    instance._loaded_created_at = instance.created_at
+
+
+@receiver(post_save, sender=Responder)
+@receiver(post_delete, sender=Responder)
+def refresh_responder_ticket_stats(instance, created=False, **kwargs):
+    if created:
+        ticket = instance.ticket
+
+        # Saving the first response time already queues the refresh.
+        if not ticket.track_first_response(instance.created_at):
+            TicketMonthlyStat.queue_refresh([ticket.created_at])
+
+        return
+
+    ticket = Ticket.objects.filter(
+        id=instance.ticket_id).values('created_at').first()
+
+    if ticket:
+        TicketMonthlyStat.queue_refresh([ticket['created_at']])
@@ -1,6 +1,15 @@
+import calendar
+import hashlib
+import os.path
+
 from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
 from django.db import models
+from filetype import guess_mime
 
+from api_v3.misc.previews import PreviewError, can_preview, render_previews
+from .blob import Blob
 from .ticket import Ticket
 
 
@@ -11,8 +20,74 @@ class Attachment(models.Model):
         Ticket, blank=False, related_name='attachments', db_index=True)
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL, blank=False, db_index=True)
-    upload = models.FileField(upload_to='attachments/%Y/%m/%d', max_length=255)
+    upload = models.FileField(
+        upload_to='attachments/%Y/%m/%d', max_length=255, storage=Blob.storage)
+    # The upload is named after its content, see `Blob`.
+    file_name = models.CharField(max_length=255, default='', editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Upload details, see `inspect_upload()`.
+    sha256 = models.CharField(max_length=64, null=True, editable=False)
+    size = models.BigIntegerField(null=True, editable=False)
+    mime_type = models.CharField(max_length=255, null=True, editable=False)
+    # If the previews are available, pending if `None`.
+    previewed = models.NullBooleanField(editable=False)
+
+    # Bytes needed to guess the MIME type.
+    MIME_HEADER_SIZE = 261
+    # The preview names and their longest side, in pixels.
+    PREVIEW_SIZES = (('thumbnail', 200), ('preview', 800))
+    # Previews are named after the upload, see `BlobStorage`.
+    preview_storage = FileSystemStorage()
+
+    @property
+    def etag(self):
+        """Returns the upload strong entity tag, if it was hashed."""
+        return '"{}"'.format(self.sha256) if self.sha256 else None
+
+    @property
+    def last_modified(self):
+        """Returns the upload modification time, as a timestamp.
+
+        Uploads are never changed, so this is their creation time.
+        """
+        return calendar.timegm(self.created_at.utctimetuple())
+
+    def inspect_upload(self):
+        """Sets the upload size, MIME type and digest.
+
+        New uploads are stored first, hashed by the storage, so only their
+        header is read. Older uploads are read once.
+        """
+        if not self.upload._committed:
+            self.file_name = os.path.basename(self.upload.name)
+            self.upload.save(self.file_name, self.upload.file, save=False)
+
+        digest = self.upload.storage.digest(self.upload.name)
+        header = b''
+        size = 0
+
+        self.upload.open('rb')
+
+        if digest:
+            header = self.upload.read(self.MIME_HEADER_SIZE)
+            size = self.upload.size
+        else:
+            digest = hashlib.sha256()
+
+            for chunk in self.upload.chunks():
+                if len(header) < self.MIME_HEADER_SIZE:
+                    header += chunk[:self.MIME_HEADER_SIZE - len(header)]
+
+                digest.update(chunk)
+                size += len(chunk)
+
+            digest = digest.hexdigest()
+
+        self.upload.close()
+
+        self.sha256 = digest
+        self.size = size
+        self.mime_type = guess_mime(bytearray(header)) if header else None
 
     @classmethod
     def filter_by_user(cls, user, queryset=None):
@@ -20,6 +95,64 @@ class Attachment(models.Model):
 
         Ones he has access to through the tickets.
         """
-        return (queryset or cls.objects).filter(
-            ticket__in=Ticket.filter_by_user(user)
-        )
+        queryset = cls.objects if queryset is None else queryset
+
+        return queryset.filter(ticket_id__in=Ticket.ids_for_user(user))
+
+    def preview_name(self, size):
+        """Returns the storage name of a preview, next to the upload."""
+        return '{}.{}.jpg'.format(self.upload.name, size)
+
+    def build_previews(self):
+        """Renders and stores the previews, unless these exist.
+
+        Uploads with the same content share the previews.
+        """
+        names = dict(
+            (size, self.preview_name(size)) for size, _ in self.PREVIEW_SIZES)
+        self.previewed = can_preview(self.mime_type)
+
+        if not self.previewed or all(
+                map(self.preview_storage.exists, names.values())):
+            return self.previewed
+
+        try:
+            previews = render_previews(
+                self.upload.path, self.mime_type, self.PREVIEW_SIZES)
+        except PreviewError:
+            self.previewed = False
+            return self.previewed
+
+        for size, data in previews.items():
+            self.preview_storage.delete(names[size])
+            self.preview_storage.save(names[size], ContentFile(data))
+
+        return self.previewed
+
+    @classmethod
+    def build_pending_previews(cls, on_progress=None):
+        """Builds the previews of the new attachments.
+
+        Uploads not inspected yet are left pending, see `inspect_upload()`.
+        Returns the number of attachments with previews.
+        """
+        on_progress = on_progress or (lambda **counts: None)
+        pending = cls.objects.filter(
+            previewed__isnull=True, size__isnull=False).exclude(upload='')
+        processed = previewed = 0
+
+        # Attachments created meanwhile are picked too.
+        while True:
+            attachments = list(pending.order_by('id')[:100])
+
+            if not attachments:
+                break
+
+            for attachment in attachments:
+                previewed += int(attachment.build_previews())
+                attachment.save(update_fields=['previewed'])
+
+            processed += len(attachments)
+            on_progress(processed=processed, previewed=previewed)
+
+        return previewed
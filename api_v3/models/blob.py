@@ -0,0 +1,154 @@
+from datetime import timedelta
+import errno
+import glob
+import hashlib
+import os
+import tempfile
+
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage
+from django.db import models, transaction
+from django.utils import timezone
+from django.utils.deconstruct import deconstructible
+
+
+def makedirs(path):
+    """Creates the directory and its parents, unless these exist."""
+    try:
+        os.makedirs(path)
+    except OSError as error:
+        if error.errno != errno.EEXIST:
+            raise
+
+
+@deconstructible
+class BlobStorage(FileSystemStorage):
+    """Content-addressed storage, every content is stored once.
+
+    Files are named after their SHA-256, hashed while written, and
+    registered as a `Blob`. The upload names are ignored. Files derived
+    from a blob are stored next to it, with the blob name as a prefix.
+    """
+
+    BLOBS_DIR = 'blobs'
+
+    def blob_name(self, digest):
+        return '/'.join([self.BLOBS_DIR, digest[:2], digest[2:4], digest])
+
+    def digest(self, name):
+        """Returns the digest of a blob name, `None` for other files."""
+        parts = (name or '').split('/')
+
+        if len(parts) == 4 and parts[0] == self.BLOBS_DIR and (
+                len(parts[-1]) == 64):
+            return parts[-1]
+
+    def _save(self, name, content):
+        digest = hashlib.sha256()
+        size = 0
+        makedirs(self.path(self.BLOBS_DIR))
+
+        if hasattr(content, 'temporary_file_path'):
+            # Only hashed, moved if the content is new.
+            temp_path = content.temporary_file_path()
+
+            with open(temp_path, 'rb') as temp:
+                for chunk in iter(lambda: temp.read(64 * 1024), b''):
+                    digest.update(chunk)
+                    size += len(chunk)
+        else:
+            fd, temp_path = tempfile.mkstemp(dir=self.path(self.BLOBS_DIR))
+
+            with os.fdopen(fd, 'wb') as temp:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    temp.write(chunk)
+                    size += len(chunk)
+
+        name = self.blob_name(digest.hexdigest())
+        path = self.path(name)
+        makedirs(os.path.dirname(path))
+
+        # Registered first, waits for a `Blob.collect()` removing it.
+        Blob.register(digest.hexdigest(), size)
+
+        if os.path.exists(path):
+            os.remove(temp_path)
+        else:
+            # The uploads temporary directory can be on another filesystem.
+            file_move_safe(temp_path, path, allow_overwrite=True)
+
+            if self.file_permissions_mode is not None:
+                os.chmod(path, self.file_permissions_mode)
+
+        return name
+
+
+class Blob(models.Model):
+    """Stored content, referenced by the attachments.
+
+    Blobs without references are removed by `collect()`.
+    """
+
+    # Unreferenced blobs are kept for a while, a new upload could be using
+    # them before its attachment is saved.
+    GRACE_PERIOD = timedelta(hours=1)
+
+    sha256 = models.CharField(max_length=64, unique=True)
+    size = models.BigIntegerField()
+    references = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    storage = BlobStorage()
+
+    @classmethod
+    def register(cls, sha256, size):
+        """Creates or touches the blob of the stored content."""
+        blobs = cls.objects.filter(sha256=sha256)
+
+        if not blobs.update(updated_at=timezone.now()):
+            cls.objects.get_or_create(sha256=sha256, defaults={'size': size})
+
+    @classmethod
+    def reference(cls, sha256, count=1):
+        """Adds to the blob references, removes them if negative."""
+        cls.objects.filter(sha256=sha256).update(
+            references=models.F('references') + count,
+            updated_at=timezone.now()
+        )
+
+    @classmethod
+    def collect(cls):
+        """Removes the blobs and files nobody references.
+
+        Returns the number of removed blobs.
+        """
+        cutoff = timezone.now() - cls.GRACE_PERIOD
+        removed = 0
+        candidates = cls.objects.filter(
+            references__lte=0, updated_at__lt=cutoff
+        ).values_list('id', flat=True)
+
+        for blob_id in list(candidates):
+            with transaction.atomic():
+                blob = cls.objects.select_for_update().filter(
+                    id=blob_id, references__lte=0, updated_at__lt=cutoff
+                ).first()
+
+                # Referenced or stored again meanwhile.
+                if not blob:
+                    continue
+
+                blob.delete()
+                blob_path = cls.storage.path(
+                    cls.storage.blob_name(blob.sha256))
+
+                # With the files derived from it, ex. the previews.
+                for path in [blob_path] + glob.glob(blob_path + '.*'):
+                    if os.path.exists(path):
+                        os.remove(path)
+
+                removed += 1
+
+        return removed
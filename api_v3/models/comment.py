@@ -21,6 +21,6 @@ class Comment(models.Model):
 
         Ones he has access to through the tickets.
         """
-        return (queryset or cls.objects).filter(
-            ticket__in=Ticket.filter_by_user(user)
-        )
+        queryset = cls.objects if queryset is None else queryset
+
+        return queryset.filter(ticket_id__in=Ticket.ids_for_user(user))
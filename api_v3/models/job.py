@@ -0,0 +1,94 @@
+from datetime import timedelta
+import timeit
+
+from django.contrib.postgres.fields import JSONField
+from django.db import models, transaction
+from django.utils import timezone
+
+from api_v3.misc import metrics
+
+
+class Job(models.Model):
+    """Background job, queued by the requests and run by a worker.
+
+    See the `run_jobs` management command.
+    """
+
+    STATUSES = (
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed')
+    )
+
+    # Running jobs older than this are considered dead, ex. worker killed.
+    STALE_AFTER = timedelta(hours=1)
+
+    name = models.CharField(max_length=255, db_index=True)
+    params = JSONField(default=dict)
+    status = models.CharField(
+        max_length=70, choices=STATUSES, default=STATUSES[0][0],
+        db_index=True)
+    progress = JSONField(default=dict)
+    result = models.TextField(null=True, blank=True)
+    error = models.TextField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True)
+    finished_at = models.DateTimeField(null=True)
+
+    @classmethod
+    def enqueue(cls, name, **params):
+        """Queues a job, unless one with the same name is pending.
+
+        Returns the job and if it was created.
+        """
+        pending = models.Q(status='queued') | models.Q(
+            status='running',
+            started_at__gte=timezone.now() - cls.STALE_AFTER
+        )
+
+        with transaction.atomic():
+            job = cls.objects.select_for_update().filter(
+                pending, name=name).order_by('id').first()
+
+            if job:
+                return job, False
+
+            return cls.objects.create(name=name, params=params), True
+
+    @classmethod
+    def claim(cls):
+        """Marks the oldest queued job as running, and returns it."""
+        with transaction.atomic():
+            job = cls.objects.select_for_update().filter(
+                status='queued').order_by('id').first()
+
+            if job:
+                job.status = 'running'
+                job.started_at = timezone.now()
+                job.save(update_fields=['status', 'started_at'])
+
+        return job
+
+    def run(self, handler):
+        """Runs the job handler, and stores the result or the error."""
+        start = timeit.default_timer()
+
+        try:
+            self.result = handler(self)
+            self.status = 'done'
+        except Exception as error:
+            self.error = repr(error)
+            self.status = 'failed'
+
+        self.finished_at = timezone.now()
+        metrics.JOB_SECONDS.labels(self.name, self.status).observe(
+            timeit.default_timer() - start)
+        self.save(update_fields=['result', 'error', 'status', 'finished_at'])
+
+        return self
+
+    def report_progress(self, **counts):
+        """Updates the job progress counts."""
+        self.progress.update(counts)
+        self.save(update_fields=['progress'])
@@ -0,0 +1,149 @@
+from datetime import timedelta
+import timeit
+
+from django.contrib.postgres.fields import ArrayField
+from django.core.mail import EmailMessage
+from django.db import models, transaction
+from django.utils import timezone
+
+from api_v3.misc import metrics
+
+
+class OutboxEmail(models.Model):
+    """Outgoing email, queued by the requests and sent by a worker.
+
+    See the `send_queued_email` management command.
+    """
+
+    STATUSES = (
+        ('queued', 'Queued'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed')
+    )
+
+    MAX_ATTEMPTS = 5
+    # Seconds to wait before the first retry, doubled after every attempt.
+    RETRY_BACKOFF = 60
+    MAX_RETRY_BACKOFF = 60 * 60
+    # Claimed emails are due again after this, ex. if the worker died.
+    CLAIM_TIMEOUT = timedelta(minutes=10)
+
+    subject = models.TextField()
+    body = models.TextField()
+    from_email = models.CharField(max_length=254)
+    recipients = ArrayField(models.CharField(max_length=254))
+
+    status = models.CharField(
+        max_length=70, choices=STATUSES, default=STATUSES[0][0])
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(null=True, blank=True)
+    send_after = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['status', 'send_after'],
+                name='api_v3_outbox_status_send')
+        ]
+
+    @classmethod
+    def queue(cls, datatuples):
+        """Queues the emails, returns the number of queued emails.
+
+        Takes the same `(subject, body, from_email, recipients)` tuples as
+        `django.core.mail.send_mass_mail`.
+        """
+        emails = cls.objects.bulk_create([
+            cls(
+                subject=subject, body=body,
+                from_email=from_email, recipients=list(recipients)
+            )
+            for subject, body, from_email, recipients in datatuples
+            if recipients
+        ])
+
+        return len(emails)
+
+    @classmethod
+    def due(cls):
+        """Returns the queued emails ready to be sent, oldest first."""
+        return cls.objects.filter(
+            status='queued', send_after__lte=timezone.now()
+        ).order_by('send_after', 'id')
+
+    @classmethod
+    def claim(cls, batch_size=100):
+        """Claims a batch of due emails, by postponing them.
+
+        The rows are locked only while claimed, concurrent workers wait for
+        the claim, then skip the claimed emails. Returns the claimed emails.
+        """
+        with transaction.atomic():
+            emails = list(cls.due().select_for_update()[:batch_size])
+            cls.objects.filter(
+                id__in=[email.id for email in emails]
+            ).update(send_after=timezone.now() + cls.CLAIM_TIMEOUT)
+
+        return emails
+
+    @classmethod
+    def send_batch(cls, connection, batch_size=100):
+        """Sends a batch of claimed emails over the SMTP connection.
+
+        Every email is updated once sent, no lock is held while sending.
+        Returns the sent and failed counts.
+        """
+        sent = failed = 0
+
+        for email in cls.claim(batch_size):
+            start = timeit.default_timer()
+
+            try:
+                # No-op if open, backends close the connections they open.
+                connection.open()
+                connection.send_messages([email.message(connection)])
+            except Exception as error:
+                email.retry_later(error)
+                failed += 1
+                metrics.EMAILS.labels(
+                    'retried' if email.status == 'queued' else 'failed'
+                ).inc()
+                # The connection state is unknown, reopen on next use.
+                connection.close()
+            else:
+                email.status = 'sent'
+                email.sent_at = timezone.now()
+                email.save(update_fields=['status', 'sent_at'])
+                sent += 1
+                metrics.EMAILS.labels('sent').inc()
+                metrics.EMAIL_QUEUE_SECONDS.observe(
+                    (email.sent_at - email.created_at).total_seconds())
+
+            metrics.EMAIL_SEND_SECONDS.observe(timeit.default_timer() - start)
+
+        return sent, failed
+
+    def message(self, connection=None):
+        """Returns the email as a `django.core.mail.EmailMessage`."""
+        return EmailMessage(
+            self.subject, self.body, self.from_email, self.recipients,
+            connection=connection
+        )
+
+    def retry_later(self, error):
+        """Schedules the next attempt, with an exponential backoff."""
+        self.attempts += 1
+        self.last_error = repr(error)
+        delay = min(
+            self.RETRY_BACKOFF * 2 ** (self.attempts - 1),
+            self.MAX_RETRY_BACKOFF
+        )
+        self.send_after = timezone.now() + timedelta(seconds=delay)
+
+        if self.attempts >= self.MAX_ATTEMPTS:
+            self.status = 'failed'
+
+        self.save(update_fields=[
+            'attempts', 'last_error', 'send_after', 'status'])
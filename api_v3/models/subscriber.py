@@ -26,13 +26,9 @@ class Subscriber(models.Model):
 
         Either related to the tickets he created or he is subscribed to.
         """
-        return (queryset or cls.objects).filter(
-            # Allow own subscriber objects
-            models.Q(user=user) |
-            # Allow related to user responder tickets
-            models.Q(ticket__responder_users=user) |
-            # Allow related to user subscribed tickets
-            models.Q(ticket__subscriber_users=user) |
-            # Allow related to user created tickets
-            models.Q(ticket__requester=user)
-        )
+        from .ticket import Ticket  # Avoid circular imports
+
+        queryset = cls.objects if queryset is None else queryset
+
+        # Own subscriber objects are related to the user tickets too.
+        return queryset.filter(ticket_id__in=Ticket.ids_for_user(user))
@@ -1,10 +1,30 @@
+from collections import OrderedDict
+from contextlib import contextmanager
+import threading
+
 from django.conf import settings
-from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import (
+    SearchQuery, SearchRank, SearchVectorField)
+from django.core.exceptions import EmptyResultSet
+from django.db import connection, models
+from django.utils import timezone
 
 from .countries import COUNTRIES
 from .responder import Responder
 from .subscriber import Subscriber
+from .ticket_access import TicketAccess
+
+
+class AnySearchQuery(SearchQuery):
+    """A search query matching any of the keywords lexemes.
+
+    Used to pre-filter the ranked rows using the search vector index.
+    """
+
+    def as_sql(self, compiler, connection):
+        sql, params = super(AnySearchQuery, self).as_sql(compiler, connection)
+        return 'replace({}::text, \'&\', \'|\')::tsquery'.format(sql), params
 
 
 class Ticket(models.Model):
@@ -33,8 +53,16 @@ class Ticket(models.Model):
         ('other', 'Any other question')
     )
 
+    OPEN_STATUSES = ('new', 'in-progress', 'pending')
+    RESOLVED_STATUSES = ('closed', 'cancelled')
+
     MIN_SEARCH_RANK = 0.3
 
+    # Pending `touch()` updates, per thread, see `batch_touches()`.
+    _touches = threading.local()
+
+    # The weights are applied by the `search_vector` database trigger.
+    # Please write a migration to update the trigger if you change these.
     SEARCH_WEIGHT_MAP = {
         'first_name': 'A',
         'last_name': 'A',
@@ -73,6 +101,12 @@ class Ticket(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     sent_notifications_at = models.DateTimeField(null=True)
+    resolved_at = models.DateTimeField(null=True)
+    first_response_at = models.DateTimeField(null=True)
+    # Hours from the creation until the resolution and the first response,
+    # precomputed for the stats.
+    resolution_hours = models.FloatField(null=True)
+    response_hours = models.FloatField(null=True)
 
     # Other ticket type fields, also common to all other types
     background = models.TextField(blank=False)
@@ -93,9 +127,138 @@ class Ticket(models.Model):
     country = models.CharField(
         max_length=100, choices=COUNTRIES, null=True, db_index=True, blank=True)
 
+    # Weighted search document, maintained by a database trigger.
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='api_v3_ticket_search_gin'),
+            # Used by the keyset pagination.
+            models.Index(
+                fields=['created_at', 'id'], name='api_v3_ticket_created_at_id')
+        ]
+
+    def hours_since_created(self, value):
+        """Returns the hours between the creation and the datetime."""
+        return (value - (self.created_at or value)).total_seconds() / 3600
+
+    def track_resolution(self):
+        """Sets or clears the resolution time, based on the status."""
+        if self.status not in self.RESOLVED_STATUSES:
+            self.resolved_at = self.resolution_hours = None
+            return
+
+        self.resolved_at = self.resolved_at or timezone.now()
+        self.resolution_hours = self.hours_since_created(self.resolved_at)
+
+    def track_first_response(self, responded_at):
+        """Sets the first response time, unless the ticket has one.
+
+        Returns if the ticket was saved.
+        """
+        if self.first_response_at:
+            return False
+
+        self.first_response_at = responded_at
+        self.response_hours = self.hours_since_created(responded_at)
+        self.save(update_fields=['first_response_at', 'response_hours'])
+
+        return True
+
+    @classmethod
+    def touch(cls, ticket_id, updated_at):
+        """Sets the ticket last update time, without loading the ticket.
+
+        Inside `batch_touches()` the update is postponed until the end.
+        """
+        pending = getattr(cls._touches, 'pending', None)
+
+        if pending is None:
+            return cls.touch_all({ticket_id: updated_at})
+
+        pending[ticket_id] = max(updated_at, pending.get(ticket_id, updated_at))
+
+    @classmethod
+    @contextmanager
+    def batch_touches(cls):
+        """Groups the `touch()` calls into a single update."""
+        if getattr(cls._touches, 'pending', None) is not None:
+            yield
+            return
+
+        cls._touches.pending = {}
+
+        try:
+            yield
+            pending = cls._touches.pending
+        finally:
+            cls._touches.pending = None
+
+        if pending:
+            cls.touch_all(pending)
+
+    @classmethod
+    def touch_all(cls, times):
+        """Sets the last update times of the tickets, in a single query.
+
+        Takes a dict of times per ticket id. Queues a stats refresh for the
+        tickets updated past their deadline, the rest are not changed.
+        """
+        from .ticket_monthly_stat import TicketMonthlyStat  # Avoid circular
+
+        tickets = cls.objects.filter(id__in=times.keys())
+        months = list(
+            tickets.filter(
+                deadline_at__lt=max(times.values()),
+                updated_at__lte=models.F('deadline_at')
+            ).values_list('created_at', flat=True)
+        )
+
+        tickets.update(
+            updated_at=models.Case(
+                *[
+                    models.When(id=ticket_id, then=models.Value(updated_at))
+                    for ticket_id, updated_at in times.items()
+                ],
+                output_field=models.DateTimeField()
+            )
+        )
+        TicketMonthlyStat.queue_refresh(months)
+
     @property
     def users(self):
-        return self.responder_users.all() | self.subscriber_users.all()
+        """Returns the responder and subscriber users.
+
+        A list, if the users were prefetched, see `prefetch_users()`.
+        """
+        if not hasattr(self, 'user_access'):
+            return self.responder_users.all() | self.subscriber_users.all()
+
+        users = OrderedDict()
+
+        for access in self.user_access:
+            users.setdefault(access.user_id, access.user)
+
+        return list(users.values())
+
+    @classmethod
+    def prefetch_users(cls, queryset):
+        """Prefetches the `users` of the tickets in a single query."""
+        access = TicketAccess.objects.filter(
+            role__in=['responder', 'subscriber']
+        ).select_related('user').order_by('user_id')
+
+        return queryset.prefetch_related(
+            models.Prefetch('access', queryset=access, to_attr='user_access'))
+
+    @classmethod
+    def ids_for_user(cls, user):
+        """Returns a subquery of the user ticket ids.
+
+        Either the ones he created, responds or is subscribed to. Looked up
+        in the `TicketAccess` table, using its `(user, ticket)` index.
+        """
+        return TicketAccess.objects.filter(user=user).values('ticket_id')
 
     @classmethod
     def filter_by_user(cls, user, queryset=None):
@@ -103,33 +266,105 @@ class Ticket(models.Model):
 
         Either the ones he created or he is subscribed to.
         """
-        return (queryset or cls.objects).filter(
-            # Allow ticket authors
-            models.Q(requester=user) |
-            # Allow ticket responders
-            models.Q(responder_users=user) |
-            # Allow ticket subscribers
-            models.Q(subscriber_users=user)
-        ).distinct()
+        queryset = cls.objects if queryset is None else queryset
+
+        return queryset.filter(id__in=cls.ids_for_user(user))
+
+    @classmethod
+    def counts_for_users(cls, users):
+        """Returns the accessible tickets count for every user id.
+
+        Superusers access all the tickets, for the rest the counts are
+        grouped in a single query.
+        """
+        counts = {}
+        regular_ids = [user.id for user in users if not user.is_superuser]
+
+        if len(regular_ids) < len(users):
+            total = cls.objects.count()
+            counts.update(
+                (user.id, total) for user in users if user.is_superuser)
+
+        counts.update(dict.fromkeys(regular_ids, 0))
+        counts.update(
+            TicketAccess.objects.filter(
+                user_id__in=regular_ids
+            ).values_list(
+                'user_id'
+            ).annotate(
+                count=models.Count('ticket_id', distinct=True)
+            ).order_by()
+        )
+
+        return counts
+
+    @classmethod
+    def facets(cls, fields, queryset=None):
+        """Counts the tickets for every choice of the fields.
+
+        A single query, the filtered tickets are selected once, as a common
+        table expression, then grouped by every field. Returns a dict of
+        counts per field choice, and the `all` count.
+        """
+        queryset = cls.objects if queryset is None else queryset
+        facets = {field: {} for field in fields}
+        facets['all'] = 0
+
+        try:
+            tickets_sql, params = queryset.prefetch_related(None).order_by(
+            ).values('id', *fields).query.sql_with_params()
+        except EmptyResultSet:
+            tickets_sql = None
+
+        if tickets_sql:
+            selects = ['SELECT %s, NULL, COUNT(*) FROM tickets']
+            params = list(params) + ['all']
+
+            for field in fields:
+                column = connection.ops.quote_name(
+                    cls._meta.get_field(field).column)
+                selects.append(
+                    'SELECT %s, {0}, COUNT(*) FROM tickets '
+                    'GROUP BY {0}'.format(column)
+                )
+                params.append(field)
+
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'WITH tickets AS ({}) {}'.format(
+                        tickets_sql, ' UNION ALL '.join(selects)),
+                    params
+                )
+
+                for field, value, count in cursor.fetchall():
+                    if field == 'all':
+                        facets['all'] = count
+                    else:
+                        facets[field][value] = count
+
+        for field in fields:
+            counts = facets[field]
+            facets[field] = {
+                value: counts.get(value, 0)
+                for value, _ in cls._meta.get_field(field).flatchoices
+            }
+
+        return facets
 
     @classmethod
     def search_for(cls, keywords, queryset=None):
         """Full text ticket search.
 
-        Returns an annotated query set.
+        Returns an annotated query set. Only the rows matching any of the
+        keywords (a search vector index lookup) get ranked.
         """
         query = SearchQuery(keywords)
-        queryset = queryset or cls.objects
-        vector = None
-
-        for field, weight in cls.SEARCH_WEIGHT_MAP.items():
-            if not vector:
-                vector = SearchVector(field, weight=weight)
-            else:
-                vector += SearchVector(field, weight=weight)
+        queryset = cls.objects if queryset is None else queryset
 
-        return queryset.annotate(
-            rank=SearchRank(vector, query)
+        return queryset.filter(
+            search_vector=AnySearchQuery(keywords)
+        ).annotate(
+            rank=SearchRank(models.F('search_vector'), query)
         ).filter(
             rank__gte=cls.MIN_SEARCH_RANK
         ).order_by('rank')
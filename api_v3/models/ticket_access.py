@@ -0,0 +1,87 @@
+from django.conf import settings
+from django.db import connection, models, transaction
+
+from .responder import Responder
+from .subscriber import Subscriber
+
+
+class TicketAccess(models.Model):
+    """Denormalized ticket access, one row per user and role on a ticket.
+
+    Maintained by the model signals, see `api_v3.models`.
+    """
+
+    ROLES = (
+        ('requester', 'Requester'),
+        ('responder', 'Responder'),
+        ('subscriber', 'Subscriber')
+    )
+
+    # Indexed as the first column of the unique index below.
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, related_name='ticket_access', db_index=False)
+    ticket = models.ForeignKey('Ticket', related_name='access')
+    role = models.CharField(max_length=70, choices=ROLES)
+
+    class Meta:
+        unique_together = ('user', 'ticket', 'role')
+
+    @classmethod
+    def grant(cls, user_id, ticket_id, role):
+        """Adds the user access to the ticket, if it is missing."""
+        return cls.objects.get_or_create(
+            user_id=user_id, ticket_id=ticket_id, role=role)
+
+    @classmethod
+    def revoke(cls, user_id, ticket_id, role):
+        """Removes the user access to the ticket."""
+        return cls.objects.filter(
+            user_id=user_id, ticket_id=ticket_id, role=role).delete()
+
+    @classmethod
+    def expected_sql(cls):
+        """Returns the SQL of the access rows computed from the sources."""
+        return (
+            'SELECT requester_id, id, \'requester\' FROM {ticket} '
+            'UNION SELECT user_id, ticket_id, \'responder\' FROM {responder} '
+            'UNION SELECT user_id, ticket_id, \'subscriber\' FROM {subscriber} '
+            'WHERE user_id IS NOT NULL'
+        ).format(
+            ticket=cls._meta.get_field('ticket').related_model._meta.db_table,
+            responder=Responder._meta.db_table,
+            subscriber=Subscriber._meta.db_table
+        )
+
+    @classmethod
+    def inconsistencies(cls):
+        """Returns the missing and the stale access rows.
+
+        Every row is a `(user_id, ticket_id, role)` tuple.
+        """
+        actual = 'SELECT user_id, ticket_id, role FROM {}'.format(
+            cls._meta.db_table)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                '({}) EXCEPT {}'.format(cls.expected_sql(), actual))
+            missing = cursor.fetchall()
+
+            cursor.execute(
+                '{} EXCEPT ({})'.format(actual, cls.expected_sql()))
+            stale = cursor.fetchall()
+
+        return missing, stale
+
+    @classmethod
+    def rebuild(cls):
+        """Replaces all the access rows, returns the number of rows."""
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                'LOCK TABLE {} IN EXCLUSIVE MODE'.format(cls._meta.db_table))
+            cursor.execute('DELETE FROM {}'.format(cls._meta.db_table))
+            cursor.execute(
+                'INSERT INTO {} (user_id, ticket_id, role) {}'.format(
+                    cls._meta.db_table, cls.expected_sql())
+            )
+
+            return cursor.rowcount
@@ -0,0 +1,151 @@
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import connection, models, transaction
+
+from api_v3.misc.advisory_lock import lock_id
+from .job import Job
+from .responder import Responder
+from .ticket import Ticket
+
+
+class TicketMonthlyStat(models.Model):
+    """Monthly ticket stats rollup, read by the ticket stats endpoint.
+
+    Rows without a responder count every ticket once, the rest count the
+    tickets of every responder. The model signals queue a refresh of the
+    changed months, see `api_v3.models`, run by the jobs worker. Also see the
+    `refresh_ticket_stats` management command.
+    """
+
+    month = models.DateTimeField(db_index=True)
+    status = models.CharField(max_length=70)
+    kind = models.CharField(max_length=70)
+    country = models.CharField(max_length=100, null=True)
+    has_responders = models.BooleanField(default=False)
+    responder = models.ForeignKey(
+        settings.AUTH_USER_MODEL, null=True, related_name='+',
+        db_constraint=False, on_delete=models.DO_NOTHING)
+
+    count = models.PositiveIntegerField(default=0)
+    # Sums of the ticket durations, see `Ticket.resolution_hours`.
+    resolution_hours = models.FloatField(null=True)
+    response_hours = models.FloatField(null=True)
+    # Tickets with a first response.
+    responded = models.PositiveIntegerField(default=0)
+    # Sum of the ticket creation times, in hours since the epoch. Used to
+    # compute the age of the open tickets.
+    created_hours = models.FloatField(default=0)
+    past_deadline = models.PositiveIntegerField(default=0)
+
+    REFRESH_JOB = 'refresh_ticket_stats'
+    MONTH_FORMAT = '%Y-%m'
+
+    ROLLUP_SQL = """
+        SELECT
+            date_trunc('month', t.created_at), t.status, t.kind, t.country,
+            EXISTS (SELECT 1 FROM {responder} r WHERE r.ticket_id = t.id),
+            NULL, COUNT(*),
+            SUM(t.resolution_hours), SUM(t.response_hours),
+            COUNT(t.first_response_at),
+            SUM(EXTRACT(epoch FROM t.created_at) / 3600),
+            SUM(CASE WHEN t.updated_at > t.deadline_at THEN 1 ELSE 0 END)
+        FROM {ticket} t
+        WHERE {where}
+        GROUP BY 1, 2, 3, 4, 5
+        UNION ALL
+        SELECT
+            date_trunc('month', t.created_at), t.status, t.kind, t.country,
+            TRUE, r.user_id, COUNT(*),
+            SUM(t.resolution_hours), SUM(t.response_hours),
+            COUNT(t.first_response_at),
+            SUM(EXTRACT(epoch FROM t.created_at) / 3600),
+            SUM(CASE WHEN t.updated_at > t.deadline_at THEN 1 ELSE 0 END)
+        FROM {ticket} t
+        INNER JOIN {responder} r ON r.ticket_id = t.id
+        WHERE {where}
+        GROUP BY 1, 2, 3, 4, 6
+    """
+
+    @staticmethod
+    def month_of(value):
+        """Returns the start of the month of the datetime."""
+        return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+    @classmethod
+    def next_month(cls, month):
+        """Returns the start of the following month."""
+        return cls.month_of(month.replace(day=28) + timedelta(days=4))
+
+    @classmethod
+    def queue_refresh(cls, months):
+        """Queues a refresh of the months, see the `run_jobs` command.
+
+        Keeps the rollup lock out of the request transactions. Skipped if
+        a queued refresh already covers the months.
+        """
+        months = sorted(set(
+            month.strftime(cls.MONTH_FORMAT) for month in months))
+
+        if not months:
+            return
+
+        queued = Job.objects.filter(
+            name=cls.REFRESH_JOB, status='queued',
+            params__months__contains=months
+        )
+
+        if not queued.exists():
+            Job.objects.create(name=cls.REFRESH_JOB, params={'months': months})
+
+    @classmethod
+    def parse_months(cls, months):
+        """Returns the months queued by `queue_refresh()`."""
+        return [datetime.strptime(month, cls.MONTH_FORMAT) for month in months]
+
+    @classmethod
+    def refresh(cls, months=None):
+        """Recomputes the rows of the months, all of them if none given.
+
+        Returns the number of rows.
+        """
+        table = cls._meta.db_table
+        columns = ', '.join([
+            'month', 'status', 'kind', 'country', 'has_responders',
+            'responder_id', 'count', 'resolution_hours', 'response_hours',
+            'responded', 'created_hours', 'past_deadline'
+        ])
+        if months is not None:
+            months = sorted(set(map(cls.month_of, months)))
+
+        if months is None:
+            delete_sql, where, params = 'DELETE FROM {}', 'TRUE', []
+        elif not months:
+            return 0
+        else:
+            delete_sql = 'DELETE FROM {{}} WHERE month IN ({})'.format(
+                ', '.join(['%s'] * len(months)))
+            where = ' OR '.join(
+                ['(t.created_at >= %s AND t.created_at < %s)'] * len(months))
+            params = []
+
+            for month in months:
+                params += [month, cls.next_month(month)]
+
+        rollup_sql = cls.ROLLUP_SQL.format(
+            ticket=Ticket._meta.db_table,
+            responder=Responder._meta.db_table,
+            where=where
+        )
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            # Serialize the refreshes, these replace the same rows.
+            cursor.execute(
+                'SELECT pg_advisory_xact_lock(%s)', [lock_id(table)])
+            cursor.execute(delete_sql.format(table), months or [])
+            cursor.execute(
+                'INSERT INTO {} ({}) {}'.format(table, columns, rollup_sql),
+                params * 2
+            )
+
+            return cursor.rowcount
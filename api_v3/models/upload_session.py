@@ -0,0 +1,152 @@
+from datetime import timedelta
+import errno
+import hashlib
+import os
+
+from django.conf import settings
+from django.contrib.postgres.fields import ArrayField
+from django.core.files import File
+from django.db import models
+from django.utils import timezone
+
+from .attachment import Attachment
+from .ticket import Ticket
+
+
+class AssembledFile(File):
+    """An assembled upload, moved into the storage instead of copied."""
+
+    def __init__(self, path, size):
+        super(AssembledFile, self).__init__(None, os.path.basename(path))
+        self.path = path
+        self.size = size
+
+    def temporary_file_path(self):
+        return self.path
+
+
+class UploadSession(models.Model):
+    """Chunked attachment upload, finalized into an `Attachment`.
+
+    The chunks are written in place, into a file of the upload size. See
+    the `clean_upload_sessions` management command for the abandoned ones.
+    """
+
+    # Sessions not updated for longer are abandoned.
+    EXPIRE_AFTER = timedelta(days=1)
+    # Bytes to read and write at once.
+    BUFFER_SIZE = 64 * 1024
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, related_name='upload_sessions')
+    ticket = models.ForeignKey(Ticket, related_name='upload_sessions')
+    file_name = models.CharField(max_length=255)
+    size = models.BigIntegerField()
+    chunk_size = models.PositiveIntegerField()
+    received = ArrayField(models.PositiveIntegerField(), default=list)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def path(self):
+        """Returns the path of the file being assembled."""
+        return os.path.join(
+            settings.MEDIA_ROOT, 'uploads', '{}.part'.format(self.id))
+
+    @property
+    def chunks_count(self):
+        """Returns the number of chunks of the upload."""
+        return max(-(-self.size // self.chunk_size), 1)
+
+    @property
+    def missing(self):
+        """Returns the indexes of the chunks not received yet."""
+        return sorted(set(range(self.chunks_count)) - set(self.received))
+
+    @classmethod
+    def expired(cls):
+        """Returns the sessions not updated for a while."""
+        return cls.objects.filter(
+            updated_at__lt=timezone.now() - cls.EXPIRE_AFTER)
+
+    def chunk_length(self, index):
+        """Returns the expected length of the chunk."""
+        return min(self.chunk_size, self.size - index * self.chunk_size)
+
+    def allocate(self):
+        """Creates the file, the chunks are written into it."""
+        try:
+            os.makedirs(os.path.dirname(self.path))
+        except OSError as error:
+            if error.errno != errno.EEXIST:
+                raise
+
+        with open(self.path, 'wb') as part:
+            part.truncate(self.size)
+
+    def write_chunk(self, index, stream, sha256):
+        """Writes the chunk from the stream, if its digest is matching.
+
+        Returns `False` if the chunk is not valid, it has to be sent again.
+        Chunks can be written in any order and in parallel.
+        """
+        if index >= self.chunks_count:
+            return False
+
+        digest = hashlib.sha256()
+        remaining = self.chunk_length(index)
+
+        with open(self.path, 'r+b') as part:
+            part.seek(index * self.chunk_size)
+
+            while remaining > 0:
+                data = stream.read(min(self.BUFFER_SIZE, remaining))
+
+                if not data:
+                    break
+
+                digest.update(data)
+                part.write(data)
+                remaining -= len(data)
+
+        valid = not remaining and digest.hexdigest() == (sha256 or '').lower()
+        sessions = UploadSession.objects.filter(id=self.id)
+
+        # Updated in the database, parallel chunks do not overwrite it.
+        if valid:
+            sessions = sessions.exclude(received__contains=[index])
+
+        sessions.update(
+            received=models.Func(
+                models.F('received'), models.Value(index),
+                function='array_append' if valid else 'array_remove'
+            ),
+            updated_at=timezone.now()
+        )
+        self.refresh_from_db(fields=['received', 'updated_at'])
+
+        return valid
+
+    def finalize(self):
+        """Moves the assembled file to a new attachment, and ends the session.
+
+        Returns the saved attachment.
+        """
+        attachment = Attachment(
+            user=self.user, ticket=self.ticket, file_name=self.file_name)
+        attachment.upload.save(
+            self.file_name, AssembledFile(self.path, self.size), save=False)
+        attachment.save()
+        self.delete()
+
+        return attachment
+
+    def discard(self):
+        """Removes the session and its file."""
+        try:
+            os.remove(self.path)
+        except OSError as error:
+            if error.errno != errno.ENOENT:
+                raise
+
+        self.delete()
@@ -8,3 +8,4 @@ from .responder import ResponderSerializer  # noqa
 from .subscriber import SubscriberSerializer  # noqa
 from .ticket import TicketSerializer  # noqa
 from .ticket_stat import TicketStatSerializer  # noqa
+from .upload_session import UploadSessionSerializer  # noqa
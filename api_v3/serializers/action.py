@@ -4,6 +4,7 @@ from rest_framework_json_api import serializers, relations
 from api_v3.models import Action, Attachment, Comment, Profile
 from .attachment import AttachmentSerializer
 from .comment import CommentSerializer
+from .mixins import FilteredQuerysetMixin
 from .profile import ProfileSerializer
 
 
@@ -36,7 +37,7 @@ class ActionPolymorphicSerializer(serializers.PolymorphicModelSerializer):
     ]
 
 
-class ActionSerializer(serializers.ModelSerializer):
+class ActionSerializer(FilteredQuerysetMixin, serializers.ModelSerializer):
 
     included_serializers = {
         'user': 'api_v3.serializers.ProfileSerializer',
@@ -72,14 +73,25 @@ class ActionSerializer(serializers.ModelSerializer):
         )
 
     def get_root_meta(self, obj, many):
-        """Adds extra root meta details."""
+        """Adds extra root meta details.
+
+        Skipped for the keyset pages, the links point to the next items.
+        """
         view = self.context.get('view') if self.context else None
-        queryset = view.filter_queryset(view.get_queryset()) if view else None
 
-        if not many or not queryset or not queryset.exists():
+        if not many or view is None:
+            return {}
+
+        if getattr(view.paginator, 'cursor', None) is not None:
+            return {}
+
+        queryset = self.get_filtered_queryset()
+        first, last = queryset.first(), queryset.last()
+
+        if first is None:
             return {}
 
         return {
-            'last_id': str(queryset.last().id),
-            'first_id': str(queryset.first().id)
+            'last_id': str(last.id),
+            'first_id': str(first.id)
         }
@@ -1,7 +1,4 @@
-import os.path
-
 from django.urls import reverse
-from filetype import guess_mime
 from rest_framework_json_api import serializers
 
 from api_v3.models import Attachment
@@ -26,6 +23,8 @@ class AttachmentSerializer(serializers.ModelSerializer):
     file_name = serializers.SerializerMethodField()
     file_size = serializers.SerializerMethodField()
     mime_type = serializers.SerializerMethodField()
+    thumbnail = serializers.SerializerMethodField()
+    preview = serializers.SerializerMethodField()
     upload = AttachmentFileField()
 
     class Meta:
@@ -39,21 +38,31 @@ class AttachmentSerializer(serializers.ModelSerializer):
             'file_name',
             'file_size',
             'mime_type',
+            'thumbnail',
+            'preview',
             'created_at'
         )
 
     def get_file_name(self, obj):
         if obj.upload:
-            return os.path.basename(obj.upload.name)
+            return obj.file_name
 
     def get_file_size(self, obj):
-        if obj.upload and os.path.exists(obj.upload.path):
-            return obj.upload.size
-        return 0
+        return obj.size or 0
 
     def get_mime_type(self, obj):
-        if obj.upload and os.path.exists(obj.upload.path):
-            try:
-                return guess_mime(obj.upload.path)
-            except TypeError:
-                return 'application/octet-stream'
+        return obj.mime_type
+
+    def get_thumbnail(self, obj):
+        return self.preview_url(obj, 'thumbnail')
+
+    def get_preview(self, obj):
+        return self.preview_url(obj, 'preview')
+
+    def preview_url(self, obj, size):
+        """Returns the preview link, if it was built."""
+        if obj.previewed and self.context.get('request', None):
+            return self.context['request'].build_absolute_uri(
+                reverse('preview-detail', args=[obj.id]) +
+                '?size={}'.format(size)
+            )
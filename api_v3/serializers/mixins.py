@@ -48,3 +48,21 @@ class ResponderSubscriberSerializer(serializers.ModelSerializer):
                 error.detail['user'] = messages
 
             raise error
+
+
+class FilteredQuerysetMixin(object):
+    """Root meta helpers, for the serializers of the list endpoints."""
+
+    def get_filtered_queryset(self):
+        """Returns the view queryset, with the permissions and the filters.
+
+        The listed one is reused, otherwise it is built again.
+        """
+        queryset = self.context.get('filtered_queryset')
+
+        if queryset is None:
+            view = self.context['view']
+            queryset = view.filter_queryset(view.get_queryset())
+
+        # A copy, the callers could change its filters.
+        return queryset.all()
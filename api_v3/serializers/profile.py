@@ -1,9 +1,26 @@
+from django.db import models
 from rest_framework import fields
+from rest_framework import serializers as drf_serializers
 from rest_framework_json_api import serializers
 
 from api_v3.models import Profile, Ticket
 
 
+class ProfileListSerializer(drf_serializers.ListSerializer):
+    """Loads the tickets counts of all the profiles in a single query."""
+
+    def to_representation(self, data):
+        profiles = list(
+            data.all() if isinstance(data, models.Manager) else data)
+        counts = self.context.setdefault('tickets_counts', {})
+        missing = [profile for profile in profiles if profile.id not in counts]
+
+        if missing:
+            counts.update(Ticket.counts_for_users(missing))
+
+        return super(ProfileListSerializer, self).to_representation(profiles)
+
+
 class ProfileSerializer(serializers.ModelSerializer):
 
     tickets_count = fields.SerializerMethodField()
@@ -30,12 +47,16 @@ class ProfileSerializer(serializers.ModelSerializer):
             'locale',
             'tickets_count'
         )
+        list_serializer_class = ProfileListSerializer
 
     def get_tickets_count(self, obj):
-        if obj.is_superuser:
-            return Ticket.objects.count()
-        else:
-            return Ticket.filter_by_user(obj).count()
+        """Returns the tickets count, cached for the serializer context."""
+        counts = self.context.setdefault('tickets_counts', {})
+
+        if obj.id not in counts:
+            counts.update(Ticket.counts_for_users([obj]))
+
+        return counts[obj.id]
 
     def to_representation(self, obj):
         request = self.context.get('request', None)
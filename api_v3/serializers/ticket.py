@@ -1,12 +1,46 @@
 from datetime import datetime
 
+from django.db import models
+from rest_framework import serializers as drf_serializers
 from rest_framework_json_api import serializers
 
 from api_v3.models import Profile, Ticket
+from .mixins import FilteredQuerysetMixin
 from .profile import ProfileSerializer
 
 
-class TicketSerializer(serializers.ModelSerializer):
+class TicketListSerializer(drf_serializers.ListSerializer):
+    """Loads the tickets counts of all the page profiles in a single query.
+
+    Only the profiles already loaded with the tickets are considered.
+    """
+
+    def to_representation(self, data):
+        tickets = list(
+            data.all() if isinstance(data, models.Manager) else data)
+        counts = self.context.setdefault('tickets_counts', {})
+        profiles = {}
+
+        for ticket in tickets:
+            if hasattr(ticket, Ticket.requester.cache_name):
+                profiles[ticket.requester_id] = ticket.requester
+
+            if hasattr(ticket, 'user_access'):
+                profiles.update(
+                    (user.id, user) for user in ticket.users)
+
+        missing = [
+            profile for profile_id, profile in profiles.items()
+            if profile_id not in counts
+        ]
+
+        if missing:
+            counts.update(Ticket.counts_for_users(missing))
+
+        return super(TicketListSerializer, self).to_representation(tickets)
+
+
+class TicketSerializer(FilteredQuerysetMixin, serializers.ModelSerializer):
 
     included_serializers = {
         'users': 'api_v3.serializers.ProfileSerializer',
@@ -24,6 +58,7 @@ class TicketSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Ticket
+        list_serializer_class = TicketListSerializer
         read_only_fields = (
             'requester',
             'responders',
@@ -136,15 +171,17 @@ class TicketSerializer(serializers.ModelSerializer):
 
         return filters
 
-    def get_ticket_totals(self):
-        """Returns the ticket totals based on the status."""
-        total = {}
+    def get_ticket_facets(self):
+        """Returns the ticket counts per status and per requested facets.
+
+        See `Ticket.facets()` for the query.
+        """
         view = self.context.get('view') if self.context else None
 
         if not view:
-            return total
+            return {}
 
-        queryset = view.filter_queryset(view.get_queryset())
+        queryset = self.get_filtered_queryset()
 
         # Reset status filters to gather proper counts.
         for clause in queryset.query.where.children:
@@ -154,20 +191,34 @@ class TicketSerializer(serializers.ModelSerializer):
             except Exception:
                 pass
 
-        for status in Ticket.STATUSES:
-            status = status[0]
-            total[status] = queryset.filter(status=status).count()
+        fields = ['status']
 
-        total['all'] = queryset.count()
+        if hasattr(view, 'get_facet_fields'):
+            fields += view.get_facet_fields()
 
-        return total
+        return Ticket.facets(fields, queryset)
 
     def get_root_meta(self, obj, many):
         """Adds extra root meta details."""
+        facets = self.get_ticket_facets()
+        total = facets.pop('status', {})
+
+        if 'all' in facets:
+            total['all'] = facets.pop('all')
+
+        meta = {'total': total}
+
         if many:
-            return {
-                'total': self.get_ticket_totals(),
-                'filters': self.get_request_filters()
-            }
-        else:
-            return {'total': self.get_ticket_totals()}
+            meta['filters'] = self.get_request_filters()
+
+        # Values are not used as keys, these would get formatted.
+        if facets:
+            meta['facets'] = dict(
+                (field, [
+                    {'value': value, 'count': count}
+                    for value, count in sorted(counts.items()) if count
+                ])
+                for field, counts in facets.items()
+            )
+
+        return meta
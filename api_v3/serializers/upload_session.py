@@ -0,0 +1,35 @@
+from django.conf import settings
+from rest_framework_json_api import serializers
+
+from api_v3.models import UploadSession
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+
+    chunks_count = serializers.IntegerField(read_only=True)
+    missing = serializers.ListField(read_only=True)
+
+    class Meta:
+        model = UploadSession
+        read_only_fields = ('user', 'chunk_size', 'received')
+        fields = (
+            'id',
+            'user',
+            'ticket',
+            'file_name',
+            'size',
+            'chunk_size',
+            'chunks_count',
+            'received',
+            'missing',
+            'created_at',
+            'updated_at'
+        )
+
+    def validate_size(self, value):
+        if value < 1 or value > settings.MAX_UPLOAD_SIZE:
+            raise serializers.ValidationError(
+                'Size should be up to {} bytes.'.format(
+                    settings.MAX_UPLOAD_SIZE))
+
+        return value
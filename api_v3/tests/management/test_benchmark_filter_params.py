@@ -0,0 +1,16 @@
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils.six import StringIO
+
+
+class BenchmarkFilterParamsCommandTestCase(TestCase):
+
+    def test_handle(self):
+        out = StringIO()
+
+        call_command(
+            'benchmark_filter_params', number=10, repeat=1, stdout=out)
+
+        self.assertIn('legacy', out.getvalue())
+        self.assertIn('current', out.getvalue())
+        self.assertIn('Same filters parsed.', out.getvalue())
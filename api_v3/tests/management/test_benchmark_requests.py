@@ -0,0 +1,74 @@
+import json
+import os
+import shutil
+import tempfile
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.utils.six import StringIO
+
+from api_v3.management.commands.benchmark_requests import percentile
+
+
+class BenchmarkRequestsCommandTestCase(TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.baseline = os.path.join(self.temp_dir, 'baseline.json')
+
+        call_command(
+            'seed_dataset', profiles=10, superusers=1, tickets=20, fan_out=2,
+            comments=10, attachments=5, actions=50, stdout=StringIO()
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_handle(self):
+        out = StringIO()
+
+        call_command(
+            'benchmark_requests', superusers=1, users=2, repeat=1,
+            save_baseline=self.baseline, stdout=out
+        )
+
+        with open(self.baseline) as baseline:
+            results = json.load(baseline)
+
+        self.assertEqual(len(results), 16)
+        self.assertEqual(
+            sorted(results['user tickets'].keys()),
+            ['p50', 'p95', 'p99', 'queries']
+        )
+        self.assertRegexpMatches(
+            out.getvalue(),
+            r'superuser ticket-stats +p50: +[\d.]+ms p95: +[\d.]+ms '
+            r'p99: +[\d.]+ms queries: \d+'
+        )
+        self.assertIn('Benchmarked 16 scenarios.', out.getvalue())
+
+        call_command(
+            'benchmark_requests', superusers=1, users=2, repeat=1,
+            baseline=self.baseline, tolerance=100, stdout=StringIO()
+        )
+
+    def test_handle_regression(self):
+        with open(self.baseline, 'w') as baseline:
+            json.dump({
+                'user tickets': {
+                    'p50': 0.001, 'p95': 0.001, 'p99': 0.001, 'queries': 1}
+            }, baseline)
+
+        with self.assertRaisesRegexp(CommandError, 'user tickets: p95'):
+            call_command(
+                'benchmark_requests', superusers=0, users=1, repeat=1,
+                baseline=self.baseline, stdout=StringIO()
+            )
+
+    def test_percentile(self):
+        values = range(1, 101)
+
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([3], 95), 3)
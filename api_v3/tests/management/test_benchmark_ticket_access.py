@@ -0,0 +1,21 @@
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils.six import StringIO
+
+from api_v3.models import Profile, Ticket
+
+
+class BenchmarkTicketAccessCommandTestCase(TestCase):
+
+    def test_handle(self):
+        out = StringIO()
+
+        call_command(
+            'benchmark_ticket_access',
+            users=20, tickets=50, fan_out=2, samples=5, repeat=1, stdout=out
+        )
+
+        self.assertIn('Seeded 20 profiles and 50 tickets.', out.getvalue())
+        self.assertIn('Same rows for all users.', out.getvalue())
+        self.assertEqual(Ticket.objects.count(), 0)
+        self.assertEqual(Profile.objects.count(), 0)
@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta
+import os.path
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils.six import StringIO
+
+from api_v3.factories import TicketFactory
+from api_v3.models import UploadSession
+
+
+class CleanUploadSessionsCommandTestCase(TestCase):
+
+    def setUp(self):
+        ticket = TicketFactory.create()
+        self.sessions = [
+            UploadSession.objects.create(
+                user=ticket.requester, ticket=ticket, file_name='file.txt',
+                size=10, chunk_size=4
+            )
+            for _ in range(2)
+        ]
+
+        for session in self.sessions:
+            session.allocate()
+
+        UploadSession.objects.filter(id=self.sessions[0].id).update(
+            updated_at=datetime.utcnow() - timedelta(days=2))
+
+    def test_clean(self):
+        out = StringIO()
+
+        call_command('clean_upload_sessions', stdout=out)
+
+        self.assertIn('Removed 1 upload sessions.', out.getvalue())
+        self.assertFalse(os.path.exists(self.sessions[0].path))
+        self.assertEqual(
+            list(UploadSession.objects.values_list('id', flat=True)),
+            [self.sessions[1].id]
+        )
+
+        self.sessions[1].discard()
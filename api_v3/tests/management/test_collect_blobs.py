@@ -0,0 +1,26 @@
+from datetime import datetime, timedelta
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils.six import StringIO
+
+from api_v3.factories import AttachmentFactory
+from api_v3.models import Blob
+
+
+class CollectBlobsCommandTestCase(TestCase):
+
+    def setUp(self):
+        self.attachment = AttachmentFactory.create()
+        self.blob = Blob.objects.get(sha256=self.attachment.sha256)
+
+    def test_collect(self):
+        self.attachment.delete()
+        Blob.objects.filter(id=self.blob.id).update(
+            updated_at=datetime.utcnow() - timedelta(days=1))
+        out = StringIO()
+
+        call_command('collect_blobs', stdout=out)
+
+        self.assertIn('Removed 1 blobs.', out.getvalue())
+        self.assertFalse(Blob.objects.filter(id=self.blob.id).exists())
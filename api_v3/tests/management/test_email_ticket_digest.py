@@ -1,9 +1,14 @@
 from datetime import datetime
+import re
 
+from django.core.management.base import CommandError
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils.six import StringIO
 import mock
 
-from api_v3.models import Action, Responder
+from api_v3.models import Action, OutboxEmail, Responder, Ticket
 from api_v3.management.commands import email_ticket_digest
 from api_v3.factories import TicketFactory, CommentFactory
 
@@ -63,19 +68,19 @@ class TicketDigestTestCase(TestCase):
 
     def test_email_rendering(self):
         command = email_ticket_digest.Command()
-        emails = []
         request_host = 'test.host'
 
-        with mock.patch.object(
-            email_ticket_digest,
-            'send_mass_mail',
-            lambda x, fail_silently: (emails.extend(x), 1)
-        ):
-            command.handle(request_host=request_host)
+        status = command.handle(request_host=request_host)
+        emails = OutboxEmail.objects.order_by('id')
 
+        self.assertIn('Queued 2 notifications', status)
         self.assertEqual(len(emails), 2)
-        self.assertEqual(len(emails[0]), 4)
-        self.assertEqual(len(emails[1]), 4)
+        self.assertEqual(
+            sorted(email.recipients[0] for email in emails),
+            sorted(user.email for user in self.users)
+        )
+        self.assertEqual(emails[0].subject, command.SUBJECT)
+        self.assertIn(request_host, emails[0].body)
 
     def test_emails(self):
         command = email_ticket_digest.Command()
@@ -83,7 +88,7 @@ class TicketDigestTestCase(TestCase):
         request_host = 'test.host'
 
         with mock.patch.object(
-                command, 'email', lambda x: (email.update(x), 1)):
+                command, 'email', lambda x: (email.update(x), 1)[1]):
             status = command.handle(request_host=request_host)
 
         digest1 = email[self.users[0].id]['digests']
@@ -95,7 +100,7 @@ class TicketDigestTestCase(TestCase):
         self.assertEqual(len(upcoming2), 1)
         self.assertIn(self.tickets[0], upcoming2)
 
-        self.assertIn('Sent 1 notifications', status)
+        self.assertIn('Queued 1 notifications', status)
         self.assertEqual(email[self.users[0].id]['user'], self.users[0])
         self.assertEqual(len(digest1), 2)
         self.assertIn(request_host, str(digest1))
@@ -138,3 +143,48 @@ class TicketDigestTestCase(TestCase):
             u'the ticket'.format(self.users[1].display_name),
             u' '.join(digest2)
         )
+
+    def test_queries_do_not_grow_with_tickets(self):
+        queries = []
+        reported = []
+
+        for _ in range(2):
+            out = StringIO()
+            command = email_ticket_digest.Command(stdout=out)
+
+            with mock.patch.object(command, 'email', lambda x: 1), (
+                    CaptureQueriesContext(connection)) as captured:
+                command.handle(request_host='test.host')
+
+            queries.append(len(captured))
+            reported.append(re.search(
+                r'Digested \d+ tickets in [\d.]+s, with (\d+) queries.',
+                out.getvalue()
+            ).group(1))
+
+            for ticket in TicketFactory.create_batch(5):
+                comment = CommentFactory.create(
+                    ticket=ticket, user=ticket.requester)
+                Action.objects.create(
+                    verb='comment:create', target=ticket,
+                    actor=ticket.requester, action=comment
+                )
+
+        self.assertEqual(queries[0], queries[1])
+        self.assertEqual(reported[0], reported[1])
+        self.assertNotEqual(reported[0], '0')
+        self.assertEqual(
+            Ticket.objects.filter(sent_notifications_at=None).count(), 5)
+
+    def test_handle_locked(self):
+        command = email_ticket_digest.Command()
+
+        with mock.patch.object(
+                email_ticket_digest, 'advisory_lock',
+                lambda name: mock.MagicMock(
+                    __enter__=mock.Mock(return_value=False))):
+            with self.assertRaises(CommandError):
+                command.handle(request_host='test.host')
+
+        self.assertEqual(
+            Ticket.objects.filter(sent_notifications_at=None).count(), 2)
@@ -0,0 +1,38 @@
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils.six import StringIO
+
+from api_v3.factories import AttachmentFactory
+from api_v3.models import Attachment
+
+
+class InspectAttachmentsCommandTestCase(TestCase):
+
+    def setUp(self):
+        self.attachments = [
+            AttachmentFactory.create(
+                upload=SimpleUploadedFile(
+                    'image.png', b'\x89PNG\r\n\x1a\n' + b'\0' * 300)),
+            AttachmentFactory.create()
+        ]
+        Attachment.objects.update(sha256=None, size=None, mime_type=None)
+
+    def test_inspect(self):
+        self.attachments[1].upload.storage.delete(
+            self.attachments[1].upload.name)
+        out, err = StringIO(), StringIO()
+
+        call_command('inspect_attachments', stdout=out, stderr=err)
+
+        attachment = Attachment.objects.get(id=self.attachments[0].id)
+
+        self.assertIn(
+            'Inspected 1 attachments, 1 files missing.', out.getvalue())
+        self.assertIn(
+            'Attachment ID: {}'.format(self.attachments[1].id),
+            err.getvalue()
+        )
+        self.assertEqual(attachment.size, 308)
+        self.assertEqual(attachment.mime_type, 'image/png')
+        self.assertEqual(len(attachment.sha256), 64)
@@ -0,0 +1,42 @@
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.utils.six import StringIO
+
+from api_v3.factories import ResponderFactory
+from api_v3.models import TicketAccess
+
+
+class RebuildTicketAccessCommandTestCase(TestCase):
+
+    def setUp(self):
+        self.responder = ResponderFactory.create()
+
+    def test_check(self):
+        out = StringIO()
+
+        call_command('rebuild_ticket_access', check=True, stdout=out)
+
+        self.assertIn('Ticket access is consistent.', out.getvalue())
+
+    def test_check_inconsistent(self):
+        TicketAccess.objects.filter(role='responder').delete()
+        err = StringIO()
+
+        with self.assertRaises(CommandError):
+            call_command('rebuild_ticket_access', check=True, stderr=err)
+
+        self.assertIn(
+            'Missing: user ID: {}, ticket ID: {}, role: responder'.format(
+                self.responder.user_id, self.responder.ticket_id),
+            err.getvalue()
+        )
+
+    def test_rebuild(self):
+        TicketAccess.objects.all().delete()
+        out = StringIO()
+
+        call_command('rebuild_ticket_access', stdout=out)
+
+        self.assertIn('Rebuilt 2 ticket access rows.', out.getvalue())
+        self.assertEqual(TicketAccess.inconsistencies(), ([], []))
@@ -0,0 +1,29 @@
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils.six import StringIO
+
+from api_v3.factories import ResponderFactory
+from api_v3.models import TicketMonthlyStat
+
+
+class RefreshTicketStatsCommandTestCase(TestCase):
+
+    def setUp(self):
+        self.responder = ResponderFactory.create()
+
+    def test_refresh(self):
+        TicketMonthlyStat.objects.all().delete()
+        out = StringIO()
+
+        call_command('refresh_ticket_stats', stdout=out)
+
+        self.assertIn('Refreshed 2 ticket stats rows.', out.getvalue())
+
+    def test_refresh_months(self):
+        TicketMonthlyStat.objects.all().delete()
+        out = StringIO()
+
+        call_command('refresh_ticket_stats', months=2, stdout=out)
+
+        self.assertIn('Refreshed 2 ticket stats rows.', out.getvalue())
+        self.assertEqual(TicketMonthlyStat.objects.count(), 2)
@@ -0,0 +1,36 @@
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models.sql.compiler import SQLCompiler
+from django.test import TestCase
+from django.utils.six import StringIO
+
+from api_v3.factories import ProfileFactory, TicketFactory
+
+
+class ReportRequestQueriesCommandTestCase(TestCase):
+
+    def setUp(self):
+        self.user = ProfileFactory.create(is_superuser=True)
+        TicketFactory.create_batch(2, requester=self.user)
+
+    def test_handle(self):
+        as_sql = SQLCompiler.as_sql
+        out = StringIO()
+
+        call_command(
+            'report_request_queries', '/api/v3/tickets?facets=kind',
+            user=self.user.email, repeat=1, stdout=out
+        )
+
+        self.assertIn('200 /api/v3/tickets?facets=kind', out.getvalue())
+        self.assertRegexpMatches(
+            out.getvalue(), r'\d+ queries in .*ms, \d+ compiled in .*ms')
+        self.assertIn('Reported 1 requests.', out.getvalue())
+        self.assertEqual(SQLCompiler.as_sql, as_sql)
+
+    def test_handle_unknown_user(self):
+        with self.assertRaises(CommandError):
+            call_command(
+                'report_request_queries', '/api/v3/tickets',
+                user='nobody@example.org', stdout=StringIO()
+            )
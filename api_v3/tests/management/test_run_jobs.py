@@ -0,0 +1,38 @@
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils.six import StringIO
+
+from api_v3.factories import TicketFactory
+from api_v3.models import Action, Job
+
+
+class RunJobsCommandTestCase(TestCase):
+
+    def test_handle(self):
+        ticket = TicketFactory.create()
+        Action.objects.create(
+            verb='ticket:update:reopen', target=ticket, actor=ticket.requester)
+        job, _ = Job.enqueue('email_ticket_digest', request_host='test.host')
+        out = StringIO()
+
+        call_command('run_jobs', stdout=out)
+        job.refresh_from_db()
+
+        # The ticket stats refresh and the digest.
+        self.assertIn('Ran 2 jobs.', out.getvalue())
+        self.assertEqual(job.status, 'done')
+        self.assertIn('Queued 1 notifications.', job.result)
+        self.assertEqual(
+            job.progress,
+            {'tickets': 1, 'processed': 1, 'notified': 1, 'queued': 1}
+        )
+        self.assertFalse(Job.enqueue('email_ticket_digest')[0] == job)
+
+    def test_handle_unknown_job(self):
+        job, _ = Job.enqueue('unknown')
+
+        call_command('run_jobs', stdout=StringIO())
+        job.refresh_from_db()
+
+        self.assertEqual(job.status, 'failed')
+        self.assertIn('Unknown job: unknown', job.error)
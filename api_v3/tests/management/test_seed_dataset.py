@@ -0,0 +1,52 @@
+from activity.models import Action
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.utils.six import StringIO
+
+from api_v3.models import (
+    Attachment, Blob, Comment, Profile, Ticket, TicketAccess)
+
+
+class SeedDatasetCommandTestCase(TestCase):
+
+    def test_handle(self):
+        out = StringIO()
+
+        call_command(
+            'seed_dataset', profiles=20, superusers=2, tickets=30, fan_out=2,
+            comments=40, attachments=15, actions=100, batch_size=7, stdout=out
+        )
+
+        self.assertIn(
+            'Seeded 20 profiles, 30 tickets, 40 comments, 15 attachments '
+            'and 100 activities.',
+            out.getvalue()
+        )
+        self.assertEqual(Profile.objects.filter(is_superuser=True).count(), 2)
+        self.assertEqual(Ticket.objects.count(), 30)
+        self.assertEqual(Comment.objects.count(), 40)
+        self.assertEqual(Action.objects.count(), 100)
+        self.assertEqual(
+            TicketAccess.objects.filter(role='requester').count(), 30)
+        self.assertEqual(TicketAccess.inconsistencies(), ([], []))
+        self.assertEqual(
+            sum(Blob.objects.values_list('references', flat=True)),
+            Attachment.objects.count()
+        )
+        self.assertFalse(Ticket.objects.filter(
+            status__in=Ticket.RESOLVED_STATUSES, resolved_at=None).exists())
+        self.assertTrue(Ticket.search_for('offshore').exists())
+
+    def test_handle_few_profiles(self):
+        call_command(
+            'seed_dataset', profiles=3, superusers=1, tickets=10, fan_out=3,
+            comments=5, attachments=2, actions=10, stdout=StringIO()
+        )
+
+        self.assertEqual(Ticket.objects.count(), 10)
+        self.assertEqual(TicketAccess.inconsistencies(), ([], []))
+
+    def test_handle_no_profiles(self):
+        with self.assertRaises(CommandError):
+            call_command('seed_dataset', profiles=0, stdout=StringIO())
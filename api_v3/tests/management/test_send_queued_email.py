@@ -0,0 +1,20 @@
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils.six import StringIO
+
+from api_v3.models import OutboxEmail
+
+
+class SendQueuedEmailCommandTestCase(TestCase):
+
+    def test_handle(self):
+        OutboxEmail.queue([
+            ['Subject', 'Body', 'from@example.org', ['to@example.org']]
+        ] * 3)
+        out = StringIO()
+
+        call_command('send_queued_email', batch_size=2, stdout=out)
+
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertIn('Done, sent 3 and failed 0 emails.', out.getvalue())
@@ -0,0 +1,27 @@
+from unittest import TestCase
+
+from api_v3.misc.byte_ranges import UnsatisfiableRange, parse_ranges
+
+
+class ParseRangesTestCase(TestCase):
+
+    def test_ranges(self):
+        self.assertEqual(
+            parse_ranges('bytes=0-9, 20-, -5', 100),
+            [(0, 9), (20, 99), (95, 99)]
+        )
+
+    def test_ranges_past_the_end(self):
+        self.assertEqual(
+            parse_ranges('bytes=90-200,150-', 100), [(90, 99)])
+
+        with self.assertRaises(UnsatisfiableRange):
+            parse_ranges('bytes=100-', 100)
+
+    def test_ignored(self):
+        self.assertIsNone(parse_ranges(None, 100))
+        self.assertIsNone(parse_ranges('items=0-1', 100))
+        self.assertIsNone(parse_ranges('bytes=5-1', 100))
+        self.assertIsNone(parse_ranges('bytes=a-b', 100))
+        self.assertIsNone(
+            parse_ranges('bytes=' + ','.join(['0-1'] * 17), 100))
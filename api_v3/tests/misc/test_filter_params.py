@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+from unittest import TestCase
+
+from django.test import RequestFactory
+from querystring_parser import parser as qs_parser
+from querystring_parser.parser import MalformedQueryStringError
+import mock
+
+from api_v3.misc.filter_params import parse_filter_params
+from api_v3.views.support import JSONApiEndpoint
+
+
+class ParseFilterParamsTestCase(TestCase):
+
+    QUERY_STRINGS = [
+        '',
+        'filter[kind]=other&filter[search]=x%20y+z&page[size]=2',
+        'filter%5Bstatus__in%5D=new,closed&include=requester',
+        'filter[requester]=1&filter[requester]=2&filter[requester]=3',
+        'filter[a][b]=1&filter[a][c]=2&filter[a][b]=3&filter[a][d][e]=4',
+        'filter[0]=zero&filter[\'quoted\']=1',
+        'filter[search]=%C8%9B%D0%B5%C8%99%D1%82',
+        'filter[kind]=&filter[country]=RO',
+        'filter[a%5Bb]=1&filter[c]d=2',
+    ]
+
+    def test_same_as_querystring_parser(self):
+        for query_string in self.QUERY_STRINGS:
+            params = qs_parser.parse(query_string).get('filter') or {}
+
+            for key, value in list(params.items()):
+                if not value:
+                    params.pop(key)
+
+            self.assertEqual(
+                parse_filter_params(query_string), params, query_string)
+
+    def test_other_params_ignored(self):
+        self.assertEqual(
+            parse_filter_params('page=1=2&filter=1&filters[a]=1&a'), {})
+
+    def test_malformed(self):
+        with self.assertRaises(MalformedQueryStringError):
+            parse_filter_params('filter[a]=1=2')
+
+        with self.assertRaises(MalformedQueryStringError):
+            parse_filter_params('filter[a')
+
+    def test_extract_filter_params_once_per_request(self):
+        request = RequestFactory().get(
+            '/', QUERY_STRING='filter[kind]=other')
+        endpoint = JSONApiEndpoint()
+
+        with mock.patch(
+                'api_v3.views.support.parse_filter_params',
+                wraps=parse_filter_params) as parse:
+            params = endpoint.extract_filter_params(request)
+            params['country'] = 'RO'
+
+            self.assertEqual(
+                endpoint.extract_filter_params(request), {'kind': 'other'})
+
+        self.assertEqual(parse.call_count, 1)
@@ -0,0 +1,59 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+import mock
+
+from api_v3.factories import ProfileFactory, TicketFactory
+from api_v3.misc import instrumentation
+from api_v3.tests.views.support import reverse
+
+
+class InstrumentationMiddlewareTestCase(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = ProfileFactory.create()
+        self.ticket = TicketFactory.create(requester=self.user)
+        self.client.force_authenticate(self.user)
+
+    def test_server_timing(self):
+        with mock.patch.object(instrumentation.logger, 'info') as info:
+            response = self.client.get(reverse('ticket-list'))
+
+        self.assertEqual(response.status_code, 200)
+
+        timing = dict(
+            metric.strip().split(';', 1)
+            for metric in response['Server-Timing'].split(',')
+        )
+
+        self.assertEqual(
+            sorted(timing.keys()), ['db', 'render', 'total', 'view'])
+        self.assertRegexpMatches(timing['db'], r'dur=[\d.]+;desc="\d+ queries"')
+
+        args = info.call_args[0]
+
+        self.assertIn('endpoint=%s', args[0])
+        self.assertEqual(args[1:6], (
+            'GET', reverse('ticket-list'), 'ticket:list', 200, args[5]))
+        self.assertGreater(args[5], 0)
+        self.assertIsNone(getattr(connection, 'request_timings'))
+
+    @override_settings(SLOW_QUERY_MS=0)
+    def test_slow_query(self):
+        with mock.patch.object(
+                instrumentation.slow_query_logger, 'warning') as warning:
+            response = self.client.get(
+                reverse('ticket-detail', args=[self.ticket.id]))
+
+        self.assertEqual(response.status_code, 200)
+
+        selects = [
+            call[0] for call in warning.call_args_list
+            if 'api_v3_ticket' in call[0][3]
+        ]
+
+        self.assertTrue(selects)
+        self.assertEqual(selects[0][2], 'ticket:retrieve')
+        self.assertIn('SELECT', selects[0][3])
+        self.assertIn('cost=', selects[0][4])
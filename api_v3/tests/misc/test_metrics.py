@@ -0,0 +1,42 @@
+import os
+import shutil
+import tempfile
+
+from django.test import TestCase
+from prometheus_client import CollectorRegistry
+from prometheus_client.mmap_dict import MmapedDict, mmap_key
+
+from api_v3.misc.metrics import FilesCollector
+
+
+class FilesCollectorTestCase(TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def write_counter(self, service, pid, value):
+        os.mkdir(os.path.join(self.path, service))
+        values = MmapedDict(
+            os.path.join(self.path, service, 'counter_{}.db'.format(pid)))
+        values.write_value(
+            mmap_key('id_emails', 'id_emails_total', ['outcome'], ['sent']),
+            value
+        )
+        values.close()
+
+    def test_collect(self):
+        # Same PID, in different containers.
+        self.write_counter('api', 1, 2.0)
+        self.write_counter('mailer', 1, 3.0)
+        registry = CollectorRegistry()
+
+        FilesCollector(registry, self.path)
+
+        self.assertEqual(
+            registry.get_sample_value(
+                'id_emails_total', {'outcome': 'sent'}),
+            5.0
+        )
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+from datetime import datetime
+from io import BytesIO
+from unittest import TestCase
+import struct
+import zipfile
+
+import mock
+
+from api_v3.misc import zip_stream
+from api_v3.misc.zip_stream import ZipStream, is_compressed
+
+
+class ZipStreamTestCase(TestCase):
+
+    def archive(self, files):
+        stream = ZipStream()
+        data = b''
+
+        for name, content, size, compress in files:
+            data += b''.join(stream.add(
+                name, BytesIO(content), datetime(2019, 10, 17, 12, 30, 10),
+                size=size, compress=compress
+            ))
+
+        data += b''.join(stream.finish())
+
+        self.assertEqual(stream.offset, len(data))
+
+        return data
+
+    def test_archive(self):
+        text = b'text ' * 1000
+        data = self.archive([
+            (u'țеșт.txt', text, len(text), True),
+            (u'image.png', b'\x89PNG', 4, False),
+            (u'empty.txt', b'', 0, True),
+        ])
+        archive = zipfile.ZipFile(BytesIO(data))
+
+        self.assertIsNone(archive.testzip())
+        self.assertEqual(
+            archive.namelist(), [u'țеșт.txt', u'image.png', u'empty.txt'])
+        self.assertEqual(archive.read(u'țеșт.txt'), text)
+        self.assertEqual(archive.read(u'image.png'), b'\x89PNG')
+        self.assertEqual(archive.read(u'empty.txt'), b'')
+
+        infos = archive.infolist()
+
+        self.assertEqual(infos[0].compress_type, zipfile.ZIP_DEFLATED)
+        self.assertLess(infos[0].compress_size, len(text))
+        self.assertEqual(infos[1].compress_type, zipfile.ZIP_STORED)
+        self.assertEqual(infos[0].date_time, (2019, 10, 17, 12, 30, 10))
+
+    def test_unknown_size(self):
+        data = self.archive([(u'file.txt', b'content', None, True)])
+        archive = zipfile.ZipFile(BytesIO(data))
+
+        self.assertEqual(archive.read(u'file.txt'), b'content')
+        # The ZIP64 local header extra field.
+        self.assertIn(struct.pack('<HHQQ', 1, 16, 0, 0), data)
+
+    def test_larger_than_given_size(self):
+        with mock.patch.object(zip_stream, 'ZIP64_LIMIT', 5):
+            with self.assertRaises(ValueError):
+                self.archive([(u'file.txt', b'content', 1, False)])
+
+    def test_zip64_end_records(self):
+        with mock.patch.object(zip_stream, 'ZIP_ENTRIES_LIMIT', 2):
+            data = self.archive([
+                (u'{}.txt'.format(i), b'content', 7, True) for i in range(3)
+            ])
+
+        archive = zipfile.ZipFile(BytesIO(data))
+
+        self.assertIn(struct.pack('<I', 0x06064b50), data)
+        self.assertEqual(len(archive.namelist()), 3)
+        self.assertEqual(archive.read(u'2.txt'), b'content')
+
+    def test_is_compressed(self):
+        self.assertTrue(is_compressed('image/jpeg'))
+        self.assertTrue(is_compressed('video/mp4'))
+        self.assertFalse(is_compressed('text/plain'))
+        self.assertFalse(is_compressed(None))
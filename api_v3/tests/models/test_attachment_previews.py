@@ -0,0 +1,85 @@
+from io import BytesIO
+import subprocess
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from PIL import Image
+import mock
+
+from api_v3.factories import AttachmentFactory
+from api_v3.models import Attachment, Job
+
+
+def image_file(name, size=(1200, 600), file_format='PNG'):
+    output = BytesIO()
+    Image.new('RGB', size, (200, 10, 10)).save(output, file_format)
+
+    return SimpleUploadedFile(name, output.getvalue())
+
+
+class AttachmentPreviewsTestCase(TestCase):
+
+    def test_build_pending_previews(self):
+        attachments = [
+            AttachmentFactory.create(upload=image_file('first.png')),
+            AttachmentFactory.create(upload=image_file('second.png')),
+            AttachmentFactory.create(
+                upload=SimpleUploadedFile('notes.txt', b'notes')),
+        ]
+        progress = []
+
+        self.assertEqual(
+            Job.objects.filter(name='build_attachment_previews').count(), 1)
+
+        self.assertEqual(
+            Attachment.build_pending_previews(
+                on_progress=lambda **counts: progress.append(counts)),
+            2
+        )
+        self.assertEqual(progress, [{'processed': 3, 'previewed': 2}])
+        self.assertEqual(
+            list(
+                Attachment.objects.filter(
+                    id__in=[a.id for a in attachments]
+                ).order_by('id').values_list('previewed', flat=True)
+            ),
+            [True, True, False]
+        )
+
+        for size, pixels in Attachment.PREVIEW_SIZES:
+            preview = Image.open(Attachment.preview_storage.open(
+                attachments[0].preview_name(size)))
+
+            self.assertEqual(preview.format, 'JPEG')
+            self.assertEqual(preview.size, (pixels, pixels // 2))
+
+    def test_build_previews_broken_image(self):
+        attachment = AttachmentFactory.create(
+            upload=SimpleUploadedFile(
+                'broken.png', b'\x89PNG\r\n\x1a\n' + b'\0' * 300))
+
+        self.assertFalse(attachment.build_previews())
+
+    def test_build_previews_pdf(self):
+        attachment = AttachmentFactory.create(
+            upload=SimpleUploadedFile('document.pdf', b'%PDF-1.4\n'))
+
+        def pdftoppm(args, **kwargs):
+            Image.new('RGB', (800, 1000)).save(args[-1] + '.jpg', 'JPEG')
+
+        with mock.patch.object(subprocess, 'check_call', pdftoppm):
+            self.assertTrue(attachment.build_previews())
+
+        preview = Image.open(Attachment.preview_storage.open(
+            attachment.preview_name('thumbnail')))
+
+        self.assertEqual(preview.size, (160, 200))
+
+    def test_build_previews_pdf_failed(self):
+        attachment = AttachmentFactory.create(
+            upload=SimpleUploadedFile('broken.pdf', b'%PDF-1.4\n%broken'))
+        error = OSError('No such file or directory: pdftoppm')
+
+        with mock.patch.object(
+                subprocess, 'check_call', side_effect=error):
+            self.assertFalse(attachment.build_previews())
@@ -0,0 +1,105 @@
+from datetime import datetime, timedelta
+import errno
+import hashlib
+import os
+import uuid
+
+from django.core.files.uploadedfile import (
+    SimpleUploadedFile, TemporaryUploadedFile)
+from django.test import TestCase
+import mock
+
+from api_v3.factories import AttachmentFactory
+from api_v3.models import Attachment, Blob
+
+
+class BlobModelTestCase(TestCase):
+
+    def setUp(self):
+        self.content = b'same content'
+        self.digest = hashlib.sha256(self.content).hexdigest()
+        self.attachments = [
+            AttachmentFactory.create(
+                upload=SimpleUploadedFile(name, self.content))
+            for name in ['first.txt', 'second.txt']
+        ]
+
+    def expire(self, blob):
+        past = datetime.utcnow() - Blob.GRACE_PERIOD - timedelta(minutes=1)
+        Blob.objects.filter(id=blob.id).update(updated_at=past)
+
+    def test_store_once(self):
+        blob = Blob.objects.get(sha256=self.digest)
+
+        self.assertEqual(
+            self.attachments[0].upload.name, self.attachments[1].upload.name)
+        self.assertEqual(
+            self.attachments[0].upload.name,
+            Blob.storage.blob_name(self.digest)
+        )
+        self.assertEqual(
+            [a.file_name for a in self.attachments],
+            ['first.txt', 'second.txt']
+        )
+        self.assertEqual(self.attachments[0].sha256, self.digest)
+        self.assertEqual(self.attachments[0].size, len(self.content))
+        self.assertEqual(blob.size, len(self.content))
+        self.assertEqual(blob.references, 2)
+
+        self.attachments[0].upload.open('rb')
+        self.assertEqual(self.attachments[0].upload.read(), self.content)
+        self.attachments[0].upload.close()
+
+    def test_store_temporary_upload(self):
+        # Unique, the blobs of the previous runs are kept.
+        content = uuid.uuid4().hex.encode('ascii')
+        upload = TemporaryUploadedFile(
+            'large.txt', 'text/plain', len(content), None)
+        upload.write(content)
+        upload.seek(0)
+        temp_path = upload.temporary_file_path()
+
+        # Like a temporary directory on another filesystem.
+        with mock.patch.object(
+                os, 'rename', side_effect=OSError(errno.EXDEV, 'EXDEV')):
+            attachment = AttachmentFactory.create(upload=upload)
+
+        upload.close()
+
+        self.assertEqual(
+            attachment.upload.name,
+            Blob.storage.blob_name(hashlib.sha256(content).hexdigest())
+        )
+        self.assertFalse(os.path.exists(temp_path))
+
+        attachment.upload.open('rb')
+        self.assertEqual(attachment.upload.read(), content)
+        attachment.upload.close()
+
+    def test_delete_releases_reference(self):
+        self.attachments[0].delete()
+
+        self.assertEqual(Blob.objects.get(sha256=self.digest).references, 1)
+
+    def test_collect(self):
+        blob = Blob.objects.get(sha256=self.digest)
+        path = Blob.storage.path(Blob.storage.blob_name(self.digest))
+        self.expire(blob)
+
+        self.assertEqual(Blob.collect(), 0)
+
+        Attachment.objects.filter(
+            id__in=[a.id for a in self.attachments]).delete()
+        # Deleting touches the blob.
+        self.expire(blob)
+
+        self.assertEqual(Blob.collect(), 1)
+        self.assertFalse(Blob.objects.filter(id=blob.id).exists())
+        self.assertFalse(os.path.exists(path))
+
+    def test_collect_keeps_recent_blobs(self):
+        Attachment.objects.filter(
+            id__in=[a.id for a in self.attachments]).delete()
+
+        self.assertEqual(Blob.collect(), 0)
+        self.assertTrue(Blob.objects.filter(sha256=self.digest).exists())
@@ -0,0 +1,80 @@
+from datetime import timedelta
+
+from django.core import mail
+from django.test import TestCase
+from django.utils import timezone
+
+from api_v3.models import OutboxEmail
+
+
+class FailingConnection(object):
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def send_messages(self, messages):
+        raise IOError('Connection refused')
+
+
+class OutboxEmailTestCase(TestCase):
+
+    def setUp(self):
+        self.count = OutboxEmail.queue([
+            ['Subject 1', 'Body 1', 'from@example.org', ['to1@example.org']],
+            ['Subject 2', 'Body 2', 'from@example.org', ['to2@example.org']],
+            ['Subject 3', 'Body 3', 'from@example.org', []]
+        ])
+
+    def test_queue(self):
+        self.assertEqual(self.count, 2)
+        self.assertEqual(OutboxEmail.due().count(), 2)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_claim(self):
+        emails = OutboxEmail.claim(1)
+
+        self.assertEqual([email.subject for email in emails], ['Subject 1'])
+        self.assertEqual(
+            [email.subject for email in OutboxEmail.due()], ['Subject 2'])
+        self.assertGreater(
+            OutboxEmail.objects.get(subject='Subject 1').send_after,
+            timezone.now() + OutboxEmail.CLAIM_TIMEOUT - timedelta(minutes=1)
+        )
+
+    def test_send_batch(self):
+        sent, failed = OutboxEmail.send_batch(mail.get_connection())
+
+        self.assertEqual((sent, failed), (2, 0))
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(mail.outbox[0].subject, 'Subject 1')
+        self.assertEqual(mail.outbox[0].to, ['to1@example.org'])
+        self.assertEqual(OutboxEmail.objects.filter(status='sent').count(), 2)
+        self.assertEqual(OutboxEmail.due().count(), 0)
+
+    def test_send_batch_retry_backoff(self):
+        sent, failed = OutboxEmail.send_batch(FailingConnection(), 1)
+
+        self.assertEqual((sent, failed), (0, 1))
+
+        email = OutboxEmail.objects.get(attempts=1)
+
+        self.assertEqual(email.status, 'queued')
+        self.assertIn('Connection refused', email.last_error)
+        self.assertGreater(
+            email.send_after,
+            timezone.now() + timedelta(seconds=OutboxEmail.RETRY_BACKOFF - 5)
+        )
+        self.assertEqual(list(OutboxEmail.due()), [
+            OutboxEmail.objects.get(attempts=0)])
+
+    def test_send_batch_max_attempts(self):
+        OutboxEmail.objects.update(attempts=OutboxEmail.MAX_ATTEMPTS - 1)
+
+        OutboxEmail.send_batch(FailingConnection())
+
+        self.assertEqual(
+            OutboxEmail.objects.filter(status='failed').count(), 2)
+        self.assertEqual(OutboxEmail.due().count(), 0)
@@ -0,0 +1,71 @@
+from django.test import TestCase
+
+from api_v3.factories import (
+    ProfileFactory, ResponderFactory, SubscriberFactory, TicketFactory)
+from api_v3.misc import oauth2
+from api_v3.models import Ticket, TicketAccess
+
+
+class TicketAccessTestCase(TestCase):
+
+    def setUp(self):
+        self.user = ProfileFactory.create()
+        self.ticket = TicketFactory.create()
+
+    def roles(self, user):
+        return set(
+            TicketAccess.objects.filter(
+                user=user, ticket=self.ticket).values_list('role', flat=True)
+        )
+
+    def test_ticket_requester(self):
+        self.assertEqual(self.roles(self.ticket.requester), {'requester'})
+        self.assertEqual(
+            list(Ticket.filter_by_user(self.ticket.requester)), [self.ticket])
+
+    def test_responder_create_and_delete(self):
+        responder = ResponderFactory.create(ticket=self.ticket, user=self.user)
+
+        self.assertEqual(self.roles(self.user), {'responder'})
+        self.assertEqual(list(Ticket.filter_by_user(self.user)), [self.ticket])
+
+        responder.delete()
+
+        self.assertEqual(self.roles(self.user), set())
+        self.assertEqual(Ticket.filter_by_user(self.user).count(), 0)
+
+    def test_subscriber_create_and_delete(self):
+        subscriber = SubscriberFactory.create(
+            ticket=self.ticket, user=self.user)
+        ResponderFactory.create(ticket=self.ticket, user=self.user)
+
+        self.assertEqual(self.roles(self.user), {'responder', 'subscriber'})
+
+        subscriber.delete()
+
+        self.assertEqual(self.roles(self.user), {'responder'})
+
+    def test_email_subscriber_mapped(self):
+        SubscriberFactory.create(
+            ticket=self.ticket, user=None, email=self.user.email)
+
+        self.assertEqual(self.roles(self.user), set())
+
+        oauth2.map_email_to_subscriber(backend=None, user=self.user)
+
+        self.assertEqual(self.roles(self.user), {'subscriber'})
+
+    def test_inconsistencies_and_rebuild(self):
+        ResponderFactory.create(ticket=self.ticket, user=self.user)
+        TicketAccess.objects.filter(user=self.user).delete()
+        TicketAccess.objects.create(
+            user=self.user, ticket=self.ticket, role='subscriber')
+
+        missing, stale = TicketAccess.inconsistencies()
+
+        self.assertEqual(missing, [(self.user.id, self.ticket.id, 'responder')])
+        self.assertEqual(stale, [(self.user.id, self.ticket.id, 'subscriber')])
+
+        self.assertEqual(TicketAccess.rebuild(), 2)
+        self.assertEqual(TicketAccess.inconsistencies(), ([], []))
+        self.assertEqual(self.roles(self.user), {'responder'})
@@ -0,0 +1,48 @@
+from django.test import TestCase
+
+from api_v3.factories import TicketFactory
+from api_v3.models import Ticket
+
+
+class TicketFacetsTestCase(TestCase):
+
+    def setUp(self):
+        self.tickets = [
+            TicketFactory.create(status='new', kind='other', country='RO'),
+            TicketFactory.create(status='new', kind='other', country='MD'),
+            TicketFactory.create(status='closed', kind='other', country='RO')
+        ]
+
+    def test_facets(self):
+        with self.assertNumQueries(1):
+            facets = Ticket.facets(['status', 'kind', 'country'])
+
+        self.assertEqual(facets['all'], 3)
+        self.assertEqual(facets['status']['new'], 2)
+        self.assertEqual(facets['status']['closed'], 1)
+        self.assertEqual(facets['status']['cancelled'], 0)
+        self.assertEqual(facets['kind']['other'], 3)
+        self.assertEqual(facets['country']['RO'], 2)
+        self.assertEqual(facets['country']['MD'], 1)
+        self.assertEqual(facets['country']['AF'], 0)
+        self.assertEqual(
+            sorted(facets['status'].keys()),
+            sorted([s[0] for s in Ticket.STATUSES])
+        )
+
+    def test_facets_queryset(self):
+        queryset = Ticket.objects.filter(country='RO')
+        facets = Ticket.facets(['status', 'country'], queryset)
+
+        self.assertEqual(facets['all'], 2)
+        self.assertEqual(facets['status']['new'], 1)
+        self.assertEqual(facets['status']['closed'], 1)
+        self.assertEqual(facets['country']['RO'], 2)
+        self.assertEqual(facets['country']['MD'], 0)
+
+    def test_facets_empty_queryset(self):
+        with self.assertNumQueries(0):
+            facets = Ticket.facets(['status'], Ticket.objects.none())
+
+        self.assertEqual(facets['all'], 0)
+        self.assertEqual(facets['status']['new'], 0)
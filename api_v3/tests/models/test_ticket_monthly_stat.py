@@ -0,0 +1,115 @@
+from datetime import datetime
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils.six import StringIO
+
+from api_v3.factories import ResponderFactory, TicketFactory
+from api_v3.models import Job, Ticket, TicketMonthlyStat
+
+
+class TicketMonthlyStatTestCase(TestCase):
+
+    def setUp(self):
+        self.ticket = TicketFactory.create(status='new')
+        self.month = TicketMonthlyStat.month_of(self.ticket.created_at)
+
+    def rows(self, **kwargs):
+        # The refreshes are queued, run by the jobs worker.
+        call_command('run_jobs', stdout=StringIO())
+
+        return list(
+            TicketMonthlyStat.objects.filter(**kwargs).values_list(
+                'month', 'status', 'responder_id', 'has_responders', 'count')
+        )
+
+    def test_next_month(self):
+        self.assertEqual(
+            TicketMonthlyStat.next_month(datetime(2019, 12, 31, 10)),
+            datetime(2020, 1, 1)
+        )
+
+    def test_queue_refresh(self):
+        Job.objects.all().delete()
+
+        TicketMonthlyStat.queue_refresh([])
+        TicketMonthlyStat.queue_refresh(
+            [datetime(2018, 1, 10), datetime(2018, 2, 1)])
+        TicketMonthlyStat.queue_refresh([datetime(2018, 1, 31)])
+
+        self.assertEqual(
+            list(Job.objects.values_list('name', 'params')),
+            [('refresh_ticket_stats', {'months': ['2018-01', '2018-02']})]
+        )
+
+        TicketMonthlyStat.queue_refresh([datetime(2018, 3, 1)])
+
+        self.assertEqual(Job.objects.count(), 2)
+
+    def test_ticket_create_and_update(self):
+        self.assertEqual(
+            self.rows(), [(self.month, 'new', None, False, 1)])
+
+        self.ticket.status = 'closed'
+        self.ticket.save()
+
+        self.assertEqual(
+            self.rows(), [(self.month, 'closed', None, False, 1)])
+
+    def test_ticket_month_change(self):
+        self.ticket.created_at = datetime(2018, 1, 10)
+        self.ticket.save()
+
+        self.assertEqual(
+            self.rows(), [(datetime(2018, 1, 1), 'new', None, False, 1)])
+
+    def test_responder_create_and_delete(self):
+        responder = ResponderFactory.create(ticket=self.ticket)
+
+        self.assertEqual(
+            self.rows(responder__isnull=True),
+            [(self.month, 'new', None, True, 1)]
+        )
+        self.assertEqual(
+            self.rows(responder__isnull=False),
+            [(self.month, 'new', responder.user_id, True, 1)]
+        )
+
+        responder.delete()
+
+        self.assertEqual(
+            self.rows(), [(self.month, 'new', None, False, 1)])
+
+    def test_responder_create_queues_once(self):
+        with CaptureQueriesContext(connection) as captured:
+            ResponderFactory.create(ticket=self.ticket)
+
+        # The first response save queues it, already queued on create.
+        self.assertEqual(
+            len([
+                query for query in captured
+                if Job._meta.db_table in query['sql']
+            ]),
+            1
+        )
+        self.assertIsNotNone(
+            Ticket.objects.get(id=self.ticket.id).first_response_at)
+
+    def test_refresh(self):
+        TicketFactory.create(status='new')
+        Ticket.objects.update(status='pending')
+
+        self.assertEqual(TicketMonthlyStat.refresh([]), 0)
+
+        count = TicketMonthlyStat.refresh([self.month])
+
+        self.assertEqual(TicketMonthlyStat.objects.count(), count)
+        self.assertEqual(
+            set(TicketMonthlyStat.objects.values_list('status', flat=True)),
+            {'pending'}
+        )
+        self.assertEqual(
+            sum(TicketMonthlyStat.objects.values_list('count', flat=True)), 2)
+        self.assertEqual(TicketMonthlyStat.refresh(), count)
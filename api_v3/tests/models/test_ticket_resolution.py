@@ -0,0 +1,50 @@
+from datetime import timedelta
+
+from django.test import TestCase
+
+from api_v3.factories import ResponderFactory, TicketFactory
+from api_v3.models import Ticket
+
+
+class TicketResolutionTestCase(TestCase):
+
+    def setUp(self):
+        self.ticket = TicketFactory.create(status='new')
+
+    def test_resolve_and_reopen(self):
+        self.assertIsNone(self.ticket.resolved_at)
+
+        self.ticket.status = 'closed'
+        self.ticket.save()
+        self.ticket.created_at = self.ticket.resolved_at - timedelta(hours=3)
+        self.ticket.save()
+
+        ticket = Ticket.objects.get(id=self.ticket.id)
+
+        self.assertEqual(ticket.resolution_hours, 3)
+
+        ticket.status = 'in-progress'
+        ticket.save()
+
+        self.assertIsNone(ticket.resolved_at)
+        self.assertIsNone(ticket.resolution_hours)
+
+    def test_first_response(self):
+        responder = ResponderFactory.create(ticket=self.ticket)
+        ResponderFactory.create(ticket=self.ticket)
+
+        ticket = Ticket.objects.get(id=self.ticket.id)
+
+        self.assertEqual(ticket.first_response_at, responder.created_at)
+        self.assertEqual(
+            ticket.response_hours,
+            ticket.hours_since_created(responder.created_at)
+        )
+
+        # Saving the responder ticket keeps the first response.
+        responder.ticket.save()
+
+        self.assertEqual(
+            Ticket.objects.get(id=self.ticket.id).first_response_at,
+            responder.created_at
+        )
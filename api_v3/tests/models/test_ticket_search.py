@@ -0,0 +1,40 @@
+from django.test import TestCase
+
+from api_v3.factories import TicketFactory
+from api_v3.models import Ticket
+
+
+class TicketSearchTestCase(TestCase):
+
+    def setUp(self):
+        self.tickets = [
+            TicketFactory.create(
+                first_name='Zebedeus', background='Offshore accounts'),
+            TicketFactory.create(
+                company_name='Acme Holdings', background='Shell companies')
+        ]
+
+    def test_search_vector_populated_on_create(self):
+        vectors = Ticket.objects.filter(
+            search_vector__isnull=True, id__in=[t.id for t in self.tickets])
+
+        self.assertEqual(vectors.count(), 0)
+
+    def test_search_for(self):
+        tickets = Ticket.search_for('Zebedeus')
+
+        self.assertEqual(list(tickets), [self.tickets[0]])
+        self.assertGreaterEqual(tickets[0].rank, Ticket.MIN_SEARCH_RANK)
+
+    def test_search_for_updated_ticket(self):
+        ticket = self.tickets[1]
+        ticket.company_name = 'Globex Corporation'
+        ticket.save()
+
+        self.assertEqual(Ticket.search_for('Acme').count(), 0)
+        self.assertEqual(list(Ticket.search_for('Globex')), [ticket])
+
+    def test_search_for_queryset(self):
+        queryset = Ticket.objects.exclude(id=self.tickets[0].id)
+
+        self.assertEqual(Ticket.search_for('Zebedeus', queryset).count(), 0)
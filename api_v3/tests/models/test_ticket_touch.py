@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils.six import StringIO
+
+from api_v3.factories import TicketFactory
+from api_v3.models import Action, Ticket, TicketMonthlyStat
+
+
+class TicketTouchTestCase(TestCase):
+
+    def setUp(self):
+        self.tickets = TicketFactory.create_batch(2, deadline_at=None)
+        self.timestamp = datetime.utcnow() + timedelta(days=1)
+
+    def updated_at(self, ticket):
+        return Ticket.objects.get(id=ticket.id).updated_at
+
+    def test_action_touches_ticket(self):
+        action = Action(
+            verb='ticket:update', target=self.tickets[0],
+            actor=self.tickets[0].requester, timestamp=self.timestamp
+        )
+
+        # The deadline check, the update and the action insert.
+        with self.assertNumQueries(3):
+            action.save()
+
+        self.assertEqual(self.updated_at(self.tickets[0]), self.timestamp)
+        self.assertNotEqual(self.updated_at(self.tickets[1]), self.timestamp)
+
+    def test_batch_touches(self):
+        with self.assertNumQueries(2):
+            with Ticket.batch_touches():
+                Ticket.touch(self.tickets[0].id, self.timestamp)
+                Ticket.touch(
+                    self.tickets[0].id, self.timestamp - timedelta(hours=1))
+                Ticket.touch(self.tickets[1].id, self.timestamp)
+
+        self.assertEqual(self.updated_at(self.tickets[0]), self.timestamp)
+        self.assertEqual(self.updated_at(self.tickets[1]), self.timestamp)
+
+    def test_touch_past_deadline(self):
+        self.tickets[0].deadline_at = datetime.utcnow()
+        self.tickets[0].save()
+
+        Ticket.touch(self.tickets[0].id, self.timestamp)
+        call_command('run_jobs', stdout=StringIO())
+
+        self.assertEqual(
+            sum(TicketMonthlyStat.objects.filter(
+                responder=None).values_list('past_deadline', flat=True)),
+            1
+        )
@@ -1,3 +1,4 @@
+import base64
 import json
 
 from api_v3.factories import ProfileFactory, TicketFactory, AttachmentFactory
@@ -76,3 +77,56 @@ class ActivitiesEndpointTestCase(TestCase):
         self.assertEqual(
             data['data'][0]['relationships']['comment']['data'], None
         )
+
+    def test_list_authenticated_keyset(self):
+        self.client.force_authenticate(self.users[1])
+        timestamp = self.activities[0].timestamp
+        self.activities += [
+            Action.objects.create(
+                actor=self.users[1], target=self.tickets[0],
+                verb='test-action', timestamp=timestamp
+            ) for _ in range(4)
+        ]
+        expected = [
+            str(activity.id) for activity in sorted(
+                self.activities, key=lambda a: a.id, reverse=True)
+        ]
+
+        ids, link, pages = [], reverse('action-list'), 0
+        params = {'page[cursor]': '', 'page[size]': 2}
+
+        while link:
+            data = json.loads(self.client.get(link, params).content)
+            ids += [item['id'] for item in data['data']]
+            link, params, pages = data['links']['next'], None, pages + 1
+
+            self.assertNotIn('last-id', data.get('meta', {}))
+
+        self.assertEqual(ids, expected)
+        self.assertEqual(pages, 3)
+
+        prev = self.client.get(data['links']['prev'])
+        prev_ids = [item['id'] for item in json.loads(prev.content)['data']]
+
+        self.assertEqual(prev_ids, expected[2:4])
+
+    def test_list_authenticated_keyset_invalid_cursor(self):
+        self.client.force_authenticate(self.users[1])
+
+        response = self.client.get(
+            reverse('action-list'), {'page[cursor]': 'invalid'})
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_list_authenticated_keyset_invalid_cursor_values(self):
+        self.client.force_authenticate(self.users[1])
+        positions = ([{}, 1], ['not-a-date', 'x'], [None, 1], ['2019-01-01'])
+
+        for position in positions:
+            cursor = base64.urlsafe_b64encode(
+                json.dumps({'p': position}).encode('utf-8')).decode('ascii')
+
+            response = self.client.get(
+                reverse('action-list'), {'page[cursor]': cursor})
+
+            self.assertEqual(response.status_code, 404, position)
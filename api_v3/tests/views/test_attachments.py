@@ -1,8 +1,11 @@
 # -*- coding: utf-8 -*-
+import hashlib
 import json
 import io
 
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db.models.fields.files import FieldFile
+import mock
 
 from api_v3.factories import ProfileFactory, TicketFactory, AttachmentFactory
 from api_v3.models import Attachment, Action
@@ -37,13 +40,20 @@ class AttachmentsEndpointTestCase(ApiTestCase):
     def test_list_authenticated(self):
         self.client.force_authenticate(self.users[0])
 
-        response = self.client.get(reverse('attachment-list'))
+        with mock.patch.object(FieldFile, 'open') as file_open:
+            response = self.client.get(reverse('attachment-list'))
 
+        self.assertFalse(file_open.called)
         self.assertEqual(response.status_code, 200)
         self.assertEqual(
             json.loads(response.content)['data'][0]['id'],
             str(self.attachments[0].id)
         )
+        self.assertEqual(
+            json.loads(response.content)['data'][0]['attributes'][
+                'file-size'],
+            len(u'tesț'.encode('utf-8'))
+        )
 
         self.assertIn(
             reverse('download-detail', args=[self.attachments[0].id]),
@@ -100,6 +110,11 @@ class AttachmentsEndpointTestCase(ApiTestCase):
             serializer_data['attributes']['upload']
         )
         self.assertEqual(Attachment.objects.count(), attachments_count + 1)
+        self.assertEqual(serializer_data['attributes']['file-size'], 10)
+        self.assertEqual(
+            Attachment.objects.get(id=serializer_data['id']).sha256,
+            hashlib.sha256(b'dummy file').hexdigest()
+        )
         self.assertEqual(
             Action.objects.filter(
                 target_object_id=ticket.id,
@@ -1,7 +1,11 @@
 # -*- coding: utf-8 -*-
-import os.path
+import hashlib
 
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db.models.fields.files import FieldFile
+from django.test import override_settings
+from django.utils.http import urlquote
+import mock
 
 from api_v3.factories import (
     AttachmentFactory,
@@ -58,9 +62,8 @@ class DownloadEndpointTestCase(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEquals(
             response.get('Content-Disposition'),
-            'filename={}'.format(os.path.basename(
-                self.attachment.upload.name.encode('utf-8', 'replace')
-            ))
+            'filename={}'.format(
+                self.attachment.file_name.encode('utf-8', 'replace'))
         )
 
     def test_retrieve_auth_ticket_responder(self):
@@ -72,7 +75,104 @@ class DownloadEndpointTestCase(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEquals(
             response.get('Content-Disposition'),
-            'filename={}'.format(os.path.basename(
-                self.attachment.upload.name.encode('utf-8', 'ignore')
-            ))
+            'filename={}'.format(
+                self.attachment.file_name.encode('utf-8', 'ignore'))
         )
+
+    @override_settings(DOWNLOAD_BACKEND='x-accel-redirect')
+    def test_retrieve_accel_redirect(self):
+        self.client.force_authenticate(self.users[0])
+
+        response = self.client.get(
+            reverse('download-detail', args=[self.attachment.id]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(
+            response['X-Accel-Redirect'],
+            '/protected-media/{}'.format(urlquote(self.attachment.upload.name))
+        )
+        self.assertIn('filename=', response['Content-Disposition'])
+
+    @override_settings(DOWNLOAD_BACKEND='x-sendfile')
+    def test_retrieve_sendfile(self):
+        self.client.force_authenticate(self.users[0])
+
+        response = self.client.get(
+            reverse('download-detail', args=[self.attachment.id]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'')
+        self.assertIn('X-Sendfile', response)
+
+    def test_retrieve_range(self):
+        self.client.force_authenticate(self.users[0])
+
+        response = self.client.get(
+            reverse('download-detail', args=[self.attachment.id]),
+            HTTP_RANGE='bytes=1-2'
+        )
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b''.join(response.streaming_content), b'es')
+        self.assertEqual(response['Content-Length'], '2')
+        self.assertEqual(response['Content-Range'], 'bytes 1-2/4')
+
+    def test_retrieve_multiple_ranges(self):
+        self.client.force_authenticate(self.users[0])
+
+        response = self.client.get(
+            reverse('download-detail', args=[self.attachment.id]),
+            HTTP_RANGE='bytes=0-0,-1'
+        )
+        body = b''.join(response.streaming_content)
+
+        self.assertEqual(response.status_code, 206)
+        self.assertIn('multipart/byteranges', response['Content-Type'])
+        self.assertEqual(response['Content-Length'], str(len(body)))
+        self.assertIn(b'Content-Range: bytes 0-0/4\r\n\r\nt\r\n', body)
+        self.assertIn(b'Content-Range: bytes 3-3/4\r\n\r\nt\r\n', body)
+
+    def test_retrieve_unsatisfiable_range(self):
+        self.client.force_authenticate(self.users[0])
+
+        response = self.client.get(
+            reverse('download-detail', args=[self.attachment.id]),
+            HTTP_RANGE='bytes=10-'
+        )
+
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */4')
+
+    def test_retrieve_if_range_changed(self):
+        self.client.force_authenticate(self.users[0])
+
+        response = self.client.get(
+            reverse('download-detail', args=[self.attachment.id]),
+            HTTP_RANGE='bytes=1-2',
+            HTTP_IF_RANGE='"outdated"'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'test')
+
+    def test_retrieve_not_modified(self):
+        self.client.force_authenticate(self.users[0])
+        url = reverse('download-detail', args=[self.attachment.id])
+
+        response = self.client.get(url)
+
+        self.assertEqual(
+            response['ETag'],
+            '"{}"'.format(hashlib.sha256(b'test').hexdigest())
+        )
+
+        with mock.patch.object(FieldFile, 'open') as file_open:
+            etag_response = self.client.get(
+                url, HTTP_IF_NONE_MATCH=response['ETag'])
+            date_response = self.client.get(
+                url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+
+        self.assertEqual(etag_response.status_code, 304)
+        self.assertEqual(date_response.status_code, 304)
+        self.assertFalse(file_open.called)
@@ -0,0 +1,49 @@
+import json
+
+from api_v3.factories import ProfileFactory
+from api_v3.models import Job
+from api_v3.views.jobs import JobsEndpoint
+from .support import TestCase, APIClient, reverse
+
+
+class JobsEndpointTestCase(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.job, _ = Job.enqueue('email_ticket_digest')
+        self.client.force_authenticate(ProfileFactory.create())
+
+    def test_retrieve_anonymous(self):
+        response = APIClient().get(
+            reverse('jobs-detail', args=[self.job.id]))
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_retrieve_failed(self):
+        self.job.run(lambda job: 1 / 0)
+
+        response = self.client.get(reverse('jobs-detail', args=[self.job.id]))
+        data = json.loads(response.content)
+
+        self.assertEqual(data['status'], 'failed')
+        self.assertEqual(data['error'], JobsEndpoint.ERROR)
+        self.assertNotIn('ZeroDivisionError', response.content.decode('utf-8'))
+
+    def test_retrieve(self):
+        self.job.report_progress(tickets=10, processed=5)
+
+        response = self.client.get(reverse('jobs-detail', args=[self.job.id]))
+
+        self.assertEqual(response.status_code, 200)
+
+        data = json.loads(response.content)
+
+        self.assertEqual(data['operation'], 'email_ticket_digest')
+        self.assertEqual(data['status'], 'queued')
+        self.assertEqual(data['progress'], {'tickets': 10, 'processed': 5})
+
+    def test_retrieve_missing(self):
+        response = self.client.get(
+            reverse('jobs-detail', args=[self.job.id + 1]))
+
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,57 @@
+from django.core.files.uploadedfile import SimpleUploadedFile
+from prometheus_client import REGISTRY
+
+from api_v3.factories import AttachmentFactory, ProfileFactory, TicketFactory
+from api_v3.models import OutboxEmail
+from .support import TestCase, APIClient, reverse
+
+
+class MetricsTestCase(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = ProfileFactory.create()
+        self.ticket = TicketFactory.create(requester=self.user)
+
+    def test_metrics(self):
+        OutboxEmail.queue([
+            ['Subject', 'Body', 'from@example.org', ['to@example.org']]
+        ] * 2)
+        self.client.force_authenticate(self.user)
+        self.client.get(reverse('ticket-list'))
+
+        response = self.client.get(reverse('metrics'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        self.assertIn(
+            b'id_outbox_emails{status="queued"} 2.0', response.content)
+        self.assertIn(b'id_outbox_emails{status="sent"} 0.0', response.content)
+        self.assertIn(
+            b'id_request_seconds_count{endpoint="ticket:list",method="GET"}',
+            response.content
+        )
+        self.assertIn(
+            b'id_db_queries_total{endpoint="ticket:list"}', response.content)
+
+    def test_download_bytes(self):
+        attachment = AttachmentFactory.create(
+            user=self.user,
+            ticket=self.ticket,
+            upload=SimpleUploadedFile('test.txt', b'test')
+        )
+        labels = {'backend': 'stream'}
+        before = REGISTRY.get_sample_value(
+            'id_download_bytes_total', labels) or 0
+
+        self.client.force_authenticate(self.user)
+        response = self.client.get(
+            reverse('download-detail', args=[attachment.id]),
+            HTTP_RANGE='bytes=1-2'
+        )
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(
+            REGISTRY.get_sample_value('id_download_bytes_total', labels),
+            before + 2
+        )
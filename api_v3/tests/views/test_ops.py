@@ -1,3 +1,6 @@
+import json
+
+from api_v3.models import Job
 from .support import TestCase, APIClient, reverse
 
 
@@ -19,3 +22,26 @@ class OpsEndpointTestCase(TestCase):
 
         self.assertEqual(response.status_code, 200)
         self.assertIn(op_name, response.content)
+
+    def test_retrieve_anonymous_previews_op_name(self):
+        op_name = 'build_attachment_previews'
+        response = self.client.get(reverse('ops-detail', args=[op_name]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(op_name, response.content)
+        self.assertFalse(Job.objects.exists())
+
+    def test_retrieve_enqueues_a_single_job(self):
+        op_name = 'email_ticket_digest'
+
+        responses = [
+            json.loads(
+                self.client.get(reverse('ops-detail', args=[op_name])).content)
+            for _ in range(2)
+        ]
+
+        self.assertEqual(Job.objects.count(), 1)
+        self.assertEqual(responses[0]['job_id'], Job.objects.get().id)
+        self.assertEqual(responses[0], responses[1])
+        self.assertEqual(responses[0]['status'], 'queued')
+        self.assertEqual(Job.objects.get().params['request_host'], 'testserver')
@@ -0,0 +1,97 @@
+from io import BytesIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+
+from api_v3.factories import (
+    AttachmentFactory,
+    ProfileFactory,
+    ResponderFactory,
+    TicketFactory
+)
+from api_v3.models import Attachment
+from .support import TestCase, APIClient, reverse
+
+
+class PreviewsEndpointTestCase(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.users = [
+            ProfileFactory.create(),
+            ProfileFactory.create()
+        ]
+        self.ticket = TicketFactory.create(requester=self.users[0])
+        ResponderFactory.create(ticket=self.ticket, user=self.users[0])
+
+        output = BytesIO()
+        Image.new('RGB', (400, 400)).save(output, 'PNG')
+
+        self.attachment = AttachmentFactory.create(
+            user=self.users[0],
+            ticket=self.ticket,
+            upload=SimpleUploadedFile('image.png', output.getvalue())
+        )
+        Attachment.build_pending_previews()
+
+    def test_retrieve_anonymous(self):
+        response = self.client.get(
+            reverse('preview-detail', args=[self.attachment.id]))
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_retrieve_auth_not_ticket_user(self):
+        self.client.force_authenticate(self.users[1])
+
+        response = self.client.get(
+            reverse('preview-detail', args=[self.attachment.id]))
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_retrieve_unknown_size(self):
+        self.client.force_authenticate(self.users[0])
+
+        response = self.client.get(
+            reverse('preview-detail', args=[self.attachment.id]) +
+            '?size=huge'
+        )
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_retrieve(self):
+        self.client.force_authenticate(self.users[0])
+
+        response = self.client.get(
+            reverse('preview-detail', args=[self.attachment.id]) +
+            '?size=preview'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+        self.assertIn('max-age=31536000', response['Cache-Control'])
+        self.assertEqual(
+            response['ETag'], '"{}-preview"'.format(self.attachment.sha256))
+        self.assertEqual(
+            Image.open(BytesIO(b''.join(response.streaming_content))).size,
+            (400, 400)
+        )
+
+        response = self.client.get(
+            reverse('preview-detail', args=[self.attachment.id]),
+            HTTP_IF_NONE_MATCH='"{}-thumbnail"'.format(self.attachment.sha256)
+        )
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_attachment_links(self):
+        self.client.force_authenticate(self.users[0])
+
+        response = self.client.get(
+            reverse('attachment-detail', args=[self.attachment.id]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(
+            response,
+            reverse('preview-detail', args=[self.attachment.id]) +
+            '?size=thumbnail'
+        )
@@ -1,7 +1,10 @@
 # -*- coding: utf-8 -*-
 import json
 
-from api_v3.factories import ProfileFactory
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api_v3.factories import ProfileFactory, ResponderFactory, TicketFactory
 from api_v3.serializers import ProfileSerializer
 from .support import ApiTestCase, APIClient, reverse
 
@@ -60,6 +63,31 @@ class ProfilesEndpointTestCase(ApiTestCase):
         self.assertContains(response, self.users[1].email)
         self.assertContains(response, self.users[2].email)
 
+    def test_list_authenticated_superuser_tickets_count_queries(self):
+        self.client.force_authenticate(self.users[2])
+        ticket = TicketFactory.create(requester=self.users[0])
+        ResponderFactory.create(ticket=ticket, user=self.users[1])
+        TicketFactory.create(requester=self.users[0])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('profile-list'))
+
+        counts = {
+            item['id']: item['attributes']['tickets-count']
+            for item in json.loads(response.content)['data']
+        }
+
+        self.assertEqual(counts, {
+            str(self.users[0].id): 2,
+            str(self.users[1].id): 1,
+            str(self.users[2].id): 2
+        })
+
+        ProfileFactory.create_batch(5)
+
+        with self.assertNumQueries(len(queries)):
+            self.client.get(reverse('profile-list'))
+
     def test_list_search_authenticated(self):
         self.users[0].is_staff = True
         self.users[0].save()
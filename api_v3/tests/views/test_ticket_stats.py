@@ -1,6 +1,9 @@
 import json
 from datetime import datetime, timedelta
 
+from django.core.management import call_command
+from django.utils.six import StringIO
+
 from api_v3.factories import ProfileFactory, ResponderFactory, TicketFactory
 from .support import ApiTestCase, APIClient, reverse
 
@@ -31,7 +34,8 @@ class TicketStatsEndpointTestCase(ApiTestCase):
                 requester=self.users[0], deadline_at=None, status='new'),
         ]
 
-        self.tickets[0].created_at = datetime.utcnow() - timedelta(days=5)
+        self.tickets[0].created_at = (
+            self.tickets[0].resolved_at - timedelta(days=5))
         self.tickets[0].save()
 
         self.responders = [
@@ -43,6 +47,9 @@ class TicketStatsEndpointTestCase(ApiTestCase):
                 ticket=self.tickets[1], user=self.users[2])
         ]
 
+        # Run the queued stats refreshes.
+        call_command('run_jobs', stdout=StringIO())
+
     def test_list_anonymous(self):
         response = self.client.get(reverse('ticket_stats-list'))
 
@@ -70,7 +77,7 @@ class TicketStatsEndpointTestCase(ApiTestCase):
 
         body = json.loads(response.content)
 
-        self.assertEqual(len(body['meta']['total']), 11)
+        self.assertEqual(len(body['meta']['total']), 12)
 
         self.assertEqual(body['meta']['total']['new'], 4)
         self.assertEqual(body['meta']['total']['open'], 4)
@@ -104,7 +111,7 @@ class TicketStatsEndpointTestCase(ApiTestCase):
 
         self.assertEqual(new_data['attributes']['count'], 4)
         self.assertEqual(new_data['attributes']['status'], 'new')
-        self.assertEqual(new_data['attributes']['avg-time'], 0)
+        self.assertIsNone(new_data['attributes']['avg-time'])
         self.assertEqual(new_data['attributes']['past-deadline'], 0)
         self.assertEqual(
             new_data['attributes']['date'][:19],
@@ -151,14 +158,16 @@ class TicketStatsEndpointTestCase(ApiTestCase):
 
         body = json.loads(response.content)
 
-        self.assertEqual(len(body['meta']['total']), 11)
+        self.assertEqual(len(body['meta']['total']), 12)
 
         self.assertEqual(body['meta']['total']['new'], 1)
         self.assertEqual(body['meta']['total']['open'], 1)
-        self.assertEqual(body['meta']['total']['avg-time-open'], 0.0)
+        self.assertLess(body['meta']['total']['avg-time-open'], 1)
         self.assertEqual(body['meta']['total']['cancelled'], 1)
         self.assertEqual(body['meta']['total']['resolved'], 1)
-        self.assertEqual(body['meta']['total']['avg-time-resolved'], 60.0)
+        self.assertEqual(body['meta']['total']['avg-time-resolved'], 120.0)
+        self.assertEqual(
+            round(body['meta']['total']['avg-time-first-response']), 60)
 
         self.assertEqual(body['meta']['staff-profile-ids'], [])
         self.assertEqual(body['meta']['countries'], [])
@@ -182,10 +191,54 @@ class TicketStatsEndpointTestCase(ApiTestCase):
 
         self.assertEqual(new_data['attributes']['count'], 1)
         self.assertEqual(new_data['attributes']['status'], 'new')
-        self.assertEqual(new_data['attributes']['avg-time'], 0)
+        self.assertIsNone(new_data['attributes']['avg-time'])
         self.assertEqual(new_data['attributes']['past-deadline'], 0)
         self.assertEqual(
             new_data['attributes']['date'][:19],
             datetime.utcnow().replace(
                 day=1, hour=0, minute=0, second=0, microsecond=0).isoformat()
         )
+
+    def test_list_superuser_rollup_matches_tickets(self):
+        self.users[0].is_superuser = True
+        self.users[0].save()
+        self.client.force_authenticate(self.users[0])
+        start = datetime.utcnow().replace(
+            day=1, hour=0, minute=0, second=0, microsecond=0
+        ) - timedelta(days=60)
+        bodies = []
+
+        # The month start is read from the rollup, a second later is not.
+        for seconds in [0, 1]:
+            response = self.client.get(
+                reverse('ticket_stats-list') +
+                '?filter[created_at__gte]={}'.format(
+                    start.replace(day=1) + timedelta(seconds=seconds)
+                ).replace(' ', 'T')
+            )
+
+            self.assertEqual(response.status_code, 200)
+
+            bodies.append(json.loads(response.content))
+
+        # The open tickets age between the requests.
+        self.assertAlmostEqual(
+            bodies[0]['meta']['total'].pop('avg-time-open'),
+            bodies[1]['meta']['total'].pop('avg-time-open'),
+            places=2
+        )
+        self.assertEqual(bodies[0]['meta']['total'], bodies[1]['meta']['total'])
+        self.assertEqual(
+            sorted(bodies[0]['meta']['staff-profile-ids']),
+            sorted(bodies[1]['meta']['staff-profile-ids'])
+        )
+        self.assertEqual(
+            sorted(
+                [d['attributes'] for d in bodies[0]['data']],
+                key=lambda a: (a['date'], a['status'])
+            ),
+            sorted(
+                [d['attributes'] for d in bodies[1]['data']],
+                key=lambda a: (a['date'], a['status'])
+            )
+        )
@@ -1,14 +1,22 @@
 # -*- coding: utf-8 -*-
+from io import BytesIO
 import json
 import random
+import zipfile
 
 from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.template.loader import render_to_string
+import mock
 
-from api_v3.models import Ticket, Action
+from api_v3.models import Action, OutboxEmail, Ticket
 from api_v3.factories import (
+    AttachmentFactory,
     ProfileFactory,
     ResponderFactory,
+    SubscriberFactory,
     TicketFactory
 )
 from .support import ApiTestCase, APIClient, reverse
@@ -45,6 +53,54 @@ class TicketsEndpointTestCase(ApiTestCase):
 
         self.assertEqual(response.status_code, 401)
 
+    def test_attachments_zip_anonymous(self):
+        response = self.client.get(
+            reverse('ticket-attachments-zip', args=[self.tickets[0].id]))
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_attachments_zip_no_access(self):
+        self.client.force_authenticate(self.users[3])
+
+        response = self.client.get(
+            reverse('ticket-attachments-zip', args=[self.tickets[0].id]))
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_attachments_zip(self):
+        attachments = [
+            AttachmentFactory.create(
+                ticket=self.tickets[0],
+                upload=SimpleUploadedFile('notes.txt', content)
+            )
+            for content in [b'first', b'second']
+        ] + [
+            AttachmentFactory.create(
+                ticket=self.tickets[0],
+                upload=SimpleUploadedFile(
+                    'image.png', b'\x89PNG\r\n\x1a\n' + b'\0' * 300)
+            )
+        ]
+        AttachmentFactory.create(ticket=self.tickets[1])
+        self.client.force_authenticate(self.users[1])
+
+        response = self.client.get(
+            reverse('ticket-attachments-zip', args=[self.tickets[0].id]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/zip')
+
+        archive = zipfile.ZipFile(
+            BytesIO(b''.join(response.streaming_content)))
+
+        self.assertEqual(
+            archive.namelist(), ['notes.txt', 'notes (2).txt', 'image.png'])
+        self.assertEqual(archive.read('notes (2).txt'), b'second')
+        self.assertEqual(
+            archive.getinfo('image.png').compress_type, zipfile.ZIP_STORED)
+        self.assertEqual(
+            archive.getinfo('image.png').file_size, attachments[2].size)
+
     def test_list_authenticated(self):
         self.client.force_authenticate(self.users[0])
 
@@ -57,6 +113,87 @@ class TicketsEndpointTestCase(ApiTestCase):
 
         self.assertEqual(body['meta']['total']['all'], 2)
 
+    def test_list_filters_once(self):
+        self.client.force_authenticate(self.users[0])
+
+        with mock.patch.object(
+                TicketsEndpoint, 'filter_queryset', autospec=True,
+                side_effect=TicketsEndpoint.filter_queryset) as filter_queryset:
+            response = self.client.get(
+                reverse('ticket-list'),
+                {'filter[status__in]': 'new', 'facets': 'kind'}
+            )
+
+        body = json.loads(response.content)
+
+        self.assertEqual(filter_queryset.call_count, 1)
+        # The status filter is not applied to the totals.
+        self.assertEqual(body['meta']['total']['all'], 2)
+        self.assertEqual(
+            len(body['data']),
+            len([t for t in self.tickets[:2] if t.status == 'new'])
+        )
+
+    def test_list_authenticated_keyset(self):
+        self.client.force_authenticate(self.users[0])
+
+        response = self.client.get(
+            reverse('ticket-list'),
+            {'page[cursor]': '', 'page[size]': 1, 'sort': 'created_at'}
+        )
+        body = json.loads(response.content)
+
+        self.assertEqual(body['data'][0]['id'], str(self.tickets[0].id))
+        self.assertIsNone(body['links']['prev'])
+
+        body = json.loads(self.client.get(body['links']['next']).content)
+
+        self.assertEqual(body['data'][0]['id'], str(self.tickets[1].id))
+        self.assertIsNone(body['links']['next'])
+        self.assertIn('page[cursor]=', body['links']['prev'])
+
+    def test_list_authenticated_keyset_other_sort(self):
+        self.client.force_authenticate(self.users[0])
+
+        response = self.client.get(
+            reverse('ticket-list'),
+            {'page[cursor]': '', 'sort': 'deadline_at'}
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('created_at', response.content.decode('utf-8'))
+
+    def test_list_authenticated_with_includes_query_ceiling(self):
+        self.users[3].is_superuser = True
+        self.users[3].save()
+        self.client.force_authenticate(self.users[3])
+
+        tickets = TicketFactory.create_batch(30)
+
+        for ticket in tickets:
+            ResponderFactory.create(ticket=ticket)
+            SubscriberFactory.create(ticket=ticket)
+            AttachmentFactory.create(ticket=ticket, user=ticket.requester)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('ticket-list'), {
+                'sort': '-created_at',
+                'include': ','.join([
+                    'requester', 'responders', 'subscribers', 'attachments',
+                    'users', 'responder-users', 'subscriber-users'
+                ])
+            })
+
+        body = json.loads(response.content)
+        users = dict(
+            (item['id'], item['relationships']['users']['data'])
+            for item in body['data']
+        )
+
+        self.assertEqual(len(users), 30)
+        self.assertEqual(len(users[str(tickets[-1].id)]), 2)
+        self.assertLessEqual(len(queries), 15)
+
     def test_list_authenticated_superuser(self):
         self.users[0].is_superuser = True
         self.users[0].save()
@@ -94,6 +231,26 @@ class TicketsEndpointTestCase(ApiTestCase):
         self.assertNotContains(response, self.responders[0].user.email)
         self.assertNotContains(response, self.responders[1].user.email)
 
+    def test_list_authenticated_with_facets(self):
+        self.client.force_authenticate(self.users[0])
+
+        response = self.client.get(
+            reverse('ticket-list'), {'facets': 'kind,country,unknown'})
+
+        self.assertEqual(response.status_code, 200)
+
+        body = json.loads(response.content)
+        facets = body['meta']['facets']
+
+        kinds = dict((f['value'], f['count']) for f in facets['kind'])
+
+        self.assertEqual(sorted(facets.keys()), ['country', 'kind'])
+        self.assertEqual(sum(kinds.values()), 2)
+        self.assertEqual(
+            kinds[self.tickets[0].kind],
+            len([t for t in self.tickets[:2] if t.kind == self.tickets[0].kind])
+        )
+
     def test_list_filter_authenticated_by_requester(self):
         user = self.users[1]
         user.is_superuser = True
@@ -373,6 +530,10 @@ class TicketsEndpointTestCase(ApiTestCase):
         count, emails = controller.email_notify(self.tickets[0])
 
         self.assertEqual(count, 1)
+        self.assertEqual(
+            list(OutboxEmail.objects.values_list('recipients', flat=True)),
+            [[self.users[0].email]]
+        )
 
         self.assertEqual(emails[0], [
             controller.EMAIL_SUBJECT.format(self.tickets[0].id),
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os.path
+
+from django.test import override_settings
+
+from api_v3.factories import ProfileFactory, TicketFactory
+from api_v3.models import Action, Attachment, UploadSession
+from .support import ApiTestCase, APIClient, reverse
+
+
+@override_settings(UPLOAD_CHUNK_SIZE=4)
+class UploadSessionsEndpointTestCase(ApiTestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.users = [
+            ProfileFactory.create(),
+            ProfileFactory.create()
+        ]
+        self.ticket = TicketFactory.create(requester=self.users[0])
+        self.content = b'chunked file'
+
+    def create_session(self, user):
+        self.client.force_authenticate(user)
+
+        return self.client.post(
+            reverse('uploadsession-list'),
+            data=json.dumps({
+                'data': {
+                    'type': 'upload-sessions',
+                    'attributes': {
+                        'file-name': 'evidence.txt',
+                        'size': len(self.content)
+                    },
+                    'relationships': {
+                        'ticket': {
+                            'data': {'type': 'tickets', 'id': self.ticket.id}
+                        }
+                    }
+                }
+            }),
+            content_type=self.JSON_API_CONTENT_TYPE
+        )
+
+    def put_chunk(self, session_id, index, data=None, checksum=None):
+        data = self.content[index * 4:index * 4 + 4] if data is None else data
+
+        return self.client.put(
+            reverse('uploadsession-chunk', args=[session_id, index]),
+            data=data,
+            content_type='application/octet-stream',
+            HTTP_X_CHUNK_SHA256=checksum or hashlib.sha256(data).hexdigest()
+        )
+
+    def test_create_without_access(self):
+        response = self.create_session(self.users[1])
+
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(UploadSession.objects.count(), 0)
+
+    def test_upload(self):
+        response = self.create_session(self.users[0])
+        session = json.loads(response.content)['data']
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(session['attributes']['chunks-count'], 3)
+
+        for index in [2, 0]:
+            self.assertEqual(
+                self.put_chunk(session['id'], index).status_code, 200)
+
+        response = self.put_chunk(session['id'], 1, checksum='0' * 64)
+
+        self.assertEqual(response.status_code, 422)
+
+        response = self.client.post(
+            reverse('uploadsession-finalize', args=[session['id']]))
+
+        self.assertEqual(response.status_code, 422)
+
+        # Resume with the missing chunks.
+        response = self.client.get(
+            reverse('uploadsession-detail', args=[session['id']]))
+
+        self.assertEqual(
+            json.loads(response.content)['data']['attributes']['missing'],
+            [1]
+        )
+        self.assertEqual(self.put_chunk(session['id'], 1).status_code, 200)
+
+        response = self.client.post(
+            reverse('uploadsession-finalize', args=[session['id']]))
+        data = json.loads(response.content)['data']
+        attachment = Attachment.objects.get(id=data['id'])
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(data['type'], 'attachments')
+        self.assertEqual(attachment.upload.read(), self.content)
+        self.assertEqual(
+            attachment.sha256, hashlib.sha256(self.content).hexdigest())
+        self.assertEqual(UploadSession.objects.count(), 0)
+        self.assertEqual(
+            Action.objects.filter(verb='attachment:create').count(), 1)
+
+        attachment.upload.close()
+        attachment.upload.delete(save=False)
+
+    def test_chunk_length_and_owner(self):
+        session = json.loads(
+            self.create_session(self.users[0]).content)['data']
+
+        response = self.put_chunk(session['id'], 0, data=b'short')
+
+        self.assertEqual(response.status_code, 422)
+
+        self.client.force_authenticate(self.users[1])
+
+        self.assertEqual(self.put_chunk(session['id'], 0).status_code, 404)
+
+    def test_delete(self):
+        session = json.loads(
+            self.create_session(self.users[0]).content)['data']
+        path = UploadSession.objects.get(id=session['id']).path
+
+        response = self.client.delete(
+            reverse('uploadsession-detail', args=[session['id']]))
+
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(os.path.exists(path))
@@ -9,13 +9,17 @@ from .views.attachments import AttachmentsEndpoint
 from .views.activities import ActivitiesEndpoint
 from .views.comments import CommentsEndpoint
 from .views.download import DownloadEndpoint
+from .views.jobs import JobsEndpoint
+from .views.metrics import metrics
 from .views.ops import OpsEndpoint
+from .views.previews import PreviewsEndpoint
 from .views.profiles import ProfilesEndpoint
 from .views.responders import RespondersEndpoint
 from .views.session import SessionEndpoint
 from .views.subscribers import SubscribersEndpoint
 from .views.tickets import TicketsEndpoint
 from .views.ticket_stats import TicketStatsEndpoint
+from .views.upload_sessions import UploadSessionsEndpoint
 
 
 router = locate(settings.ROUTER_CLASS)(trailing_slash=False)
@@ -23,13 +27,16 @@ router.register(r'attachments', AttachmentsEndpoint)
 router.register(r'activities', ActivitiesEndpoint)
 router.register(r'comments', CommentsEndpoint)
 router.register(r'download', DownloadEndpoint, base_name='download')
+router.register(r'jobs', JobsEndpoint, base_name='jobs')
 router.register(r'me', SessionEndpoint, base_name='me')
 router.register(r'ops', OpsEndpoint, base_name='ops')
+router.register(r'previews', PreviewsEndpoint, base_name='preview')
 router.register(r'profiles', ProfilesEndpoint)
 router.register(r'responders', RespondersEndpoint)
 router.register(r'subscribers', SubscribersEndpoint)
 router.register(r'tickets', TicketsEndpoint)
 router.register(r'ticket-stats', TicketStatsEndpoint, base_name='ticket_stats')
+router.register(r'upload-sessions', UploadSessionsEndpoint)
 
 auth_router = locate(settings.ROUTER_CLASS)(trailing_slash=False)
 auth_router.register(r'login', LoginEndpoint, base_name='login')
@@ -37,5 +44,6 @@ auth_router.register(r'login', LoginEndpoint, base_name='login')
 urlpatterns = [
     url('api/v3/', include(router.urls)),
     url('accounts/', include(auth_router.urls)),
-    url('accounts/social/', include('social_django.urls', namespace='social'))
+    url('accounts/social/', include('social_django.urls', namespace='social')),
+    url(r'^metrics$', metrics, name='metrics')
 ]
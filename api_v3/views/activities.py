@@ -1,8 +1,10 @@
+from django.db.models import TextField
+from django.db.models.functions import Cast
 from rest_framework import viewsets
 
 from api_v3.models import Action, Ticket
 from api_v3.serializers import ActionSerializer
-from .support import JSONApiEndpoint
+from .support import JSONApiEndpoint, KeysetPagination
 
 
 class ActivitiesEndpoint(JSONApiEndpoint, viewsets.ReadOnlyModelViewSet):
@@ -10,6 +12,8 @@ class ActivitiesEndpoint(JSONApiEndpoint, viewsets.ReadOnlyModelViewSet):
     serializer_class = ActionSerializer
     ordering_fields = ('timestamp',)
     ordering = ('-timestamp',)
+    pagination_class = KeysetPagination
+    keyset_field = 'timestamp'
     filter_fields = {
         'id': ['exact', 'lt', 'gt'],
         'timestamp': ['range'],
@@ -29,7 +33,7 @@ class ActivitiesEndpoint(JSONApiEndpoint, viewsets.ReadOnlyModelViewSet):
         if not self.request.user.is_active:
             return queryset.none()
 
-        user_ticket_ids = Ticket.filter_by_user(
-            self.request.user).values_list('id', flat=True)
-        return Action.objects.filter(
-            target_object_id__in=map(str, user_ticket_ids))
+        # Activity targets are generic relations, ids are stored as text.
+        user_ticket_ids = Ticket.filter_by_user(self.request.user).annotate(
+            text_id=Cast('id', TextField())).values('text_id')
+        return Action.objects.filter(target_object_id__in=user_ticket_ids)
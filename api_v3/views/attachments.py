@@ -1,5 +1,6 @@
 from rest_framework import viewsets, mixins, serializers, exceptions
 
+from api_v3.misc import metrics
 from api_v3.models import Action, Ticket, Attachment
 from api_v3.serializers import AttachmentSerializer
 from .support import JSONApiEndpoint
@@ -39,6 +40,7 @@ class AttachmentsEndpoint(
             )
         else:
             attachment = serializer.save(user=self.request.user)
+            metrics.UPLOAD_BYTES.labels('form').inc(attachment.upload.size)
 
             Action.objects.create(
                 action=attachment,
@@ -1,9 +1,8 @@
 from django.conf import settings
-from django.core.mail import send_mass_mail
 from django.template.loader import render_to_string
 from rest_framework import mixins, serializers, viewsets
 
-from api_v3.models import Action, Comment, Ticket
+from api_v3.models import Action, Comment, OutboxEmail, Ticket
 from api_v3.serializers import CommentSerializer
 from .support import JSONApiEndpoint
 
@@ -55,7 +54,7 @@ class CommentsEndpoint(
             return comment
 
     def email_notify(self, comment):
-        """Sends an email to ticket users about the new comment."""
+        """Queues an email to ticket users about the new comment."""
         emails = []
         subject = self.EMAIL_SUBJECT.format(comment.ticket.id)
         to_notify = [comment.ticket.requester.__dict__]
@@ -97,4 +96,4 @@ class CommentsEndpoint(
                 [entry['email']]
             ])
 
-        return send_mass_mail(emails, fail_silently=True), emails
+        return OutboxEmail.queue(emails), emails
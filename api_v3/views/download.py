@@ -1,9 +1,13 @@
-import os.path
-
-from django.http import FileResponse
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, urlquote
 from rest_framework import viewsets, exceptions, permissions
 
-from api_v3.models import Attachment, Ticket
+from api_v3.misc.byte_ranges import (
+    MultipartRanges, UnsatisfiableRange, parse_ranges, stream_range)
+from api_v3.misc import metrics
+from api_v3.models import Attachment
 from .support import JSONApiEndpoint
 
 
@@ -11,24 +15,130 @@ class DownloadEndpoint(JSONApiEndpoint, viewsets.ViewSet):
 
     permission_classes = (permissions.IsAuthenticated,)
 
-    def retrieve(self, request, pk=None):
-        user_ticket_ids = Ticket.filter_by_user(
-            self.request.user).values_list('id', flat=True)
+    CONTENT_TYPE = 'application/octet-stream'
 
+    # Download backends, see the `DOWNLOAD_BACKEND` setting.
+    BACKENDS = {
+        'stream': 'stream_response',
+        'x-accel-redirect': 'accel_redirect_response',
+        'x-sendfile': 'sendfile_response',
+    }
+
+    def retrieve(self, request, pk=None):
+        """Sends the attachment file, unless the client has it cached."""
         if self.request.user.is_superuser:
             attachment = Attachment.objects.get(id=pk)
         else:
-            attachment = Attachment.objects.filter(
-                id=pk, ticket__in=user_ticket_ids).first()
+            attachment = Attachment.filter_by_user(
+                self.request.user).filter(id=pk).first()
 
         if not attachment or not attachment.upload:
             raise exceptions.NotFound()
 
-        resp = FileResponse(
-            attachment.upload.file, content_type='application/octet-stream')
-        resp['Content-Length'] = os.path.getsize(attachment.upload.path)
-        resp['Content-Disposition'] = 'filename={}'.format(os.path.basename(
-            attachment.upload.name.encode('utf-8', 'ignore')
-        ))
+        # Uploads not inspected yet, see the `inspect_attachments` command.
+        if attachment.size is None:
+            attachment.inspect_upload()
+            attachment.save(update_fields=['sha256', 'size', 'mime_type'])
+
+        resp = get_conditional_response(
+            request,
+            etag=attachment.etag,
+            last_modified=attachment.last_modified
+        )
+
+        if resp is None:
+            backend = self.BACKENDS.get(
+                settings.DOWNLOAD_BACKEND, self.BACKENDS['stream'])
+            resp = getattr(self, backend)(attachment)
+            self.record_metrics(backend, resp, attachment)
+            resp['Content-Disposition'] = 'filename={}'.format(
+                attachment.file_name.encode('utf-8', 'ignore'))
+
+        resp['ETag'] = attachment.etag
+        resp['Last-Modified'] = http_date(attachment.last_modified)
+
+        return resp
+
+    @staticmethod
+    def record_metrics(backend, resp, attachment):
+        """Counts the sent bytes, the web server sends the handed files."""
+        if resp.status_code == 206:
+            size = int(resp['Content-Length'])
+        elif resp.status_code == 200:
+            size = attachment.size
+        else:
+            return
+
+        metrics.DOWNLOAD_BYTES.labels(backend.replace('_response', '')).inc(
+            size)
+
+    def stream_response(self, attachment):
+        """Streams the file, or the requested ranges, through the API."""
+        upload = attachment.upload
+        size = attachment.size
+        ranges = None
+
+        if self.range_applies(attachment):
+            try:
+                ranges = parse_ranges(
+                    self.request.META.get('HTTP_RANGE'), size)
+            except UnsatisfiableRange:
+                resp = HttpResponse(status=416)
+                resp['Content-Range'] = 'bytes */{}'.format(size)
+                return resp
+
+        upload.open('rb')
+
+        if not ranges:
+            resp = FileResponse(upload.file, content_type=self.CONTENT_TYPE)
+            resp['Content-Length'] = size
+        elif len(ranges) == 1:
+            start, end = ranges[0]
+            resp = StreamingHttpResponse(
+                stream_range(upload.file, start, end),
+                status=206,
+                content_type=self.CONTENT_TYPE
+            )
+            resp['Content-Length'] = end - start + 1
+            resp['Content-Range'] = 'bytes {}-{}/{}'.format(start, end, size)
+        else:
+            body = MultipartRanges(
+                upload.file, ranges, size, self.CONTENT_TYPE)
+            resp = StreamingHttpResponse(
+                body, status=206, content_type=body.content_type)
+            resp['Content-Length'] = len(body)
+
+        resp['Accept-Ranges'] = 'bytes'
+
+        return resp
+
+    def range_applies(self, attachment):
+        """Checks the `If-Range` header, if any, matches the file."""
+        if_range = self.request.META.get('HTTP_IF_RANGE')
+
+        if not if_range:
+            return True
+        elif if_range.startswith('"'):
+            return if_range == attachment.etag
+        else:
+            return parse_http_date_safe(if_range) == attachment.last_modified
+
+    def accel_redirect_response(self, attachment):
+        """Hands the transfer to the nginx internal location.
+
+        Nginx sets the length and handles the ranges.
+        """
+        resp = HttpResponse(content_type=self.CONTENT_TYPE)
+        resp['X-Accel-Redirect'] = urlquote(
+            settings.DOWNLOAD_ACCEL_LOCATION.rstrip('/') + '/' +
+            attachment.upload.name
+        )
+
+        return resp
+
+    def sendfile_response(self, attachment):
+        """Hands the transfer to the web server by the file path."""
+        resp = HttpResponse(content_type=self.CONTENT_TYPE)
+        resp['X-Sendfile'] = attachment.upload.path.encode('utf-8')
 
         return resp
@@ -0,0 +1,30 @@
+from django.shortcuts import get_object_or_404
+from rest_framework import response, viewsets, permissions
+
+from api_v3.models import Job
+
+
+class JobsEndpoint(viewsets.ViewSet):
+    """Reports the status of the background jobs.
+
+    The job errors are not detailed, these can hold internal details.
+    """
+
+    permission_classes = (permissions.IsAuthenticated,)
+
+    ERROR = 'The job failed, please check the worker logs.'
+
+    def retrieve(self, request, pk=None):
+        job = get_object_or_404(Job, pk=pk)
+
+        return response.Response({
+            'id': job.id,
+            'operation': job.name,
+            'status': job.status,
+            'progress': job.progress,
+            'result': job.result,
+            'error': self.ERROR if job.error else None,
+            'created_at': job.created_at,
+            'started_at': job.started_at,
+            'finished_at': job.finished_at
+        })
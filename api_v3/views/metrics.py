@@ -0,0 +1,15 @@
+from django.http import HttpResponse
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from api_v3.misc.metrics import collector_registry
+
+
+def metrics(request):
+    """Exposes the Prometheus metrics.
+
+    Not proxied by nginx, scraped from the internal network only.
+    """
+    return HttpResponse(
+        generate_latest(collector_registry()),
+        content_type=CONTENT_TYPE_LATEST
+    )
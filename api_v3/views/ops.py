@@ -1,22 +1,23 @@
 from rest_framework import response, viewsets, permissions
 
-from api_v3.management.commands.email_ticket_digest import Command
+from api_v3.models import Job
 
 
 class OpsEndpoint(viewsets.ViewSet):
-    """Triggers internal operations."""
+    """Triggers internal operations, these run as background jobs."""
 
     permission_classes = (permissions.AllowAny,)
 
+    # Anonymous, the previews are queued by the uploads, see `api_v3.models`.
+    OPERATIONS = ('email_ticket_digest',)
+
     def retrieve(self, request, pk=None):
         data = {'operation': None}
 
-        if pk == 'email_ticket_digest':
-            cmd = Command()
-            status = cmd.handle(
-                request_host=self.request.get_host()
-            )
+        if pk in self.OPERATIONS:
+            job, _ = Job.enqueue(pk, request_host=self.request.get_host())
             data['operation'] = pk
-            data['status'] = status
+            data['job_id'] = job.id
+            data['status'] = job.status
 
         return response.Response(data)
@@ -0,0 +1,53 @@
+from django.http import FileResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from rest_framework import viewsets, exceptions, permissions
+
+from api_v3.models import Attachment
+from .support import JSONApiEndpoint
+
+
+class PreviewsEndpoint(JSONApiEndpoint, viewsets.ViewSet):
+    """Sends the attachment previews, ex.: `/previews/1?size=thumbnail`."""
+
+    permission_classes = (permissions.IsAuthenticated,)
+
+    # Uploads never change, neither do their previews.
+    MAX_AGE = 365 * 24 * 60 * 60
+
+    def retrieve(self, request, pk=None):
+        """Sends the preview, unless the client has it cached."""
+        size = request.query_params.get('size') or 'thumbnail'
+
+        if size not in dict(Attachment.PREVIEW_SIZES):
+            raise exceptions.NotFound()
+
+        if self.request.user.is_superuser:
+            attachments = Attachment.objects.all()
+        else:
+            attachments = Attachment.filter_by_user(self.request.user)
+
+        attachment = attachments.filter(id=pk, previewed=True).first()
+
+        if not attachment:
+            raise exceptions.NotFound()
+
+        etag = '"{}-{}"'.format(attachment.sha256, size)
+        resp = get_conditional_response(
+            request, etag=etag, last_modified=attachment.last_modified)
+
+        if resp is None:
+            try:
+                preview = Attachment.preview_storage.open(
+                    attachment.preview_name(size), 'rb')
+            except (IOError, OSError):
+                raise exceptions.NotFound()
+
+            resp = FileResponse(preview, content_type='image/jpeg')
+            resp['Content-Length'] = preview.size
+
+        resp['ETag'] = etag
+        resp['Last-Modified'] = http_date(attachment.last_modified)
+        patch_cache_control(resp, private=True, max_age=self.MAX_AGE)
+
+        return resp
@@ -1,9 +1,8 @@
-from django.core.mail import send_mass_mail
 from django.conf import settings
 from django.template.loader import render_to_string
 from rest_framework import exceptions, mixins, serializers, viewsets
 
-from api_v3.models import Action, Responder, Ticket
+from api_v3.models import Action, OutboxEmail, Responder, Ticket
 from api_v3.serializers import ResponderSerializer
 from .support import JSONApiEndpoint
 
@@ -34,7 +33,7 @@ class RespondersEndpoint(
         if not self.request.user.is_active:
             return queryset.none()
 
-        return Responder.filter_by_user(self.request.user, queryset).distinct()
+        return Responder.filter_by_user(self.request.user, queryset)
 
     def perform_create(self, serializer):
         """Make sure only super user can add responders."""
@@ -71,7 +70,7 @@ class RespondersEndpoint(
         return activity
 
     def email_notify(self, activity):
-        """Sends an email to the responder about the new ticket."""
+        """Queues an email to the responder about the new ticket."""
         subject = self.EMAIL_SUBJECT.format(activity.target.id)
         emails = [
             [
@@ -89,4 +88,4 @@ class RespondersEndpoint(
             ]
         ]
 
-        return send_mass_mail(emails, fail_silently=True)
+        return OutboxEmail.queue(emails)
@@ -1,9 +1,8 @@
-from django.core.mail import send_mass_mail
 from django.conf import settings
 from django.template.loader import render_to_string
 from rest_framework import exceptions, mixins, serializers, viewsets
 
-from api_v3.models import Action, Subscriber, Profile
+from api_v3.models import Action, OutboxEmail, Profile, Subscriber
 from api_v3.serializers import SubscriberSerializer
 from .support import JSONApiEndpoint
 
@@ -34,7 +33,7 @@ class SubscribersEndpoint(
         if not self.request.user.is_active:
             return queryset.none()
 
-        return Subscriber.filter_by_user(self.request.user, queryset).distinct()
+        return Subscriber.filter_by_user(self.request.user, queryset)
 
     def create(self, request, *args, **kwargs):
         """Validate user before it hits the serializer."""
@@ -89,7 +88,7 @@ class SubscribersEndpoint(
         return activity
 
     def email_notify(self, activity, subscriber):
-        """Sends an email to the subscriber about the new ticket."""
+        """Queues an email to the subscriber about the new ticket."""
         subject = self.EMAIL_SUBJECT.format(activity.target.id)
         request_host = ''
 
@@ -114,4 +113,4 @@ class SubscribersEndpoint(
             ]
         ]
 
-        return send_mass_mail(emails, fail_silently=True), emails
+        return OutboxEmail.queue(emails), emails
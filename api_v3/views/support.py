@@ -1,3 +1,7 @@
+import base64
+from collections import OrderedDict
+import json
+
 import rest_framework.exceptions
 import rest_framework.parsers
 import rest_framework.renderers
@@ -12,11 +16,15 @@ import rest_framework_json_api.utils
 import rest_framework_json_api.exceptions
 import django_filters.rest_framework
 from rest_framework.status import HTTP_422_UNPROCESSABLE_ENTITY
-from querystring_parser import parser as qs_parser
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 from django.utils.six.moves.urllib.parse import unquote as url_unquote
 from django.utils.encoding import force_unicode
 
 from django.conf import settings
+import django.core.exceptions
+
+from api_v3.misc.filter_params import parse_filter_params
+from api_v3.models import Ticket
 
 
 class DjangoFilterBackend(django_filters.rest_framework.DjangoFilterBackend):
@@ -55,6 +63,164 @@ class Pagination(rest_framework_json_api.pagination.PageNumberPagination):
         return response
 
 
+class KeysetPagination(Pagination):
+    """Opt-in keyset pagination, enabled by the `page[cursor]` parameter.
+
+    Pages are filtered on the `(keyset_field, id)` row of the last seen
+    item, so every page is an index range scan, without count or offset.
+    An empty cursor returns the first page. Without a `keyset_field` on the
+    view, or a cursor in the request, it falls back to the page numbers.
+    With a cursor, only the `keyset_field` sorting is allowed.
+    """
+    cursor_query_param = 'page[cursor]'
+    ordering_param = OrderingFilter.ordering_param
+
+    cursor = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        keyset_field = getattr(view, 'keyset_field', None)
+        self.cursor = request.query_params.get(self.cursor_query_param)
+
+        if keyset_field is None or self.cursor is None:
+            self.cursor = None
+            return super(KeysetPagination, self).paginate_queryset(
+                queryset, request, view)
+
+        self.check_ordering(request, keyset_field)
+        self.request = request
+        self.keyset_field = keyset_field
+        page_size = self.get_page_size(request)
+        position, backwards = self.decode_cursor(
+            self.cursor, queryset.model._meta.get_field(keyset_field))
+
+        # Keep the direction of the ordering, newest first by default.
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        descending = not ordering or ordering[0] != keyset_field
+        descending = descending != backwards
+
+        queryset = queryset.order_by(*[
+            '{}{}'.format('-' if descending else '', field)
+            for field in (keyset_field, 'pk')
+        ])
+
+        if position:
+            queryset = queryset.extra(
+                where=['({}, {}) {} (%s, %s)'.format(
+                    self.column_sql(queryset.model, keyset_field),
+                    self.column_sql(queryset.model, 'pk'),
+                    '<' if descending else '>'
+                )],
+                params=position
+            )
+
+        page = list(queryset[:page_size + 1])
+        has_more = len(page) > page_size
+        page = page[:page_size]
+
+        if backwards:
+            page.reverse()
+
+        self.next_item = self.prev_item = None
+
+        if page and (has_more or backwards):
+            self.next_item = page[-1]
+        if page and (has_more if backwards else position):
+            self.prev_item = page[0]
+
+        return page
+
+    def check_ordering(self, request, keyset_field):
+        """Rejects a sorting the keyset can not paginate."""
+        ordering = request.query_params.get(self.ordering_param)
+
+        if ordering and ordering.strip().lstrip('-') != keyset_field:
+            # Not a validation error, these are sent as 422 responses.
+            raise rest_framework.exceptions.ParseError(
+                'Only sorting by `{}` is supported with a cursor.'.format(
+                    keyset_field))
+
+    @staticmethod
+    def column_sql(model, field_name):
+        """Returns the quoted and table qualified field column."""
+        if field_name == 'pk':
+            field = model._meta.pk
+        else:
+            field = model._meta.get_field(field_name)
+
+        return '"{}"."{}"'.format(model._meta.db_table, field.column)
+
+    def encode_cursor(self, item, backwards):
+        """Returns the cursor of the item position, for the URL."""
+        value = getattr(item, self.keyset_field)
+        value = value.isoformat() if hasattr(value, 'isoformat') else value
+        data = json.dumps({'p': [value, item.pk], 'b': backwards})
+
+        return base64.urlsafe_b64encode(data.encode('utf-8')).decode(
+            'ascii').rstrip('=')
+
+    def decode_cursor(self, cursor, keyset_field):
+        """Returns the position and the direction of the cursor.
+
+        The position values are parsed, so invalid ones never reach the
+        database query.
+        """
+        if not cursor:
+            return None, False
+
+        invalid = rest_framework.exceptions.NotFound('Invalid cursor.')
+
+        try:
+            padding = '=' * (-len(cursor) % 4)
+            data = json.loads(
+                base64.urlsafe_b64decode(str(cursor + padding)).decode('utf-8'))
+            position, backwards = data['p'], bool(data.get('b'))
+
+            if not isinstance(position, list) or len(position) != 2:
+                raise invalid
+
+            value = keyset_field.to_python(position[0])
+            pk = int(position[1])
+        except (
+                KeyError, TypeError, ValueError,
+                django.core.exceptions.ValidationError):
+            raise invalid
+
+        if value is None:
+            raise invalid
+
+        return [value, pk], backwards
+
+    def build_cursor_link(self, cursor):
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.page_query_param)
+        url = replace_query_param(url, self.cursor_query_param, cursor)
+
+        return force_unicode(url_unquote(url))
+
+    def get_paginated_response(self, data):
+        if self.cursor is None:
+            return super(KeysetPagination, self).get_paginated_response(data)
+
+        next_link = prev_link = None
+
+        if self.next_item is not None:
+            next_link = self.build_cursor_link(
+                self.encode_cursor(self.next_item, False))
+        if self.prev_item is not None:
+            prev_link = self.build_cursor_link(
+                self.encode_cursor(self.prev_item, True))
+
+        return rest_framework.response.Response({
+            'results': data,
+            'meta': {},
+            'links': OrderedDict([
+                ('first', self.build_cursor_link('')),
+                ('next', next_link),
+                ('prev', prev_link)
+            ])
+        })
+
+
 class SessionAuthenticationSansCSRF(
         rest_framework.authentication.SessionAuthentication):
 
@@ -91,15 +257,43 @@ class JSONApiEndpoint(object):
     metadata_class = rest_framework_json_api.metadata.JSONAPIMetadata
     filter_fields = ('id', )
 
+    # The list queryset, with the permissions and the filters applied.
+    filtered_queryset = None
+
     def extract_filter_params(self, request):
-        params = qs_parser.parse(request.META['QUERY_STRING'])
-        params = params.get('filter') or {}
+        """Returns the `filter[...]` query params, parsed once per request.
+
+        The filter backend, the views and the serializers ask for these.
+        """
+        request = getattr(request, '_request', request)
+        query_string = request.META.get('QUERY_STRING', '')
+        parsed = getattr(request, '_filter_params', None)
+
+        if not parsed or parsed[0] != query_string:
+            parsed = (query_string, parse_filter_params(query_string))
+            request._filter_params = parsed
+
+        # A copy, the views could set defaults.
+        return dict(parsed[1])
+
+    def paginate_queryset(self, queryset):
+        """Keeps the filtered list queryset, before it gets paginated."""
+        self.filtered_queryset = queryset
+
+        return super(JSONApiEndpoint, self).paginate_queryset(queryset)
+
+    def get_serializer_context(self):
+        """Passes the filtered list queryset, used by the root meta."""
+        context = super(JSONApiEndpoint, self).get_serializer_context()
+        context['filtered_queryset'] = self.filtered_queryset
 
-        for k, v in params.items():
-            if not v:
-                params.pop(k)
+        return context
 
-        return params
+    def dispatch(self, request, *args, **kwargs):
+        """Updates the tickets of the request activities once, at the end."""
+        with Ticket.batch_touches():
+            return super(JSONApiEndpoint, self).dispatch(
+                request, *args, **kwargs)
 
     def action_name(self):
         """Simple helper to generate the current action name."""
@@ -1,10 +1,15 @@
 from datetime import datetime, timedelta
 
-from django.db.models import Avg, Count, Case, F, IntegerField, Sum, When
-from django.db.models.functions import Trunc, Extract
+from django.db.models import (
+    Avg, Count, Case, ExpressionWrapper, F, FloatField, Func, IntegerField,
+    Sum, Value, When
+)
+from django.db.models.functions import Coalesce, Trunc, Extract
+from django.utils.dateparse import parse_datetime
+import django_filters
 from rest_framework import viewsets, response
 
-from api_v3.models import Profile, Ticket
+from api_v3.models import Profile, Ticket, TicketMonthlyStat
 from api_v3.serializers import TicketStatSerializer
 from .support import JSONApiEndpoint
 
@@ -18,6 +23,28 @@ class TicketStatsEndpoint(JSONApiEndpoint, viewsets.ReadOnlyModelViewSet):
         __getattr__ = dict.__getitem__
         __setattr__ = dict.__setitem__
 
+    class RollupFilter(django_filters.FilterSet):
+        """Maps the ticket filters to the monthly rollup."""
+
+        created_at__gte = django_filters.IsoDateTimeFilter(
+            name='month', lookup_expr='gte')
+        created_at__lte = django_filters.IsoDateTimeFilter(
+            method='filter_created_at__lte')
+        country = django_filters.CharFilter()
+        status__in = django_filters.BaseInFilter(name='status')
+        kind = django_filters.CharFilter()
+        responders__user = django_filters.NumberFilter(name='responder')
+        responders__user__isnull = django_filters.BooleanFilter(
+            name='has_responders', exclude=True)
+
+        class Meta:
+            model = TicketMonthlyStat
+            fields = []
+
+        def filter_created_at__lte(self, queryset, name, value):
+            # Either a month start or a future date, see `rollup_covers()`.
+            return queryset.filter(month__lt=value)
+
     queryset = Ticket.objects.all()
     serializer_class = TicketStatSerializer
     pagination_class = Pagination
@@ -47,9 +74,153 @@ class TicketStatsEndpoint(JSONApiEndpoint, viewsets.ReadOnlyModelViewSet):
             return response.Response(self.serializer_class([], many=True).data)
 
         profile = None
+        params = self.extract_filter_params(self.request)
+
+        if self.rollup_covers(params):
+            totals, aggregated, countries, responder_ids = self.rollup_stats(
+                params)
+        else:
+            totals, aggregated, countries, responder_ids = self.live_stats(
+                params)
+
+        if params.get('responders__user'):
+            profile = Profile.objects.get(id=params.get('responders__user'))
+
+        stats = map(
+            lambda stat: self.TicketStat(
+                stat,
+                profile_id=getattr(profile, 'id', None),
+                profile=profile,
+                pk=None
+            ),
+            aggregated
+        )
+
+        serializer = self.serializer_class(stats, many=True, context={
+            'params': params,
+            'totals': totals,
+            'countries': countries,
+            'responder_ids': responder_ids,
+        })
+
+        return response.Response(serializer.data)
+
+    def rollup_covers(self, params):
+        """Checks if the rollup months match the requested dates.
+
+        Otherwise the stats are computed from the tickets.
+        """
+        start = parse_datetime(params.get('created_at__gte') or '')
+        end = parse_datetime(params.get('created_at__lte') or '')
+
+        if not start or start != TicketMonthlyStat.month_of(start):
+            return False
+
+        return (
+            not end or end >= datetime.utcnow() or
+            end == TicketMonthlyStat.month_of(end)
+        )
+
+    def rollup_stats(self, params):
+        """Returns the stats, countries and responders from the rollup."""
+        queryset = self.RollupFilter(
+            params, queryset=TicketMonthlyStat.objects.all()).qs
+        countries = []
+        responder_ids = []
+
+        if not params.get('responders__user'):
+            if not params.get('country'):
+                responder_ids = queryset.filter(
+                    responder__isnull=False
+                ).values_list('responder', flat=1).order_by().distinct()
+
+            # Count every ticket once.
+            queryset = queryset.filter(responder__isnull=True)
+
+            if not params.get('country'):
+                countries = queryset.filter(
+                    country__isnull=False
+                ).values_list('country', flat=1).order_by('country').distinct()
+
+        open_statuses = Ticket.OPEN_STATUSES
+        resolved_statuses = Ticket.RESOLVED_STATUSES
+        totals = queryset.aggregate(
+            all=Coalesce(Sum('count'), 0),
+            new=self.sum_when('count', status='new'),
+            in_progress=self.sum_when('count', status='in-progress'),
+            pending=self.sum_when('count', status='pending'),
+            closed=self.sum_when('count', status='closed'),
+            cancelled=self.sum_when('count', status='cancelled'),
+            open=self.sum_when('count', status__in=open_statuses),
+            avg_time_open=self.ratio(
+                self.sum_when('created_hours', status__in=open_statuses),
+                self.sum_when('count', status__in=open_statuses)
+            ),
+            resolved=self.sum_when('count', status__in=resolved_statuses),
+            avg_time_resolved=self.ratio(
+                Sum('resolution_hours'),
+                self.sum_when('count', status__in=resolved_statuses)
+            ),
+            avg_time_first_response=self.ratio(
+                Sum('response_hours'), Sum('responded')),
+            past_deadline=Sum('past_deadline')
+        )
+        totals['avg_time_open'] = self.hours_since(totals['avg_time_open'])
+
+        aggregated = queryset.values('month', 'status').annotate(
+            date=F('month'),
+            ticket_status=F('status'),
+            total=Sum('count'),
+            avg_time=self.ratio(Sum('resolution_hours'), Sum('count')),
+            total_past_deadline=Sum('past_deadline')
+        ).order_by('month', 'status')
+
+        stats = [
+            {
+                'date': row['date'],
+                'count': row['total'],
+                'ticket_status': row['ticket_status'],
+                'avg_time': row['avg_time'],
+                'past_deadline': row['total_past_deadline']
+            } for row in aggregated
+        ]
+
+        return totals, stats, list(countries), list(responder_ids)
+
+    @staticmethod
+    def sum_when(field, **conditions):
+        """Sums the field of the rollup rows matching the conditions."""
+        return Sum(
+            Case(
+                When(then=F(field), **conditions),
+                default=0,
+                output_field=FloatField() if field.endswith('hours') else
+                IntegerField()
+            )
+        )
+
+    @staticmethod
+    def ratio(dividend, divisor):
+        """Divides the aggregates, `None` if there is nothing to divide."""
+        return ExpressionWrapper(
+            dividend / Func(divisor, Value(0), function='NULLIF'),
+            output_field=FloatField()
+        )
+
+    @staticmethod
+    def hours_since(created_hours):
+        """Returns the hours passed since a time, given in epoch hours."""
+        if created_hours is None:
+            return None
+
+        now = datetime.utcnow() - datetime(1970, 1, 1)
+
+        return now.total_seconds() / 3600 - created_hours
+
+    def live_stats(self, params):
+        """Returns the stats, countries and responders from the tickets."""
         countries = []
         responder_ids = []
-        params = self.extract_filter_params(self.request)
         queryset = self.filter_queryset(self.get_queryset())
 
         if not params.get('responders__user') and not params.get('country'):
@@ -59,8 +230,6 @@ class TicketStatsEndpoint(JSONApiEndpoint, viewsets.ReadOnlyModelViewSet):
             countries = queryset.filter(
                 country__isnull=False
             ).values_list('country', flat=1).order_by('country').distinct()
-        elif params.get('responders__user'):
-            profile = Profile.objects.get(id=params.get('responders__user'))
 
         totals = queryset.aggregate(
             all=Count('id'),
@@ -108,14 +277,10 @@ class TicketStatsEndpoint(JSONApiEndpoint, viewsets.ReadOnlyModelViewSet):
             avg_time_open=Avg(
                 Case(
                     When(
-                        status__in=['new', 'in-progress', 'pending'],
-                        then=Extract(
-                            (F('updated_at') - F('created_at')) / (60 * 60),
-                            lookup_name='epoch'
-                        )
+                        status__in=Ticket.OPEN_STATUSES,
+                        then=Extract('created_at', 'epoch') / (60 * 60)
                     ),
-                    default=0,
-                    output_field=IntegerField()
+                    output_field=FloatField()
                 )
             ),
             resolved=Sum(
@@ -125,19 +290,8 @@ class TicketStatsEndpoint(JSONApiEndpoint, viewsets.ReadOnlyModelViewSet):
                     output_field=IntegerField()
                 )
             ),
-            avg_time_resolved=Avg(
-                Case(
-                    When(
-                        status__in=['closed', 'cancelled'],
-                        then=Extract(
-                            (F('updated_at') - F('created_at')) / (60 * 60),
-                            lookup_name='epoch'
-                        )
-                    ),
-                    default=0,
-                    output_field=IntegerField()
-                )
-            ),
+            avg_time_resolved=Avg('resolution_hours'),
+            avg_time_first_response=Avg('response_hours'),
             past_deadline=Sum(
                 Case(
                     When(updated_at__gt=F('deadline_at'), then=1),
@@ -151,12 +305,7 @@ class TicketStatsEndpoint(JSONApiEndpoint, viewsets.ReadOnlyModelViewSet):
             date=Trunc('created_at', 'month'),
             count=Count('id'),
             ticket_status=F('status'),
-            avg_time=Avg(
-                Extract(
-                    (F('updated_at') - F('created_at')) / (60 * 60),
-                    lookup_name='epoch'
-                )
-            ),
+            avg_time=Avg('resolution_hours'),
             past_deadline=Sum(
                 Case(
                     When(updated_at__gt=F('deadline_at'), then=1),
@@ -166,24 +315,9 @@ class TicketStatsEndpoint(JSONApiEndpoint, viewsets.ReadOnlyModelViewSet):
             )
         ).values('date', 'count', 'ticket_status', 'avg_time', 'past_deadline')
 
+        totals['avg_time_open'] = self.hours_since(totals['avg_time_open'])
+
         # Do not group by automatically.
         aggregated.query.group_by = aggregated.query.group_by[-2:]
 
-        stats = map(
-            lambda stat: self.TicketStat(
-                stat,
-                profile_id=getattr(profile, 'id', None),
-                profile=profile,
-                pk=None
-            ),
-            list(aggregated)
-        )
-
-        serializer = self.serializer_class(stats, many=True, context={
-            'params': params,
-            'totals': totals,
-            'countries': countries,
-            'responder_ids': responder_ids,
-        })
-
-        return response.Response(serializer.data)
+        return totals, list(aggregated), countries, responder_ids
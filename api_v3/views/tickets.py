@@ -1,11 +1,14 @@
-from django.core.mail import send_mass_mail
+import os.path
+
 from django.conf import settings
+from django.http import StreamingHttpResponse
 from django.template.loader import render_to_string
-from rest_framework import exceptions, mixins, viewsets
+from rest_framework import decorators, exceptions, mixins, viewsets
 
-from api_v3.models import Action, Comment, Profile, Ticket
+from api_v3.misc.zip_stream import ZipStream, is_compressed
+from api_v3.models import Action, Comment, OutboxEmail, Profile, Ticket
 from api_v3.serializers import TicketSerializer
-from .support import JSONApiEndpoint
+from .support import JSONApiEndpoint, KeysetPagination
 
 
 class TicketsEndpoint(
@@ -14,9 +17,11 @@ class TicketsEndpoint(
         mixins.UpdateModelMixin,
         viewsets.ReadOnlyModelViewSet):
 
-    queryset = Ticket.objects.all()
+    queryset = Ticket.objects.defer('search_vector')
     serializer_class = TicketSerializer
     ordering_fields = ('created_at', 'deadline_at')
+    pagination_class = KeysetPagination
+    keyset_field = 'created_at'
     filter_fields = {
         'created_at': ['range'],
         'deadline_at': ['range'],
@@ -27,10 +32,17 @@ class TicketsEndpoint(
         'responders__user': ['exact', 'isnull']
     }
 
+    facet_fields = ('kind', 'country', 'request_type')
+    prefetch_fields = (
+        'responders', 'subscribers', 'responder_users', 'subscriber_users',
+        'attachments'
+    )
+
     EMAIL_SUBJECT = 'A new ticket was requested, ID: {}'
 
     def get_queryset(self):
-        queryset = super(TicketsEndpoint, self).get_queryset()
+        queryset = self.prefetch_includes(
+            super(TicketsEndpoint, self).get_queryset())
 
         if self.request.user.is_superuser:
             return queryset
@@ -42,6 +54,29 @@ class TicketsEndpoint(
 
         return Ticket.filter_by_user(self.request.user, queryset)
 
+    def prefetch_includes(self, queryset):
+        """Loads the serialized relationships and the requested includes.
+
+        Every relationship is loaded for the whole page in one query.
+        """
+        include = self.request.query_params.get('include') or ''
+        include = [
+            path.replace('-', '_').split('.')
+            for path in include.split(',') if path
+        ]
+
+        queryset = Ticket.prefetch_users(
+            queryset.prefetch_related(*self.prefetch_fields))
+
+        for path in include:
+            if path[0] == 'requester':
+                queryset = queryset.select_related('requester')
+            elif path[0] in self.prefetch_fields and path[1:] == ['user']:
+                queryset = queryset.prefetch_related(
+                    '{}__user'.format(path[0]))
+
+        return queryset
+
     def filter_queryset(self, queryset):
         """Patch filtering method to use the search implementation."""
         filters = self.extract_filter_params(self.request)
@@ -52,6 +87,14 @@ class TicketsEndpoint(
 
         return filtered
 
+    def get_facet_fields(self):
+        """Returns the requested facets, ex.: `?facets=kind,country`."""
+        facets = self.request.query_params.get('facets') or ''
+
+        return [
+            field for field in facets.split(',') if field in self.facet_fields
+        ]
+
     def perform_create(self, serializer):
         """Make sure every new ticket is linked to current user."""
         ticket = serializer.save(requester=self.request.user)
@@ -74,7 +117,7 @@ class TicketsEndpoint(
         instance = serializer.instance
 
         if (not self.request.user.is_superuser) and (
-            self.request.user not in instance.users.all()
+            self.request.user not in instance.users
         ) and (
             self.request.user != instance.requester
         ):
@@ -111,8 +154,68 @@ class TicketsEndpoint(
         return Action.objects.create(
             actor=self.request.user, target=ticket, verb=verb, action=comment)
 
+    @decorators.action(
+        detail=True, methods=['get'], url_path='attachments.zip',
+        url_name='attachments-zip')
+    def attachments_zip(self, request, pk=None):
+        """Streams a ZIP archive of the ticket attachments."""
+        tickets = Ticket.objects.all()
+
+        if not request.user.is_superuser:
+            tickets = Ticket.filter_by_user(request.user, tickets)
+
+        ticket = tickets.filter(id=pk).only('id').first()
+
+        if not ticket:
+            raise exceptions.NotFound()
+
+        resp = StreamingHttpResponse(
+            self.zip_attachments(ticket), content_type='application/zip')
+        resp['Content-Disposition'] = (
+            'attachment; filename=ticket-{}-attachments.zip'.format(ticket.id))
+
+        return resp
+
+    def zip_attachments(self, ticket):
+        """Yields the archive, reading one attachment at a time.
+
+        Missing files are left out.
+        """
+        archive = ZipStream()
+        names = set()
+        attachments = ticket.attachments.exclude(upload='').order_by('id')
+
+        for attachment in attachments.iterator():
+            try:
+                attachment.upload.open('rb')
+            except (IOError, OSError):
+                continue
+
+            name, ext = os.path.splitext(
+                attachment.file_name or
+                os.path.basename(attachment.upload.name))
+            unique_name, copy = name + ext, 1
+
+            while unique_name in names:
+                copy += 1
+                unique_name = u'{} ({}){}'.format(name, copy, ext)
+
+            names.add(unique_name)
+
+            try:
+                for data in archive.add(
+                        unique_name, attachment.upload.file,
+                        attachment.created_at, size=attachment.size,
+                        compress=not is_compressed(attachment.mime_type)):
+                    yield data
+            finally:
+                attachment.upload.close()
+
+        for data in archive.finish():
+            yield data
+
     def email_notify(self, ticket, template='mail/ticket_created.txt'):
-        """Sends an email to editors about the new ticket."""
+        """Queues an email to editors about the new ticket."""
         emails = []
         subject = self.EMAIL_SUBJECT.format(ticket.id)
         request_host = ''
@@ -138,4 +241,4 @@ class TicketsEndpoint(
                 [user.email]
             ])
 
-        return send_mass_mail(emails, fail_silently=True), emails
+        return OutboxEmail.queue(emails), emails
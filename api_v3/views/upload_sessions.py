@@ -0,0 +1,101 @@
+from django.conf import settings
+from rest_framework import (
+    decorators, mixins, response, serializers, viewsets)
+
+from api_v3.misc import metrics
+from api_v3.models import Action, Ticket, UploadSession
+from api_v3.serializers import AttachmentSerializer, UploadSessionSerializer
+from .support import JSONApiEndpoint
+
+
+class UploadSessionsEndpoint(
+        JSONApiEndpoint,
+        mixins.CreateModelMixin,
+        mixins.RetrieveModelMixin,
+        mixins.DestroyModelMixin,
+        viewsets.GenericViewSet):
+    """Chunked attachment uploads.
+
+    A session is created for a ticket, the chunks are sent with `PUT` to
+    `chunks/<index>`, along with their SHA-256 in the `X-Chunk-SHA256`
+    header. Failed chunks are sent again, the session lists the missing
+    ones. Once all are received, `finalize` creates the attachment.
+    """
+
+    queryset = UploadSession.objects.all()
+    serializer_class = UploadSessionSerializer
+
+    def get_queryset(self):
+        queryset = super(UploadSessionsEndpoint, self).get_queryset()
+
+        return queryset.filter(user=self.request.user.id)
+
+    def perform_create(self, serializer):
+        """Checks the ticket access, before any file data is sent."""
+        ticket = Ticket.filter_by_user(self.request.user).filter(
+            id=getattr(serializer.validated_data['ticket'], 'id', None)
+        ).first()
+
+        if not ticket and not self.request.user.is_superuser:
+            raise serializers.ValidationError(
+                [{'data/attributes/ticket': 'Ticket not found.'}]
+            )
+
+        session = serializer.save(
+            user=self.request.user, chunk_size=settings.UPLOAD_CHUNK_SIZE)
+        session.allocate()
+
+        return session
+
+    def perform_destroy(self, instance):
+        instance.discard()
+
+    @decorators.action(
+        detail=True, methods=['put'], url_path=r'chunks/(?P<index>[0-9]+)')
+    def chunk(self, request, pk=None, index=None):
+        """Writes a chunk, streamed from the request body."""
+        session = self.get_object()
+        index = int(index)
+
+        if index >= session.chunks_count or (
+            int(request.META.get('CONTENT_LENGTH') or 0) !=
+            session.chunk_length(index)
+        ):
+            raise serializers.ValidationError(
+                [{'data/attributes/chunk': 'Chunk length is not valid.'}])
+
+        if not session.write_chunk(
+                index, request.stream, request.META.get('HTTP_X_CHUNK_SHA256')):
+            raise serializers.ValidationError(
+                [{'data/attributes/chunk': 'Chunk checksum does not match.'}])
+
+        metrics.UPLOAD_BYTES.labels('chunk').inc(session.chunk_length(index))
+
+        return response.Response(self.get_serializer(session).data)
+
+    @decorators.action(detail=True, methods=['post'])
+    def finalize(self, request, pk=None):
+        """Creates the attachment from the received chunks."""
+        session = self.get_object()
+
+        if session.missing:
+            raise serializers.ValidationError(
+                [{'data/attributes/missing': 'Chunks are missing.'}])
+
+        attachment = session.finalize()
+
+        Action.objects.create(
+            action=attachment,
+            actor=request.user,
+            target=attachment.ticket,
+            verb='attachment:create'
+        )
+
+        # Rendered as an attachment, not a session.
+        self.resource_name = 'attachments'
+
+        return response.Response(
+            AttachmentSerializer(
+                attachment, context=self.get_serializer_context()).data,
+            status=201
+        )